@@ -0,0 +1 @@
+from app.factory import create_app, ROUTER_MODULES, ROUTER_PRESETS
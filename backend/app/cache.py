@@ -0,0 +1,118 @@
+from bson import ObjectId
+from datetime import datetime, timezone, timedelta
+from typing import List
+import asyncio
+import json
+import logging
+import os
+
+from seo_documents import SeoDocumentStore
+from facets import FacetService
+from search_index import SearchIndex
+from suggest import Suggester
+from app.db import ROOT_DIR, db, read_db, note_write, READ_FROM_SECONDARIES, READ_YOUR_WRITES_SECONDS
+from app.lifecycle import run_in_background
+from app.metrics import register_cache
+
+# MongoDB-based cache collection
+cache_collection = db.cache
+cache_counters = {"hits": 0, "misses": 0}
+
+def generate_cache_key(prefix: str, **kwargs) -> str:
+    if not kwargs:
+        return prefix
+    params = "_".join(f"{k}:{v}" for k, v in sorted(kwargs.items()) if v is not None)
+    return f"{prefix}_{params}" if params else prefix
+
+async def get_cached_data(key: str):
+    try:
+        cached_doc = await cache_collection.find_one({"key": key})
+        if cached_doc:
+            if datetime.fromisoformat(cached_doc['expires_at']) > datetime.now(timezone.utc):
+                cache_counters["hits"] += 1
+                return json.loads(cached_doc['data'])
+            else:
+                await cache_collection.delete_one({"key": key})
+    except Exception as e:
+        logging.warning(f"Cache get failed for {key}: {e}")
+    cache_counters["misses"] += 1
+    return None
+
+async def set_cached_data(key: str, data, ttl: int = 3600):
+    try:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        
+        def serialize_data(obj):
+            if isinstance(obj, datetime):
+                return obj.isoformat()
+            elif isinstance(obj, ObjectId):
+                return str(obj)
+            elif isinstance(obj, dict):
+                return {k: serialize_data(v) for k, v in obj.items()}
+            elif isinstance(obj, list):
+                return [serialize_data(item) for item in obj]
+            return obj
+        
+        serialized_data = serialize_data(data)
+        
+        await cache_collection.update_one(
+            {"key": key},
+            {
+                "$set": {
+                    "key": key,
+                    "data": json.dumps(serialized_data),
+                    "expires_at": expires_at.isoformat(),
+                    "created_at": datetime.now(timezone.utc).isoformat()
+                }
+            },
+            upsert=True
+        )
+    except Exception as e:
+        logging.warning(f"Cache set failed for {key}: {e}")
+
+async def _delete_cache_patterns(patterns: List[str]):
+    try:
+        regex = "|".join(p.replace("*", ".*") for p in dict.fromkeys(patterns))
+        await cache_collection.delete_many({"key": {"$regex": f"^(?:{regex})$"}})
+    except Exception as e:
+        logging.warning(f"Cache invalidation failed for {patterns}: {e}")
+
+async def _delete_again_later(patterns: List[str]):
+    await asyncio.sleep(READ_YOUR_WRITES_SECONDS)
+    await _delete_cache_patterns(patterns)
+
+async def invalidate_cache_patterns(patterns: List[str]):
+    """Invalidate several patterns with a single delete_many"""
+    if not patterns:
+        return
+    note_write()
+    await _delete_cache_patterns(patterns)
+    if READ_FROM_SECONDARIES:
+        # Another process may refill these keys from a secondary that has not seen
+        # the write yet; deleting them once more after the lag bound drops such entries
+        run_in_background(_delete_again_later(patterns))
+
+async def invalidate_cache_pattern(pattern: str):
+    await invalidate_cache_patterns([pattern])
+
+# Precomputed crawler payloads (see seo_documents.py); admin writes schedule refreshes
+seo_documents = SeoDocumentStore(db, read_db)
+
+# Alumni and experience filter values with counts, maintained on admin writes (see facets.py)
+facets = FacetService(read_db)
+
+# BM25 question search (see search_index.py); the search router runs its sync loop
+search_index = SearchIndex(
+    db,
+    os.environ.get('SEARCH_INDEX_PATH', str(ROOT_DIR / 'search' / 'questions.idx')),
+    sync_interval=float(os.environ.get('SEARCH_SYNC_SECONDS', '5'))
+)
+
+# Typeahead over companies, topics and alumni (see suggest.py), updated by admin writes
+suggestions = Suggester(read_db)
+
+register_cache("response", lambda: (cache_counters["hits"], cache_counters["misses"]))
+register_cache("seo_documents", lambda: (
+    seo_documents.counters["memory_hits"] + seo_documents.counters["stored_hits"], seo_documents.counters["misses"]
+))
+register_cache("suggestions", lambda: (suggestions.counters["hits"], suggestions.counters["misses"]))
@@ -0,0 +1,143 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.read_preferences import SecondaryPreferred
+from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional
+import logging
+import os
+import time
+
+from metrics import MongoCommandMetrics
+from query_trace import QueryTracer
+from app.models import Activity
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+load_dotenv(ROOT_DIR / '.env')
+
+# Per-collection command counts and latencies for /metrics
+mongo_metrics = MongoCommandMetrics()
+# Round trips and DB time per request, for QueryTraceMiddleware
+query_tracer = QueryTracer()
+
+# MongoDB connection with connection pooling
+mongo_url = os.environ['MONGO_URL']
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=50,
+    minPoolSize=10,
+    maxIdleTimeMS=45000,
+    connectTimeoutMS=10000,
+    serverSelectionTimeoutMS=5000,
+    event_listeners=[mongo_metrics, query_tracer]
+)
+db = client[os.environ['DB_NAME']]
+
+# Heavy public reads go through read_db, which prefers secondaries. Bounded
+# staleness (MongoDB's minimum is 90 s) keeps lagging members out of selection;
+# admin, payment and per-user paths keep using db and so always hit the primary.
+READ_FROM_SECONDARIES = os.environ.get('READ_FROM_SECONDARIES', 'true').lower() == 'true'
+READ_MAX_STALENESS_SECONDS = int(os.environ.get('READ_MAX_STALENESS_SECONDS', '90'))
+# A secondary may trail by the staleness bound plus one heartbeat (10 s)
+READ_YOUR_WRITES_SECONDS = READ_MAX_STALENESS_SECONDS + 10
+replica_db = client.get_database(
+    os.environ['DB_NAME'],
+    read_preference=SecondaryPreferred(max_staleness=READ_MAX_STALENESS_SECONDS)
+)
+
+_primary_reads_until = 0.0
+
+def note_write():
+    """
+    Called after content writes: this process reads from the primary until any
+    secondary could have caught up, so an admin sees their own edit straight away.
+    """
+    global _primary_reads_until
+    _primary_reads_until = time.monotonic() + READ_YOUR_WRITES_SECONDS
+
+def read_database():
+    if not READ_FROM_SECONDARIES or time.monotonic() < _primary_reads_until:
+        return db
+    return replica_db
+
+class ReadDatabase:
+    """Stands in for db in read-only queries, resolving primary or secondaries per access"""
+    
+    def __getattr__(self, name):
+        return getattr(read_database(), name)
+    
+    def __getitem__(self, name):
+        return read_database()[name]
+
+read_db = ReadDatabase()
+
+# Transactions are only available on replica sets / sharded clusters
+_supports_transactions: Optional[bool] = None
+
+async def supports_transactions() -> bool:
+    global _supports_transactions
+    if _supports_transactions is None:
+        try:
+            hello = await client.admin.command("hello")
+            _supports_transactions = bool(hello.get("setName")) or hello.get("msg") == "isdbgrid"
+        except Exception as e:
+            logging.warning(f"Could not detect transaction support: {e}")
+            _supports_transactions = False
+    return _supports_transactions
+
+@asynccontextmanager
+async def write_session():
+    """Yield a session inside a transaction where supported, otherwise None"""
+    if not await supports_transactions():
+        yield None
+        return
+    async with await client.start_session() as session:
+        async with session.start_transaction():
+            yield session
+
+async def adjust_question_counts(deltas: dict, session=None) -> bool:
+    """
+    Apply per-company question_count deltas with atomic $inc.
+    Companies sharing the same delta are updated in one round trip.
+    """
+    by_delta = {}
+    for company_id, delta in deltas.items():
+        if company_id and delta:
+            by_delta.setdefault(delta, []).append(company_id)
+    
+    for delta, company_ids in by_delta.items():
+        await db.companies.update_many(
+            {"id": {"$in": company_ids}},
+            {"$inc": {"question_count": delta}},
+            session=session
+        )
+    return bool(by_delta)
+
+# Activity logging helper function
+async def log_activity(
+    user_id: str,
+    user_email: str,
+    activity_type: str,
+    user_name: Optional[str] = None,
+    resource_id: Optional[str] = None,
+    resource_name: Optional[str] = None,
+    metadata: Optional[dict] = None
+):
+    """Log user activity for analytics tracking"""
+    try:
+        # Skip logging for specific email
+        if user_email == "sharmayatin0882@gmail.com":
+            return
+        
+        activity = Activity(
+            user_id=user_id,
+            user_email=user_email,
+            user_name=user_name,
+            activity_type=activity_type,
+            resource_id=resource_id,
+            resource_name=resource_name,
+            metadata=metadata
+        )
+        await db.activities.insert_one(activity.model_dump())
+    except Exception as e:
+        logging.warning(f"Activity logging failed: {e}")
@@ -0,0 +1,156 @@
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.cors import CORSMiddleware
+from typing import Iterable, Optional
+import importlib
+import logging
+import os
+
+from traffic_guard import TrafficGuardMiddleware
+from metrics import MetricsMiddleware
+from query_trace import QueryTraceMiddleware
+from migrations import OFFLINE_MIGRATIONS, SCHEMA_VERSION, MigrationLockedError, migrate, schema_version
+from app.db import client, db
+from app.limits import traffic_guard
+from app.metrics import http_metrics, request_round_trips
+from app.lifecycle import run_in_background
+from app.schema import note_schema_version
+from app.services import services, sdk
+
+# Router modules are only imported when mounted, so a lean process loads less code
+ROUTER_MODULES = {
+    "seo": "app.routers.seo",
+    "prerender": "app.routers.prerender",
+    "content": "app.routers.content",
+    "search": "app.routers.search",
+    "suggest": "app.routers.suggest",
+    "alumni": "app.routers.alumni",
+    "payments": "app.routers.payments",
+    "project_interview": "app.routers.project_interview",
+    "admin": "app.routers.admin",
+    "analytics": "app.routers.analytics",
+    "health": "app.routers.health",
+    "metrics": "app.routers.metrics",
+}
+
+ROUTER_PRESETS = {
+    "all": list(ROUTER_MODULES),
+    "read-only": ["seo", "prerender", "content", "search", "suggest", "alumni", "health", "metrics"],
+    "alumni": ["alumni", "health", "metrics"],
+}
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def resolve_routers(routers: Optional[Iterable[str]] = None) -> list:
+    """Router names from an explicit list, or APP_ROUTERS (names and/or presets, comma separated)"""
+    if routers is None:
+        routers = [name.strip() for name in os.environ.get('APP_ROUTERS', 'all').split(',') if name.strip()]
+    names = []
+    for name in routers:
+        for resolved in ROUTER_PRESETS.get(name, [name]):
+            if resolved not in ROUTER_MODULES:
+                raise ValueError(f"Unknown router '{resolved}'; choose from {', '.join(ROUTER_MODULES)}")
+            if resolved not in names:
+                names.append(resolved)
+    return names
+
+async def apply_pending_migrations():
+    try:
+        applied = await migrate(db, online_only=True)
+        logger.info(f"✓ Applied schema migrations {applied}")
+        if applied:
+            note_schema_version(applied[-1])
+    except MigrationLockedError:
+        logger.info("Schema migrations are running in another process")
+    except Exception as e:
+        logger.error(f"✗ Schema migration failed: {e}")
+
+async def startup_db():
+    # Index creation and data cleanup live in migrations.py: `python migrations.py` is a
+    # deploy step, run before new code takes traffic. Booting only reads the stored
+    # schema version (AUTO_MIGRATE=true migrates in the background, for local setups)
+    try:
+        version = await schema_version(db)
+        note_schema_version(version)
+        offline = sorted(number for number in OFFLINE_MIGRATIONS if number > version)
+        if offline:
+            logger.warning(f"⚠️ Routes needing schema v{offline[0]} answer 503 until `python migrations.py` applies it")
+        if version < SCHEMA_VERSION:
+            if os.environ.get('AUTO_MIGRATE', 'false').lower() == 'true':
+                logger.warning(f"⚠️ Schema at v{version}, expected v{SCHEMA_VERSION} - migrating in the background")
+                run_in_background(apply_pending_migrations())
+            else:
+                logger.warning(f"⚠️ Schema at v{version}, expected v{SCHEMA_VERSION} - run `python migrations.py`")
+        else:
+            logger.info(f"✓ Database schema v{version}")
+    except Exception as e:
+        logger.error(f"✗ Could not read schema version: {e}")
+    
+    if services.configured("razorpay"):
+        logger.info("✓ Razorpay configured")
+    else:
+        logger.warning("⚠️ Razorpay not configured - payments disabled")
+    
+    if services.configured("clerk"):
+        logger.info("✓ Clerk configured")
+    else:
+        logger.warning("⚠️ Clerk not configured")
+
+async def shutdown_db_client():
+    await traffic_guard.stop()
+    client.close()
+    sdk.shutdown()
+
+def create_app(routers: Optional[Iterable[str]] = None) -> FastAPI:
+    """
+    Build the API with only the given routers mounted (default: APP_ROUTERS, else all).
+    e.g. create_app(["alumni", "health"]) or APP_ROUTERS=read-only for a lean process.
+    """
+    app = FastAPI()
+    app.state.routers = resolve_routers(routers)
+    
+    app.add_event_handler("startup", startup_db)
+    for name in app.state.routers:
+        module = importlib.import_module(ROUTER_MODULES[name])
+        for router in getattr(module, "routers", [module.router]):
+            app.include_router(router)
+        if hasattr(module, "configure"):
+            module.configure(app)
+        # Background workers a router owns: on_startup / on_shutdown lists of coroutines
+        for handler in getattr(module, "on_startup", []):
+            app.add_event_handler("startup", handler)
+        for handler in getattr(module, "on_shutdown", []):
+            app.add_event_handler("shutdown", handler)
+    # Registered after the routers' own hooks so their workers stop before the client closes
+    app.add_event_handler("shutdown", shutdown_db_client)
+    
+    # Innermost, so each handler's queries are traced in its own request context.
+    # ENFORCE_QUERY_BUDGETS turns @query_budget overruns into errors (tests, staging)
+    app.add_middleware(
+        QueryTraceMiddleware,
+        max_queries=int(os.environ.get('SLOW_REQUEST_QUERIES', '10')),
+        max_db_ms=float(os.environ.get('SLOW_REQUEST_DB_MS', '250')),
+        enforce_budgets=os.environ.get('ENFORCE_QUERY_BUDGETS', 'false').lower() == 'true',
+        round_trips=request_round_trips
+    )
+    # Middleware setup; the traffic guard is added before CORS so CORS wraps it
+    # and rejections still carry CORS headers
+    app.add_middleware(TrafficGuardMiddleware, guard=traffic_guard)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["*"]
+    )
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    # Outermost, so requests the traffic guard turns away are timed too
+    app.add_middleware(MetricsMiddleware, metrics=http_metrics)
+    
+    logger.info(f"✓ Mounted routers: {', '.join(app.state.routers)}")
+    return app
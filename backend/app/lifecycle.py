@@ -0,0 +1,9 @@
+import asyncio
+
+# Strong references to fire-and-forget startup work, so it is not garbage collected mid-run
+startup_tasks = set()
+
+def run_in_background(coro):
+    task = asyncio.create_task(coro)
+    startup_tasks.add(task)
+    task.add_done_callback(startup_tasks.discard)
@@ -0,0 +1,55 @@
+from fastapi import HTTPException
+import os
+
+from rate_limiter import RateLimiter, Reservation
+from traffic_guard import RateRule, TrafficGuard
+from app.db import db
+
+# Constants for rate limiting
+MAX_GENERATIONS_PER_DAY = 3
+
+# Every limiter reserves a slot atomically in one round trip; see rate_limiter.py
+ai_generation_limiter = RateLimiter(db.rate_limits, "ai_generation", MAX_GENERATIONS_PER_DAY, 86400, mode="fixed")
+alumni_reveal_limiter = RateLimiter(
+    db.rate_limits, "alumni_reveal", int(os.environ.get('ALUMNI_REVEALS_PER_HOUR', '60')), 3600, mode="sliding"
+)
+payment_limiter = RateLimiter(
+    db.rate_limits, "payment", int(os.environ.get('PAYMENT_REQUESTS_PER_10_MIN', '10')), 600, mode="sliding"
+)
+
+async def enforce_rate_limit(limiter: RateLimiter, subject: str, detail) -> Reservation:
+    """Reserve a slot or raise 429 with Retry-After"""
+    reservation = await limiter.reserve(subject)
+    if not reservation.allowed:
+        raise HTTPException(
+            status_code=429,
+            detail=detail,
+            headers={"Retry-After": str(reservation.retry_after)}
+        )
+    return reservation
+
+# Per-client rate limits and load shedding, answered before any route (or MongoDB) work
+traffic_guard = TrafficGuard(
+    rules=[
+        RateRule(
+            "expensive",
+            per_minute=int(os.environ.get('RATE_LIMIT_EXPENSIVE_PER_MINUTE', '30')),
+            burst=int(os.environ.get('RATE_LIMIT_EXPENSIVE_BURST', '10')),
+            prefixes=("/api/company-questions", "/api/alumni/search", "/sitemap.xml")
+        ),
+        RateRule(
+            "default",
+            per_minute=int(os.environ.get('RATE_LIMIT_PER_MINUTE', '240')),
+            burst=int(os.environ.get('RATE_LIMIT_BURST', '60'))
+        )
+    ],
+    exempt_prefixes=("/api/health",),
+    # Vercel's edge sets x-real-ip to the client address (VERCEL=1 in its runtime);
+    # elsewhere set CLIENT_IP_HEADER or TRUST_FORWARDED_FOR for the proxy in front
+    client_ip_header=os.environ.get('CLIENT_IP_HEADER', 'x-real-ip' if os.environ.get('VERCEL') else '') or None,
+    # Only set behind a proxy that appends the client address to X-Forwarded-For
+    trust_forwarded=os.environ.get('TRUST_FORWARDED_FOR', 'false').lower() == 'true',
+    max_in_flight=int(os.environ.get('MAX_IN_FLIGHT_REQUESTS', '200')),
+    max_lag=float(os.environ.get('MAX_EVENT_LOOP_LAG_MS', '200')) / 1000,
+    shared_collection=db.rate_limits if os.environ.get('RATE_LIMIT_SHARED', 'false').lower() == 'true' else None
+)
@@ -0,0 +1,60 @@
+from typing import Callable, Dict, Tuple
+
+from metrics import Collected, Histogram, HttpMetrics, MetricsRegistry
+from query_trace import ROUND_TRIP_BUCKETS
+from app.db import mongo_metrics
+from app.services import sdk
+
+# Request latency, recorded by MetricsMiddleware (see app/factory.py)
+http_metrics = HttpMetrics()
+
+# MongoDB round trips per request, recorded by QueryTraceMiddleware
+request_round_trips = Histogram(
+    "http_request_mongodb_round_trips", "MongoDB round trips issued while serving a request, by route template",
+    ("route",), buckets=ROUND_TRIP_BUCKETS
+)
+
+# Caches report (hits, misses) through a callback registered by whoever owns them
+CACHE_SOURCES: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+def register_cache(name: str, stats: Callable[[], Tuple[int, int]]):
+    CACHE_SOURCES[name] = stats
+
+def _cache_samples():
+    for name, stats in CACHE_SOURCES.items():
+        hits, misses = stats()
+        yield "", {"cache": name, "result": "hit"}, hits
+        yield "", {"cache": name, "result": "miss"}, misses
+
+def _sdk_latency_samples():
+    for provider, stats in sdk.stats().items():
+        for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms")):
+            if stats[key] is not None:
+                yield "", {"provider": provider, "quantile": quantile}, stats[key] / 1000
+        yield "_sum", {"provider": provider}, stats["total_seconds"]
+        yield "_count", {"provider": provider}, stats["calls"] - stats["rejected"] - stats["in_flight"]
+
+def _sdk_outcome_samples():
+    for provider, stats in sdk.stats().items():
+        outcomes = {
+            "ok": stats["calls"] - stats["rejected"] - stats["in_flight"] - stats["failures"],
+            "failure": stats["failures"] - stats["timeouts"],
+            "timeout": stats["timeouts"],
+            "rejected": stats["rejected"]
+        }
+        for outcome, count in outcomes.items():
+            yield "", {"provider": provider, "outcome": outcome}, count
+
+def _sdk_state_samples():
+    for provider, stats in sdk.stats().items():
+        yield "", {"provider": provider}, 1 if stats["circuit"] == "open" else 0
+
+registry = MetricsRegistry([
+    *http_metrics.families,
+    request_round_trips,
+    *mongo_metrics.families,
+    Collected("cache_requests_total", "Cache lookups by cache and result", "counter", _cache_samples),
+    Collected("sdk_call_duration_seconds", "Third-party SDK call latency (recent calls)", "summary", _sdk_latency_samples),
+    Collected("sdk_calls_total", "Third-party SDK calls by outcome", "counter", _sdk_outcome_samples),
+    Collected("sdk_circuit_open", "Whether the provider's circuit breaker is open", "gauge", _sdk_state_samples),
+])
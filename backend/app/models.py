@@ -0,0 +1,157 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional
+from datetime import datetime, timezone
+import re
+import uuid
+
+class User(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    clerk_id: str
+    email: str
+    name: str
+    picture: Optional[str] = None
+    is_premium: bool = False
+    is_admin: bool = False
+    bookmarked_questions: List[str] = []
+    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+class Topic(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    name: str
+    description: Optional[str] = ""
+    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+class Question(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    topic_id: Optional[str] = None
+    company_ids: List[str] = []
+    question: str
+    answer: str
+    difficulty: str
+    tags: List[str] = []
+    category: Optional[str] = None
+    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    
+    def __init__(self, **data):
+        # Older clients and import files name a single company_id
+        company_id = data.pop('company_id', None)
+        if company_id and not data.get('company_ids'):
+            data['company_ids'] = [company_id]
+        elif data.get('company_ids') is None:
+            data.pop('company_ids', None)
+        super().__init__(**data)
+        self.company_ids = list(dict.fromkeys(self.company_ids))
+
+class Company(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    name: str
+    slug: Optional[str] = None
+    logo_url: Optional[str] = None
+    question_count: int = 0
+    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    
+    def __init__(self, **data):
+        super().__init__(**data)
+        if not self.slug and self.name:
+            self.slug = self.generate_slug(self.name)
+    
+    @staticmethod
+    def generate_slug(name: str) -> str:
+        slug = name.lower()
+        slug = re.sub(r'[^a-z0-9\s-]', '', slug)
+        slug = re.sub(r'[\s]+', '-', slug)
+        slug = slug.strip('-')
+        return slug or str(uuid.uuid4())[:8]
+
+class Experience(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    company_id: str
+    company_name: str
+    role: str
+    rounds: int
+    experience: str
+    status: str = "selected"
+    posted_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+class Alumni(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    name: str
+    email: str
+    phone: Optional[str] = None
+    role: str
+    company: str
+    college: Optional[str] = None
+    location: Optional[str] = None
+    graduation_year: Optional[int] = None
+    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+class Activity(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    user_email: str
+    user_name: Optional[str] = None
+    activity_type: str  # login, payment_initiation, alumni_page_view, ai_project_usage, company_questions_view, question_view
+    resource_id: Optional[str] = None  # ID of the resource accessed (company_id, question_id, etc.)
+    resource_name: Optional[str] = None  # Name of the resource (company name, question title, etc.)
+    metadata: Optional[dict] = None  # Additional context (e.g., payment amount, search filters)
+    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+class CreateOrderRequest(BaseModel):
+    amount: int
+
+class VerifyPaymentRequest(BaseModel):
+    razorpay_order_id: str
+    razorpay_payment_id: str
+    razorpay_signature: str
+
+class AdminJob(BaseModel):
+    """Progress record for long-running admin work"""
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    type: str
+    resource_id: Optional[str] = None
+    resource_name: Optional[str] = None
+    status: str = "pending"  # pending, running, completed, failed
+    progress: dict = {}
+    error: Optional[str] = None
+    created_by: Optional[str] = None
+    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+# Pydantic models for Project Interview
+class ProjectInterviewRequest(BaseModel):
+    """Request model for project-based interview question generation"""
+    model_config = ConfigDict(extra="ignore")
+    project_title: str
+    tech_stack: List[str]  # List of technologies used
+    project_description: str
+    features_implemented: str
+    student_role: str  # Frontend / Backend / Full Stack / Solo
+    refresh: bool = False  # Skip the result cache and always generate fresh questions
+
+class InterviewQuestion(BaseModel):
+    """Single interview question model"""
+    question: str
+    difficulty: str  # easy, medium, hard
+    topic: str  # What aspect of the project this relates to
+
+class ProjectInterviewResponse(BaseModel):
+    """Response model with generated interview questions"""
+    easy_questions: List[InterviewQuestion]
+    medium_questions: List[InterviewQuestion]
+    hard_questions: List[InterviewQuestion]
+    generated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+class ProjectInterviewRateLimit(BaseModel):
+    """Track daily rate limit for project interview generation"""
+    model_config = ConfigDict(extra="ignore")
+    user_id: str
+    date: str  # YYYY-MM-DD format
+    generation_count: int = 0
+    last_generation: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
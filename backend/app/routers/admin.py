@@ -0,0 +1,940 @@
+from fastapi import APIRouter, HTTPException, Request, Depends, Query, UploadFile, File, BackgroundTasks
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+from bson import ObjectId
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from typing import Literal, Optional
+from datetime import datetime, timezone
+from collections import Counter
+from pathlib import Path
+import asyncio
+import logging
+import os
+import uuid
+
+from reconcile_question_counts import reconcile_question_counts
+from question_import import detect_format, iter_records, next_chunk
+from sdk_executor import CircuitOpenError, ProviderTimeoutError
+from image_uploads import store_image, LocalImageStore, CloudinaryImageStore, UploadTooLargeError, MAX_UPLOAD_BYTES
+from query_trace import query_budget
+from bulk_admin import BulkRequest, MAX_BULK_OPERATIONS, plan_bulk, company_count_deltas, question_side_effects, bulk_response
+from app.db import ROOT_DIR, db, write_session, adjust_question_counts
+from dedupe import (
+    DUPLICATE_THRESHOLD, add_fingerprint_companies, duplicate_groups, find_duplicates, fold_duplicates,
+    pull_fingerprint_company, remove_fingerprints, same_bank, same_home, save_fingerprints
+)
+from facets import FACET_FIELDS, apply_facet_deltas, facet_deltas, facet_projection, rebuild_facets
+from seo_documents import (
+    GOLDMINE_PAGE, TOPICS_PAGE, ALUMNI_PAGE, EXPERIENCES_PAGE,
+    company_key, topic_key, experience_key, question_seo_keys
+)
+from app.cache import cache_collection, cache_counters, invalidate_cache_pattern, invalidate_cache_patterns, seo_documents, facets, search_index, suggestions
+from app.auth import AUTH_ROUND_TRIPS, require_admin
+from app.models import User, Topic, Question, Company, Experience, Alumni, AdminJob
+from app.services import services, sdk
+from app.limits import traffic_guard
+from app.schema import COMPANY_IDS_SCHEMA
+
+router = APIRouter(prefix="/api")
+
+# Image storage backend: Cloudinary in production, local filesystem for development/tests
+if os.environ.get('IMAGE_STORE', 'cloudinary') == 'local':
+    image_store = LocalImageStore(
+        os.environ.get('LOCAL_UPLOAD_DIR', str(ROOT_DIR / 'uploads')),
+        os.environ.get('LOCAL_UPLOAD_URL', '/uploads')
+    )
+    Path(image_store.root).mkdir(parents=True, exist_ok=True)
+else:
+    image_store = CloudinaryImageStore(sdk, services)
+
+def configure(app):
+    """Serve locally stored uploads from the app that accepts them"""
+    if isinstance(image_store, LocalImageStore):
+        app.mount(image_store.base_url, StaticFiles(directory=image_store.root), name="uploads")
+
+@router.get("/admin/stats")
+async def get_admin_stats(user: User = Depends(require_admin)):
+    total_users = await db.users.count_documents({})
+    premium_users = await db.users.count_documents({"is_premium": True})
+    total_questions = await db.questions.count_documents({})
+    total_companies = await db.companies.count_documents({})
+    total_experiences = await db.experiences.count_documents({})
+    total_alumni = await db.alumni.count_documents({})
+    
+    return {
+        "total_users": total_users,
+        "premium_users": premium_users,
+        "total_questions": total_questions,
+        "total_companies": total_companies,
+        "total_experiences": total_experiences,
+        "total_alumni": total_alumni
+    }
+
+@router.get("/admin/users")
+async def get_all_users(user: User = Depends(require_admin)):
+    users = await db.users.find({}).to_list(10000)
+    
+    def make_json_safe(obj):
+        if isinstance(obj, ObjectId):
+            return str(obj)
+        elif isinstance(obj, datetime):
+            return obj.isoformat()
+        elif isinstance(obj, dict):
+            return {k: make_json_safe(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [make_json_safe(item) for item in obj]
+        return obj
+    
+    safe_users = [make_json_safe(user) for user in users]
+    return JSONResponse(content=safe_users)
+
+@router.post("/admin/users/{user_id}/grant-admin")
+async def grant_admin_access(user_id: str, current_user: User = Depends(require_admin)):
+    if not user_id or user_id == "undefined" or user_id == "null":
+        raise HTTPException(status_code=400, detail="Invalid user_id provided")
+    
+    target_user = await db.users.find_one({"clerk_id": user_id})
+    if not target_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    await db.users.update_one(
+        {"clerk_id": user_id}, 
+        {"$set": {"is_admin": True, "is_premium": True}}
+    )
+    
+    clerk_client = await services.get("clerk")
+    if clerk_client:
+        try:
+            clerk_user = await sdk.call("clerk", clerk_client.users.get, user_id=user_id)
+            await sdk.call(
+                "clerk",
+                clerk_client.users.update,
+                user_id=user_id,
+                public_metadata={
+                    **clerk_user.public_metadata,
+                    'isAdmin': True,
+                    'isPremium': True
+                }
+            )
+            logging.info(f"✓ Updated Clerk metadata for admin grant: {target_user['email']}")
+        except Exception as e:
+            logging.error(f"⚠️ Failed to update Clerk metadata: {e}")
+    
+    return {
+        "success": True, 
+        "message": f"Admin access granted to {target_user['email']}"
+    }
+
+@router.post("/admin/users/{user_id}/revoke-admin")
+async def revoke_admin_access(user_id: str, current_user: User = Depends(require_admin)):
+    if not user_id or user_id == "undefined" or user_id == "null":
+        raise HTTPException(status_code=400, detail="Invalid user_id provided")
+    
+    target_user = await db.users.find_one({"clerk_id": user_id})
+    if not target_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    if user_id == current_user.clerk_id:
+        raise HTTPException(status_code=400, detail="Cannot revoke your own admin access")
+    
+    await db.users.update_one(
+        {"clerk_id": user_id}, 
+        {"$set": {"is_admin": False}}
+    )
+    
+    clerk_client = await services.get("clerk")
+    if clerk_client:
+        try:
+            clerk_user = await sdk.call("clerk", clerk_client.users.get, user_id=user_id)
+            await sdk.call(
+                "clerk",
+                clerk_client.users.update,
+                user_id=user_id,
+                public_metadata={
+                    **clerk_user.public_metadata,
+                    'isAdmin': False
+                }
+            )
+            logging.info(f"✓ Updated Clerk metadata for admin revoke: {target_user['email']}")
+        except Exception as e:
+            logging.error(f"⚠️ Failed to update Clerk metadata: {e}")
+    
+    return {
+        "success": True, 
+        "message": f"Admin access revoked from {target_user['email']}"
+    }
+
+@router.post("/admin/users/{user_id}/toggle-premium")
+async def toggle_premium_status(user_id: str, current_user: User = Depends(require_admin)):
+    if not user_id or user_id == "undefined" or user_id == "null":
+        raise HTTPException(status_code=400, detail="Invalid user_id provided")
+    
+    target_user = await db.users.find_one({"clerk_id": user_id})
+    if not target_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    if target_user.get('is_admin') and target_user.get('is_premium'):
+        raise HTTPException(
+            status_code=400, 
+            detail="Cannot remove premium status from admin users"
+        )
+    
+    new_premium_status = not target_user.get('is_premium', False)
+    
+    await db.users.update_one(
+        {"clerk_id": user_id}, 
+        {"$set": {"is_premium": new_premium_status}}
+    )
+    
+    clerk_client = await services.get("clerk")
+    if clerk_client:
+        try:
+            clerk_user = await sdk.call("clerk", clerk_client.users.get, user_id=user_id)
+            await sdk.call(
+                "clerk",
+                clerk_client.users.update,
+                user_id=user_id,
+                public_metadata={
+                    **clerk_user.public_metadata,
+                    'isPremium': new_premium_status
+                }
+            )
+            logging.info(f"✓ Updated Clerk metadata for premium toggle: {target_user['email']}")
+        except Exception as e:
+            logging.error(f"⚠️ Failed to update Clerk metadata: {e}")
+    
+    status_text = "granted" if new_premium_status else "revoked"
+    return {
+        "success": True, 
+        "message": f"Premium access {status_text} for {target_user['email']}"
+    }
+
+# Admin CRUD - Topics
+@router.post("/admin/topics")
+async def create_topic(topic: Topic, user: User = Depends(require_admin)):
+    await db.topics.insert_one(topic.model_dump())
+    await invalidate_cache_pattern("topics*")
+    seo_documents.schedule([topic_key(topic.id), TOPICS_PAGE])
+    suggestions.apply("topic", [(topic.id, topic.model_dump())])
+    return topic
+
+@router.put("/admin/topics/{topic_id}")
+async def update_topic(topic_id: str, topic: Topic, user: User = Depends(require_admin)):
+    await db.topics.update_one({"id": topic_id}, {"$set": topic.model_dump()})
+    await invalidate_cache_pattern("topics*")
+    seo_documents.schedule([topic_key(topic_id), TOPICS_PAGE])
+    suggestions.apply("topic", [(topic_id, topic.model_dump())])
+    return topic
+
+@router.delete("/admin/topics/{topic_id}")
+async def delete_topic(topic_id: str, user: User = Depends(require_admin)):
+    await db.topics.delete_one({"id": topic_id})
+    await invalidate_cache_pattern("topics*")
+    await invalidate_cache_pattern("questions*")
+    seo_documents.schedule([topic_key(topic_id), TOPICS_PAGE])
+    suggestions.apply("topic", [(topic_id, None)])
+    return {"success": True}
+
+# Admin CRUD - Questions
+@router.get("/admin/questions", dependencies=COMPANY_IDS_SCHEMA)
+async def get_all_questions(user: User = Depends(require_admin)):
+    questions = await db.questions.find({}, {"_id": 0}).to_list(10000)
+    return questions
+
+def question_cache_patterns(counts_changed: bool) -> list:
+    """Cached responses a single-question write makes stale, invalidated in one round trip"""
+    return ["questions*", "company_questions*", "bookmarks*"] + (["companies*"] if counts_changed else [])
+
+def duplicate_summary(matches: list) -> list:
+    return [{k: m.get(k) for k in ("id", "company_ids", "similarity")} for m in matches]
+
+async def merge_into(question_id: str, company_ids: list, session=None) -> Optional[dict]:
+    """Add companies to an existing question; returns it as it was before, or None if it is gone"""
+    return await db.questions.find_one_and_update(
+        {"id": question_id},
+        {"$addToSet": {"company_ids": {"$each": company_ids}}},
+        projection={"_id": 0},
+        session=session
+    )
+
+@router.post("/admin/questions", dependencies=COMPANY_IDS_SCHEMA)
+# Duplicate lookup (2), transaction probe, insert, counts, fingerprints, commit,
+# cache invalidation and search change: independent of the number of companies
+@query_budget(AUTH_ROUND_TRIPS + 9)
+async def create_question(
+    question_data: dict,
+    on_duplicate: Literal["flag", "skip", "merge"] = "flag",
+    user: User = Depends(require_admin)
+):
+    """
+    Create a question, shared by every company in company_ids. Near-duplicates of
+    existing questions are reported under possible_duplicates. With
+    on_duplicate=skip a near-duplicate in the same company (or the same topic
+    bank) is refused; with on_duplicate=merge the companies are added to the
+    closest existing question of the same bank (see same_bank) instead of
+    creating a copy, and without one the question is created as usual.
+    """
+    question = Question(**question_data)
+    [matches] = await find_duplicates(db, [question.model_dump()])
+    home = [m for m in matches if same_home(question.model_dump(), m)]
+    if home and on_duplicate == "skip":
+        raise HTTPException(status_code=409, detail=f"Near-duplicate of question {home[0]['id']}")
+    
+    target = next((m for m in matches if same_bank(question.model_dump(), m)), None)
+    if target and on_duplicate == "merge":
+        async with write_session() as session:
+            old_question = await merge_into(target['id'], question.company_ids, session=session)
+            if old_question:
+                merged = {**old_question, "company_ids": list(dict.fromkeys(old_question.get('company_ids', []) + question.company_ids))}
+                counts_changed = await adjust_question_counts(company_count_deltas([(old_question, merged)]), session=session)
+                await save_fingerprints(db, [merged], session=session)
+        if old_question:
+            await invalidate_cache_patterns(question_cache_patterns(counts_changed))
+            seo_documents.schedule(question_seo_keys([merged]))
+            await search_index.record_changes([merged['id']])
+            return {**merged, "merged_into": merged['id'], "possible_duplicates": duplicate_summary(matches)}
+    
+    async with write_session() as session:
+        await db.questions.insert_one(question.model_dump(), session=session)
+        counts_changed = await adjust_question_counts(Counter(question.company_ids), session=session)
+        await save_fingerprints(db, [question.model_dump()], session=session)
+    
+    await invalidate_cache_patterns(question_cache_patterns(counts_changed))
+    seo_documents.schedule(question_seo_keys([question.model_dump()]))
+    await search_index.record_changes([question.id])
+    
+    return {**question.model_dump(), "possible_duplicates": duplicate_summary(matches)}
+
+IMPORT_CHUNK_SIZE = 500
+MAX_IMPORT_ERRORS = 1000
+
+@router.post("/admin/questions/import", dependencies=COMPANY_IDS_SCHEMA)
+async def import_questions(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    on_duplicate: Literal["flag", "skip", "merge"] = "flag",
+    user: User = Depends(require_admin)
+):
+    """
+    Bulk import questions from a CSV, JSON or NDJSON upload.
+    Rows are validated and written in chunks with insert_many(ordered=False);
+    a row with several company_ids becomes one question shared by them, as in create_question.
+    Company counts are recomputed once and the cache is invalidated once at the end.
+    Near-duplicates (of stored questions or of earlier rows) are reported, dropped
+    with on_duplicate=skip when they would land in the same company, or folded
+    into the question they duplicate in the same bank with on_duplicate=merge.
+    """
+    try:
+        fmt = detect_format(file.filename, file.content_type, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    records = iter_records(file.file, fmt)
+    errors = []
+    inserted = 0
+    rows_seen = 0
+    touched_companies = set()
+    touched_topics = set()
+    inserted_ids = []
+    possible_duplicates = []
+    skipped_duplicates = 0
+    merged_duplicates = 0
+    
+    def add_error(row, message):
+        if len(errors) < MAX_IMPORT_ERRORS:
+            errors.append({"row": row, "error": message})
+    
+    while True:
+        chunk = await asyncio.to_thread(next_chunk, records, IMPORT_CHUNK_SIZE)
+        if not chunk:
+            break
+        rows_seen += len(chunk)
+        
+        # One lookup per chunk to reject rows pointing at unknown companies
+        referenced = set()
+        for _, record in chunk:
+            if isinstance(record, dict):
+                ids = record.get('company_ids') or ([record['company_id']] if record.get('company_id') else [])
+                if isinstance(ids, list):
+                    referenced.update(str(i) for i in ids)
+        known_companies = set()
+        if referenced:
+            known_companies = {
+                c['id'] for c in await db.companies.find(
+                    {"id": {"$in": list(referenced)}}, {"_id": 0, "id": 1}
+                ).to_list(None)
+            }
+        
+        docs = []
+        doc_rows = []
+        for row, record in chunk:
+            if isinstance(record, Exception):
+                add_error(row, f"Could not parse row: {record}")
+                continue
+            
+            company_ids = record.get('company_ids') or ([record['company_id']] if record.get('company_id') else [])
+            if not isinstance(company_ids, list):
+                add_error(row, "company_ids must be a list")
+                continue
+            unknown = [c for c in company_ids if str(c) not in known_companies]
+            if unknown:
+                add_error(row, f"Unknown company_ids: {', '.join(map(str, unknown))}")
+                continue
+            
+            try:
+                docs.append(Question(**record).model_dump())
+                doc_rows.append(row)
+            except ValidationError as e:
+                add_error(row, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+        
+        if not docs:
+            continue
+        
+        duplicates = await find_duplicates(db, docs)
+        if on_duplicate == "skip":
+            keep = [i for i, doc in enumerate(docs) if not any(same_home(doc, m) for m in duplicates[i])]
+            skipped_duplicates += len(docs) - len(keep)
+            docs, doc_rows, duplicates = [docs[i] for i in keep], [doc_rows[i] for i in keep], [duplicates[i] for i in keep]
+        for row, doc, matches in zip(doc_rows, docs, duplicates):
+            if matches and len(possible_duplicates) < MAX_IMPORT_ERRORS:
+                possible_duplicates.append({"row": row, "id": doc['id'], "duplicates": duplicate_summary(matches)})
+        if on_duplicate == "merge":
+            docs, doc_rows, merges, folded = fold_duplicates(docs, doc_rows, duplicates)
+            merged_duplicates += folded
+            if merges:
+                await db.questions.bulk_write([
+                    UpdateOne({"id": target_id}, {"$addToSet": {"company_ids": {"$each": company_ids}}})
+                    for target_id, company_ids in merges.items()
+                ], ordered=False)
+                await add_fingerprint_companies(db, merges)
+                touched_companies.update(c for company_ids in merges.values() for c in company_ids)
+                inserted_ids.extend(merges)
+        if not docs:
+            continue
+        
+        failed_indexes = set()
+        try:
+            result = await db.questions.insert_many(docs, ordered=False)
+            inserted += len(result.inserted_ids)
+        except BulkWriteError as e:
+            inserted += e.details.get('nInserted', 0)
+            for write_error in e.details.get('writeErrors', []):
+                failed_indexes.add(write_error['index'])
+                add_error(doc_rows[write_error['index']], write_error.get('errmsg', 'Write failed'))
+        
+        await save_fingerprints(db, [doc for index, doc in enumerate(docs) if index not in failed_indexes])
+        for index, doc in enumerate(docs):
+            if index in failed_indexes:
+                continue
+            inserted_ids.append(doc['id'])
+            touched_companies.update(doc.get('company_ids') or [])
+            if doc.get('topic_id'):
+                touched_topics.add(doc['topic_id'])
+    
+    companies_updated = []
+    patterns = []
+    if touched_companies:
+        report = await reconcile_question_counts(db, company_ids=touched_companies)
+        companies_updated = [c['id'] for c in report['drifted']]
+        patterns.append("companies*")
+        patterns.extend(f"company_questions*company_id:{company_id}" for company_id in touched_companies)
+    if touched_topics:
+        patterns.append("questions*")
+    await invalidate_cache_patterns(patterns)
+    if inserted or merged_duplicates:
+        seo_documents.schedule(question_seo_keys(
+            [{"company_ids": list(touched_companies)}]
+            + [{"topic_id": topic_id} for topic_id in touched_topics]
+        ))
+        await search_index.record_changes(inserted_ids)
+    
+    return {
+        "success": not errors,
+        "format": fmt,
+        "rows": rows_seen,
+        "inserted": inserted,
+        "failed_rows": len({e['row'] for e in errors}),
+        "errors": errors,
+        "errors_truncated": len(errors) >= MAX_IMPORT_ERRORS,
+        "companies_updated": companies_updated,
+        "skipped_duplicates": skipped_duplicates,
+        "merged_duplicates": merged_duplicates,
+        "possible_duplicates": possible_duplicates
+    }
+
+@router.put("/admin/questions/{question_id}", dependencies=COMPANY_IDS_SCHEMA)
+async def update_question(question_id: str, question: Question, user: User = Depends(require_admin)):
+    async with write_session() as session:
+        old_question = await db.questions.find_one_and_update(
+            {"id": question_id},
+            {"$set": question.model_dump()},
+            projection={"_id": 0, "company_ids": 1, "topic_id": 1},
+            session=session
+        )
+        
+        deltas = company_count_deltas([(old_question, question.model_dump())]) if old_question else {}
+        counts_changed = await adjust_question_counts(deltas, session=session)
+        if old_question:
+            await save_fingerprints(db, [{**question.model_dump(), "id": question_id}], session=session)
+    
+    await invalidate_cache_patterns(question_cache_patterns(counts_changed))
+    seo_documents.schedule(question_seo_keys([old_question, question.model_dump()]))
+    await search_index.record_changes([question_id])
+    
+    return question
+
+@router.delete("/admin/questions/{question_id}", dependencies=COMPANY_IDS_SCHEMA)
+async def delete_question(question_id: str, user: User = Depends(require_admin)):
+    async with write_session() as session:
+        question = await db.questions.find_one_and_delete(
+            {"id": question_id},
+            projection={"_id": 0, "company_ids": 1, "topic_id": 1},
+            session=session
+        )
+        counts_changed = await adjust_question_counts(company_count_deltas([(question, None)]), session=session)
+        await remove_fingerprints(db, [question_id] if question else [], session=session)
+    
+    await invalidate_cache_patterns(question_cache_patterns(counts_changed))
+    if question:
+        seo_documents.schedule(question_seo_keys([question]))
+        await search_index.record_changes([question_id])
+    
+    return {"success": True}
+
+@router.get("/admin/questions/duplicates", dependencies=COMPANY_IDS_SCHEMA)
+async def get_duplicate_questions(
+    company_id: Optional[str] = None,
+    threshold: float = Query(DUPLICATE_THRESHOLD, ge=0.5, le=1.0),
+    user: User = Depends(require_admin)
+):
+    """Clusters of near-duplicate questions, e.g. the same question pasted under several companies"""
+    groups = await duplicate_groups(db, threshold, company_id)
+    return {"groups": groups, "count": len(groups)}
+
+async def record_facet_changes(source: str, changes: list):
+    """Keep the alumni/experiences facet counts in step with a write"""
+    if await apply_facet_deltas(db, source, facet_deltas(source, changes)):
+        facets.invalidate(source)
+
+async def plan_bulk_request(collection, model, bulk: BulkRequest):
+    """Load every document a bulk request touches in one query and fold the operations into a plan"""
+    if len(bulk.operations) > MAX_BULK_OPERATIONS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_OPERATIONS} operations per request")
+    
+    ids = list({operation.id for operation in bulk.operations})
+    existing = {
+        doc['id']: doc
+        for doc in await collection.find({"id": {"$in": ids}}, {"_id": 0}).to_list(None)
+    }
+    return plan_bulk(bulk.operations, existing, model)
+
+@router.post("/admin/questions/bulk", dependencies=COMPANY_IDS_SCHEMA)
+async def bulk_update_questions(bulk: BulkRequest, user: User = Depends(require_admin)):
+    """Apply many question edits/deletes with one bulk_write and one round of side effects"""
+    plan = await plan_bulk_request(db.questions, Question, bulk)
+    deltas, patterns = question_side_effects(plan.changes)
+    
+    if plan.requests:
+        async with write_session() as session:
+            await db.questions.bulk_write(plan.requests, ordered=False, session=session)
+            await adjust_question_counts(deltas, session=session)
+            await save_fingerprints(db, [new for _, new in plan.changes if new], session=session)
+            await remove_fingerprints(db, [old['id'] for old, new in plan.changes if new is None], session=session)
+        await invalidate_cache_patterns(patterns)
+        seo_documents.schedule(question_seo_keys(doc for change in plan.changes for doc in change))
+        await search_index.record_changes(old['id'] for old, _ in plan.changes)
+    
+    return bulk_response(plan)
+
+# Admin CRUD - Companies
+@router.post("/admin/upload-image")
+async def upload_image(request: Request, file: UploadFile = File(...), user: User = Depends(require_admin)):
+    content_length = request.headers.get('content-length')
+    if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES + 64 * 1024:
+        raise HTTPException(status_code=413, detail="File too large")
+    
+    try:
+        result = await store_image(file, image_store, db.image_uploads)
+        if result['deduplicated']:
+            logging.info(f"✓ Reused existing upload for {file.filename} ({result['sha256'][:12]})")
+        return {"url": result['url']}
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except (CircuitOpenError, ProviderTimeoutError) as e:
+        raise HTTPException(status_code=503, detail=f"Upload service unavailable: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
+
+@router.post("/admin/companies")
+async def create_company(company: Company, user: User = Depends(require_admin)):
+    try:
+        logging.info(f"Creating company: {company.name}")
+        
+        if not company.slug:
+            company.slug = Company.generate_slug(company.name)
+        
+        existing = await db.companies.find_one({"slug": company.slug})
+        if existing:
+            company.slug = f"{company.slug}-{str(uuid.uuid4())[:8]}"
+            logging.info(f"Slug already exists, using: {company.slug}")
+        
+        await db.companies.insert_one(company.model_dump())
+        await invalidate_cache_pattern("companies*")
+        seo_documents.schedule([company_key(company.id), GOLDMINE_PAGE])
+        suggestions.apply("company", [(company.id, company.model_dump())])
+        
+        logging.info(f"✓ Company created successfully: {company.name}")
+        return company
+        
+    except Exception as e:
+        logging.error(f"✗ Failed to create company: {e}")
+        import traceback
+        logging.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Failed to create company: {str(e)}")
+
+@router.put("/admin/companies/{company_id}")
+async def update_company(company_id: str, company: Company, user: User = Depends(require_admin)):
+    try:
+        logging.info(f"Updating company: {company_id}")
+        
+        if not company.slug:
+            company.slug = Company.generate_slug(company.name)
+        
+        existing = await db.companies.find_one({"slug": company.slug, "id": {"$ne": company_id}})
+        if existing:
+            company.slug = f"{company.slug}-{str(uuid.uuid4())[:8]}"
+            logging.info(f"Slug conflict, using: {company.slug}")
+        
+        # question_count is maintained by the question endpoints, never by the client
+        await db.companies.update_one({"id": company_id}, {"$set": company.model_dump(exclude={"question_count"})})
+        await invalidate_cache_pattern("companies*")
+        seo_documents.schedule([company_key(company_id), GOLDMINE_PAGE])
+        suggestions.apply("company", [(company_id, company.model_dump(exclude={"question_count"}))])
+        
+        logging.info(f"✓ Company updated successfully")
+        return company
+        
+    except Exception as e:
+        logging.error(f"✗ Failed to update company: {e}")
+        import traceback
+        logging.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Failed to update company: {str(e)}")
+
+async def update_job(job_id: str, set_fields: Optional[dict] = None, inc_fields: Optional[dict] = None):
+    update = {"$set": {**(set_fields or {}), "updated_at": datetime.now(timezone.utc).isoformat()}}
+    if inc_fields:
+        update["$inc"] = {f"progress.{k}": v for k, v in inc_fields.items()}
+    await db.admin_jobs.update_one({"id": job_id}, update)
+
+COMPANY_DELETE_BATCH_SIZE = 500
+
+async def run_company_deletion(job_id: str, company_id: str):
+    """
+    Remove a deleted company's questions and experiences in batches, pulling the
+    deleted question ids out of every user's bookmarks as each batch goes.
+    Questions shared with other companies stay and only lose this company.
+    Every step is idempotent, so a failed or interrupted job can simply be re-run.
+    """
+    topics_touched = set()
+    experiences_deleted = []
+    bookmarks_touched = False
+    shared_touched = False
+    try:
+        await update_job(job_id, {"status": "running"})
+        
+        while True:
+            batch = await db.questions.find(
+                {"company_ids": company_id, "company_ids.1": {"$exists": True}},
+                {"_id": 0, "id": 1}
+            ).limit(COMPANY_DELETE_BATCH_SIZE).to_list(COMPANY_DELETE_BATCH_SIZE)
+            if not batch:
+                break
+            
+            question_ids = [q['id'] for q in batch]
+            shared = await db.questions.update_many({"id": {"$in": question_ids}}, {"$pull": {"company_ids": company_id}})
+            await pull_fingerprint_company(db, question_ids, company_id)
+            await search_index.record_changes(question_ids)
+            shared_touched = True
+            await update_job(job_id, inc_fields={"questions_unshared": shared.modified_count})
+        
+        while True:
+            batch = await db.questions.find(
+                {"company_ids": company_id},
+                {"_id": 0, "id": 1, "topic_id": 1}
+            ).limit(COMPANY_DELETE_BATCH_SIZE).to_list(COMPANY_DELETE_BATCH_SIZE)
+            if not batch:
+                break
+            
+            question_ids = [q['id'] for q in batch]
+            topics_touched.update(q['topic_id'] for q in batch if q.get('topic_id'))
+            
+            bookmarks = await db.users.update_many(
+                {"bookmarked_questions": {"$in": question_ids}},
+                {"$pull": {"bookmarked_questions": {"$in": question_ids}}}
+            )
+            bookmarks_touched = bookmarks_touched or bookmarks.modified_count > 0
+            deleted = await db.questions.delete_many({"id": {"$in": question_ids}})
+            await remove_fingerprints(db, question_ids)
+            await search_index.record_changes(question_ids)
+            
+            await update_job(job_id, inc_fields={
+                "questions_deleted": deleted.deleted_count,
+                "users_bookmarks_updated": bookmarks.modified_count
+            })
+        
+        while True:
+            batch = await db.experiences.find(
+                {"company_id": company_id}, {**facet_projection("experiences"), "id": 1}
+            ).limit(COMPANY_DELETE_BATCH_SIZE).to_list(COMPANY_DELETE_BATCH_SIZE)
+            if not batch:
+                break
+            
+            experiences_deleted.extend(e['id'] for e in batch)
+            deleted = await db.experiences.delete_many({"id": {"$in": [e['id'] for e in batch]}})
+            await record_facet_changes("experiences", [(e, None) for e in batch])
+            await update_job(job_id, inc_fields={"experiences_deleted": deleted.deleted_count})
+        
+        patterns = [
+            "company_questions*" if shared_touched else f"company_questions*company_id:{company_id}",
+            "experiences",
+            f"experiences*company_id:{company_id}"
+        ]
+        if topics_touched:
+            patterns.append("questions*")
+        if bookmarks_touched:
+            patterns.append("bookmarks*")
+        await invalidate_cache_patterns(patterns)
+        seo_documents.schedule(
+            question_seo_keys({"topic_id": topic_id} for topic_id in topics_touched)
+            | {experience_key(experience_id) for experience_id in experiences_deleted}
+            | {EXPERIENCES_PAGE}
+        )
+        
+        await update_job(job_id, {"status": "completed"})
+        logging.info(f"✓ Company {company_id} cleanup complete (job {job_id})")
+        
+    except Exception as e:
+        logging.error(f"✗ Company {company_id} cleanup failed (job {job_id}): {e}")
+        await update_job(job_id, {"status": "failed", "error": str(e)})
+
+@router.delete("/admin/companies/{company_id}", status_code=202, dependencies=COMPANY_IDS_SCHEMA)
+async def delete_company(company_id: str, background_tasks: BackgroundTasks, user: User = Depends(require_admin)):
+    """
+    Delete the company right away and clean up its questions, experiences and
+    bookmarks in the background. Poll /admin/jobs/{job_id} for progress.
+    """
+    company = await db.companies.find_one_and_delete({"id": company_id}, projection={"_id": 0, "name": 1})
+    
+    if company:
+        job = AdminJob(
+            type="delete_company",
+            resource_id=company_id,
+            resource_name=company.get('name'),
+            created_by=user.clerk_id,
+            progress={"questions_deleted": 0, "questions_unshared": 0, "experiences_deleted": 0, "users_bookmarks_updated": 0}
+        )
+        await db.admin_jobs.insert_one(job.model_dump())
+        await invalidate_cache_pattern("companies*")
+        seo_documents.schedule([company_key(company_id), GOLDMINE_PAGE])
+        suggestions.apply("company", [(company_id, None)])
+    else:
+        # Company already gone: resume its cleanup if the previous job never finished
+        job_doc = await db.admin_jobs.find_one(
+            {"type": "delete_company", "resource_id": company_id, "status": {"$ne": "completed"}},
+            {"_id": 0}
+        )
+        if not job_doc:
+            raise HTTPException(status_code=404, detail="Company not found")
+        job = AdminJob(**job_doc)
+    
+    background_tasks.add_task(run_company_deletion, job.id, company_id)
+    return {"success": True, "job_id": job.id, "status_url": f"/api/admin/jobs/{job.id}"}
+
+@router.get("/admin/jobs/{job_id}")
+async def get_admin_job(job_id: str, user: User = Depends(require_admin)):
+    job = await db.admin_jobs.find_one({"id": job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+# Admin CRUD - Experiences
+@router.post("/admin/experiences")
+async def create_experience(experience: Experience, user: User = Depends(require_admin)):
+    await db.experiences.insert_one(experience.model_dump())
+    await record_facet_changes("experiences", [(None, experience.model_dump())])
+    await invalidate_cache_pattern("experiences*")
+    seo_documents.schedule([experience_key(experience.id), EXPERIENCES_PAGE])
+    return experience
+
+@router.put("/admin/experiences/{experience_id}")
+async def update_experience(experience_id: str, experience: Experience, user: User = Depends(require_admin)):
+    old_experience = await db.experiences.find_one_and_update(
+        {"id": experience_id},
+        {"$set": experience.model_dump()},
+        projection=facet_projection("experiences")
+    )
+    if old_experience:
+        await record_facet_changes("experiences", [(old_experience, experience.model_dump())])
+    await invalidate_cache_pattern("experiences*")
+    seo_documents.schedule([experience_key(experience_id), EXPERIENCES_PAGE])
+    return experience
+
+@router.delete("/admin/experiences/{experience_id}")
+async def delete_experience(experience_id: str, user: User = Depends(require_admin)):
+    old_experience = await db.experiences.find_one_and_delete(
+        {"id": experience_id}, projection=facet_projection("experiences")
+    )
+    if old_experience:
+        await record_facet_changes("experiences", [(old_experience, None)])
+    await invalidate_cache_pattern("experiences*")
+    seo_documents.schedule([experience_key(experience_id), EXPERIENCES_PAGE])
+    return {"success": True}
+
+@router.post("/admin/experiences/bulk")
+async def bulk_update_experiences(bulk: BulkRequest, user: User = Depends(require_admin)):
+    plan = await plan_bulk_request(db.experiences, Experience, bulk)
+    if plan.requests:
+        await db.experiences.bulk_write(plan.requests, ordered=False)
+        await record_facet_changes("experiences", plan.changes)
+        await invalidate_cache_pattern("experiences*")
+        seo_documents.schedule({experience_key(old['id']) for old, _ in plan.changes} | {EXPERIENCES_PAGE})
+    return bulk_response(plan)
+
+# Alumni endpoints
+@router.get("/admin/alumni")
+async def get_all_alumni(user: User = Depends(require_admin)):
+    alumni = await db.alumni.find({}, {"_id": 0}).to_list(10000)
+    return alumni
+
+@router.post("/admin/alumni")
+async def create_alumni(alumni: Alumni, user: User = Depends(require_admin)):
+    try:
+        alumni_data = alumni.model_dump()
+        logging.info(f"Creating alumni: {alumni_data}")
+        
+        await db.alumni.insert_one(alumni_data)
+        await record_facet_changes("alumni", [(None, alumni_data)])
+        await invalidate_cache_pattern("alumni*")
+        seo_documents.schedule([ALUMNI_PAGE])
+        suggestions.apply("alumni", [(alumni.id, alumni_data)])
+        
+        logging.info(f"✓ Alumni created: {alumni.name} - College: {alumni.college}")
+        return alumni
+        
+    except Exception as e:
+        logging.error(f"✗ Failed to create alumni: {e}")
+        import traceback
+        logging.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Failed to create alumni: {str(e)}")
+
+@router.put("/admin/alumni/{alumni_id}")
+async def update_alumni(alumni_id: str, alumni: Alumni, user: User = Depends(require_admin)):
+    try:
+        alumni_data = alumni.model_dump()
+        logging.info(f"Updating alumni {alumni_id}: {alumni_data}")
+        
+        old_alumni = await db.alumni.find_one_and_update(
+            {"id": alumni_id}, {"$set": alumni_data}, projection=facet_projection("alumni")
+        )
+        if old_alumni:
+            await record_facet_changes("alumni", [(old_alumni, alumni_data)])
+        await invalidate_cache_pattern("alumni*")
+        seo_documents.schedule([ALUMNI_PAGE])
+        suggestions.apply("alumni", [(alumni_id, alumni_data)])
+        
+        logging.info(f"✓ Alumni updated successfully")
+        return alumni
+        
+    except Exception as e:
+        logging.error(f"✗ Failed to update alumni: {e}")
+        import traceback
+        logging.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Failed to update alumni: {str(e)}")
+
+@router.delete("/admin/alumni/{alumni_id}")
+async def delete_alumni(alumni_id: str, user: User = Depends(require_admin)):
+    old_alumni = await db.alumni.find_one_and_delete({"id": alumni_id}, projection=facet_projection("alumni"))
+    if old_alumni:
+        await record_facet_changes("alumni", [(old_alumni, None)])
+    await invalidate_cache_pattern("alumni*")
+    seo_documents.schedule([ALUMNI_PAGE])
+    suggestions.apply("alumni", [(alumni_id, None)])
+    return {"success": True}
+
+@router.post("/admin/alumni/bulk")
+async def bulk_update_alumni(bulk: BulkRequest, user: User = Depends(require_admin)):
+    plan = await plan_bulk_request(db.alumni, Alumni, bulk)
+    if plan.requests:
+        await db.alumni.bulk_write(plan.requests, ordered=False)
+        await record_facet_changes("alumni", plan.changes)
+        await invalidate_cache_pattern("alumni*")
+        seo_documents.schedule([ALUMNI_PAGE])
+        suggestions.apply("alumni", [(old['id'], new) for old, new in plan.changes])
+    return bulk_response(plan)
+
+# Public Alumni Endpoints
+
+@router.get("/admin/cache-stats")
+async def get_cache_stats(user: User = Depends(require_admin)):
+    try:
+        total_keys = await cache_collection.count_documents({})
+        now = datetime.now(timezone.utc).isoformat()
+        valid_keys = await cache_collection.count_documents({"expires_at": {"$gt": now}})
+        expired_keys = total_keys - valid_keys
+        
+        return {
+            "total_keys": total_keys,
+            "valid_keys": valid_keys,
+            "expired_keys": expired_keys,
+            "cache_type": "MongoDB",
+            "lookups": cache_counters,
+            "seo_documents": seo_documents.stats(),
+            "search_index": search_index.stats(),
+            "suggestions": suggestions.stats()
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+@router.post("/admin/maintenance/reconcile-question-counts", dependencies=COMPANY_IDS_SCHEMA)
+async def reconcile_counts(dry_run: bool = False, user: User = Depends(require_admin)):
+    """Detect and repair question_count drift in one aggregation pass"""
+    report = await reconcile_question_counts(db, apply=not dry_run)
+    if report['repaired']:
+        await invalidate_cache_pattern("companies*")
+        seo_documents.schedule([GOLDMINE_PAGE])
+    return report
+
+@router.post("/admin/maintenance/rebuild-facets")
+async def rebuild_facet_counts(user: User = Depends(require_admin)):
+    """Recount alumni and experience facets from scratch"""
+    await rebuild_facets(db)
+    for source in FACET_FIELDS:
+        facets.invalidate(source)
+    seo_documents.schedule([ALUMNI_PAGE, EXPERIENCES_PAGE])
+    return {"success": True}
+
+@router.post("/admin/maintenance/rebuild-search-index")
+async def rebuild_search(user: User = Depends(require_admin)):
+    """Rebuild this host's search index file now; other workers on the host pick it up on their next sync"""
+    if not await search_index.rebuild(force=True):
+        raise HTTPException(status_code=409, detail="The search index is already being rebuilt")
+    await search_index.sync()
+    return {"success": True, **search_index.stats()}
+
+@router.post("/admin/maintenance/rebuild-seo-documents")
+async def rebuild_seo(user: User = Depends(require_admin)):
+    """Rebuild every precomputed SEO payload, e.g. after FRONTEND_URL changed"""
+    rebuilt = await seo_documents.rebuild()
+    return {"success": True, "rebuilt": rebuilt}
+
+@router.get("/admin/sdk-stats")
+async def get_sdk_stats(user: User = Depends(require_admin)):
+    """Latency, failure and circuit breaker state for third-party SDK calls"""
+    return {**sdk.stats(), "services": services.stats()}
+
+@router.get("/admin/traffic-stats")
+async def get_traffic_stats(user: User = Depends(require_admin)):
+    """Rate limiting and load shedding counters for this process (admin only)"""
+    return traffic_guard.stats()
@@ -0,0 +1,109 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional
+
+from app.db import db, read_db, log_activity
+from facets import MAX_FACET_LIMIT
+from app.cache import generate_cache_key, get_cached_data, set_cached_data, facets
+from app.auth import get_current_user, require_premium
+from app.models import User
+from app.limits import alumni_reveal_limiter, enforce_rate_limit
+
+router = APIRouter(prefix="/api")
+
+@router.get("/alumni/search")
+async def search_alumni(
+    company: Optional[str] = None,
+    name: Optional[str] = None,
+    role: Optional[str] = None,
+    college: Optional[str] = None,
+    location: Optional[str] = None,
+    graduation_year: Optional[int] = None,
+    user: Optional[User] = Depends(get_current_user)
+):
+    # Log alumni page access for analytics
+    if user:
+        await log_activity(
+            user_id=user.clerk_id,
+            user_email=user.email,
+            user_name=user.name,
+            activity_type="alumni_page_view",
+            metadata={
+                "filters": {
+                    "company": company,
+                    "role": role,
+                    "location": location,
+                    "graduation_year": graduation_year
+                }
+            }
+        )
+    
+    query = {}
+    if company:
+        query["company"] = {"$regex": company, "$options": "i"}
+    if name:
+        query["name"] = {"$regex": name, "$options": "i"}
+    if role:
+        query["role"] = {"$regex": role, "$options": "i"}
+    if location:
+        query["location"] = {"$regex": location, "$options": "i"}
+    if college:
+        query["college"] = {"$regex": college, "$options": "i"}
+    if graduation_year is not None:
+        query["graduation_year"] = graduation_year
+    
+    cache_key = generate_cache_key(
+        "alumni_search",
+        company=company,
+        name=name,
+        role=role,
+        college=college,
+        location=location,
+        graduation_year=graduation_year
+    )
+    cached = await get_cached_data(cache_key)
+    if cached:
+        alumni_list = cached
+    else:
+        alumni_list = await read_db.alumni.find(query, {"_id": 0}).to_list(1000)
+        await set_cached_data(cache_key, alumni_list, ttl=3600)
+    
+    is_premium = user and (user.is_premium or user.is_admin) if user else False
+    
+    if not is_premium:
+        for alumni in alumni_list:
+            if alumni.get('email'):
+                alumni['email'] = '***@***.***'
+            if alumni.get('phone'):
+                alumni['phone'] = '***-***-****'
+    
+    return alumni_list
+
+@router.get("/alumni/facets")
+async def get_alumni_facets(field: Optional[str] = None, limit: int = Query(20, ge=1, le=MAX_FACET_LIMIT)):
+    """Most common companies, roles, locations and graduation years with their counts"""
+    try:
+        return await facets.get("alumni", field, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/alumni/{alumni_id}/reveal")
+async def reveal_alumni_contact(alumni_id: str, user: User = Depends(require_premium)):
+    reservation = await enforce_rate_limit(
+        alumni_reveal_limiter, user.clerk_id, "Too many contact reveals. Please try again later."
+    )
+    alumni = await db.alumni.find_one({"id": alumni_id}, {"_id": 0})
+    if not alumni:
+        await alumni_reveal_limiter.refund(reservation)
+        raise HTTPException(status_code=404, detail="Alumni not found")
+    
+    return {
+        "id": alumni["id"],
+        "name": alumni["name"],
+        "email": alumni.get("email", ""),
+        "phone": alumni.get("phone", ""),
+        "role": alumni["role"],
+        "company": alumni["company"],
+        "college": alumni.get("college"),
+        "location": alumni.get("location"),
+        "graduation_year": alumni.get("graduation_year")
+    }
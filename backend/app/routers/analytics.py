@@ -0,0 +1,200 @@
+from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional
+from datetime import datetime, timezone
+import logging
+
+from app.db import db
+from query_trace import query_budget
+from app.auth import AUTH_ROUND_TRIPS, require_admin
+from app.models import User
+
+router = APIRouter(prefix="/api")
+
+# ============= ANALYTICS ENDPOINTS (ADMIN ONLY) =============
+
+ACTIVITY_TYPES = ["login", "payment_initiation", "alumni_page_view", "company_questions_view", "ai_project_usage"]
+
+# Each endpoint answers with one $facet aggregation rather than a count per
+# activity type, so it costs one round trip however many breakdowns it shows
+AI_CACHE_FACET = [
+    {"$match": {"activity_type": "ai_project_usage"}},
+    {"$group": {"_id": {"$ifNull": ["$metadata.cache", "miss"]}, "count": {"$sum": 1}}}
+]
+
+def ai_cache_stats(rows: list) -> dict:
+    """Hit/miss breakdown of AI generations; usage logged before the cache existed counts as misses"""
+    counts = {row['_id']: row['count'] for row in rows}
+    
+    hits = counts.get("exact", 0) + counts.get("similar", 0)
+    total = hits + counts.get("miss", 0)
+    return {
+        "exact_hits": counts.get("exact", 0),
+        "similar_hits": counts.get("similar", 0),
+        "misses": counts.get("miss", 0),
+        "hit_rate": round(hits / total, 4) if total else 0.0
+    }
+
+@router.get("/admin/analytics/overview")
+@query_budget(AUTH_ROUND_TRIPS + 1)
+async def get_analytics_overview(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    user: User = Depends(require_admin)
+):
+    """
+    Get overall analytics overview with date filtering
+    Returns counts for different activity types
+    """
+    try:
+        # Build date filter query
+        date_filter = {}
+        if start_date:
+            date_filter["$gte"] = start_date
+        if end_date:
+            date_filter["$lte"] = end_date
+        
+        query = {}
+        if date_filter:
+            query["timestamp"] = date_filter
+        
+        # Totals per type, unique users and AI cache outcomes in one pass
+        [result] = await db.activities.aggregate([
+            {"$match": query},
+            {"$facet": {
+                "by_type": [{"$group": {"_id": "$activity_type", "count": {"$sum": 1}}}],
+                "unique_users": [{"$group": {"_id": "$user_id"}}, {"$count": "count"}],
+                "ai_cache": AI_CACHE_FACET
+            }}
+        ]).to_list(1)
+        
+        by_type = {row["_id"]: row["count"] for row in result["by_type"]}
+        total_activities = sum(by_type.values())
+        activity_counts = {activity_type: by_type.get(activity_type, 0) for activity_type in ACTIVITY_TYPES}
+        unique_users = result["unique_users"][0]["count"] if result["unique_users"] else 0
+        
+        return {
+            "total_activities": total_activities,
+            "unique_users": unique_users,
+            "activity_breakdown": activity_counts,
+            "ai_cache": ai_cache_stats(result["ai_cache"]),
+            "date_range": {
+                "start": start_date,
+                "end": end_date
+            }
+        }
+    except Exception as e:
+        logging.error(f"Error fetching analytics overview: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/admin/analytics/activities")
+async def get_activities(
+    activity_type: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: int = 100,
+    user: User = Depends(require_admin)
+):
+    """
+    Get detailed activity logs with filtering
+    """
+    try:
+        # Build query
+        query = {}
+        
+        # Exclude specific email
+        query["user_email"] = {"$ne": "sharmayatin0882@gmail.com"}
+       
+        if activity_type:
+            query["activity_type"] = activity_type
+       
+        # Parse date filters to datetime objects for proper comparison
+        date_filter = {}
+        if start_date:
+            try:
+                # Parse as date-only (00:00:00 UTC) for start of day
+                start_dt = datetime.strptime(start_date, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+                date_filter["$gte"] = start_dt.isoformat()
+            except ValueError:
+                logging.warning(f"Invalid start_date format: {start_date}")
+        if end_date:
+            try:
+                # Parse as date-only, add 1 day and subtract 1 second for end of day
+                end_dt = datetime.strptime(end_date, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+                end_dt = end_dt.replace(hour=23, minute=59, second=59, microsecond=999999)
+                date_filter["$lte"] = end_dt.isoformat()
+            except ValueError:
+                logging.warning(f"Invalid end_date format: {end_date}")
+        if date_filter:
+            query["timestamp"] = date_filter
+       
+        # Fetch activities
+        activities = await db.activities.find(
+            query,
+            {"_id": 0}
+        ).sort("timestamp", -1).limit(limit).to_list(limit)
+       
+        return activities
+    except Exception as e:
+        logging.error(f"Error fetching activities: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/admin/analytics/popular-content")
+@query_budget(AUTH_ROUND_TRIPS + 1)
+async def get_popular_content(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    user: User = Depends(require_admin)
+):
+    """
+    Get most accessed companies and content
+    """
+    try:
+        # Build date filter
+        date_filter = {}
+        if start_date:
+            date_filter["$gte"] = start_date
+        if end_date:
+            date_filter["$lte"] = end_date
+        
+        match_query = {"activity_type": {"$in": ["company_questions_view", "ai_project_usage", "alumni_page_view"]}}
+        if date_filter:
+            match_query["timestamp"] = date_filter
+        
+        # Most accessed companies, plus AI usage and alumni page view totals
+        companies_pipeline = [
+            {"$match": {"activity_type": "company_questions_view"}},
+            {"$group": {
+                "_id": "$resource_id",
+                "company_name": {"$first": "$resource_name"},
+                "access_count": {"$sum": 1},
+                "unique_users": {"$addToSet": "$user_id"}
+            }},
+            {"$project": {
+                "company_id": "$_id",
+                "company_name": 1,
+                "access_count": 1,
+                "unique_users_count": {"$size": "$unique_users"}
+            }},
+            {"$sort": {"access_count": -1}},
+            {"$limit": 10}
+        ]
+        
+        [result] = await db.activities.aggregate([
+            {"$match": match_query},
+            {"$facet": {
+                "companies": companies_pipeline,
+                "by_type": [{"$group": {"_id": "$activity_type", "count": {"$sum": 1}}}],
+                "ai_cache": AI_CACHE_FACET
+            }}
+        ]).to_list(1)
+        by_type = {row["_id"]: row["count"] for row in result["by_type"]}
+        
+        return {
+            "most_accessed_companies": result["companies"],
+            "ai_project_usage_total": by_type.get("ai_project_usage", 0),
+            "alumni_page_views_total": by_type.get("alumni_page_view", 0),
+            "ai_cache": ai_cache_stats(result["ai_cache"])
+        }
+    except Exception as e:
+        logging.error(f"Error fetching popular content: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,222 @@
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
+from typing import List, Optional
+import asyncio
+import logging
+
+from app.db import db, read_db, log_activity
+from facets import MAX_FACET_LIMIT
+from recommendations import TOP_K, company_key as recommendation_company_key, get_neighbors, question_key
+from app.cache import generate_cache_key, get_cached_data, set_cached_data, invalidate_cache_pattern, facets
+from app.auth import get_current_user, require_auth, require_premium
+from app.models import User, Topic, Company, Experience
+from app.lifecycle import run_in_background
+from app.schema import COMPANY_IDS_SCHEMA
+
+router = APIRouter(prefix="/api")
+
+async def warm_cache():
+    """Prefill the hottest cache entries; runs in the background so it never delays serving"""
+    try:
+        topics, companies = await asyncio.gather(
+            read_db.topics.find({}, {"_id": 0}).to_list(1000),
+            read_db.companies.find({}, {"_id": 0}).to_list(1000)
+        )
+        await asyncio.gather(
+            set_cached_data("topics", topics, ttl=7200),
+            set_cached_data("companies", companies, ttl=7200)
+        )
+        logging.info("✓ Cache warmed up")
+    except Exception as e:
+        logging.error(f"✗ Cache warmup failed: {e}")
+
+async def schedule_cache_warmup():
+    run_in_background(warm_cache())
+
+on_startup = [schedule_cache_warmup]
+
+@router.get("/auth/me")
+async def get_current_user_info(user: User = Depends(get_current_user)):
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return user.model_dump()
+
+# Free endpoints
+@router.get("/topics", response_model=List[Topic])
+async def get_topics():
+    cache_key = "topics"
+    cached = await get_cached_data(cache_key)
+    if cached:
+        return cached
+    
+    topics = await read_db.topics.find({}, {"_id": 0}).to_list(1000)
+    await set_cached_data(cache_key, topics, ttl=7200)
+    return topics
+
+@router.get("/companies-preview", response_model=List[Company])
+async def get_companies_preview():
+    cache_key = "companies"
+    cached = await get_cached_data(cache_key)
+    if cached:
+        return cached
+    
+    companies = await read_db.companies.find({}, {"_id": 0}).to_list(1000)
+    await set_cached_data(cache_key, companies, ttl=7200)
+    return companies
+
+@router.get("/questions")
+async def get_questions(topic_id: Optional[str] = None, difficulty: Optional[str] = None):
+    cache_key = generate_cache_key("questions", topic_id=topic_id, difficulty=difficulty)
+    cached = await get_cached_data(cache_key)
+    if cached:
+        return cached
+    
+    query = {"topic_id": {"$ne": None}}
+    if topic_id:
+        query["topic_id"] = topic_id
+    if difficulty:
+        query["difficulty"] = difficulty
+    
+    questions = await read_db.questions.find(query, {"_id": 0}).to_list(1000)
+    await set_cached_data(cache_key, questions, ttl=3600)
+    return questions
+
+# Premium endpoints
+@router.get("/companies", response_model=List[Company])
+async def get_companies(user: User = Depends(require_auth)):
+    if not user.is_premium and not user.is_admin:
+        raise HTTPException(status_code=403, detail="Premium subscription required")
+    
+    cache_key = "companies"
+    cached = await get_cached_data(cache_key)
+    if cached:
+        return cached
+    
+    companies = await read_db.companies.find({}, {"_id": 0}).to_list(1000)
+    await set_cached_data(cache_key, companies, ttl=7200)
+    return companies
+
+@router.get("/company-questions/{company_id}", dependencies=COMPANY_IDS_SCHEMA)
+async def get_company_questions(
+    company_id: str, 
+    category: Optional[str] = None,
+    authorization: str = Header(None)
+):
+    user = await get_current_user(authorization) if authorization else None
+    is_premium = user and (user.is_premium or user.is_admin)
+    
+    # Log company questions access for analytics
+    if user:
+        company = await read_db.companies.find_one({"id": company_id}, {"_id": 0, "name": 1})
+        company_name = company.get("name") if company else None
+        
+        await log_activity(
+            user_id=user.clerk_id,
+            user_email=user.email,
+            user_name=user.name,
+            activity_type="company_questions_view",
+            resource_id=company_id,
+            resource_name=company_name,
+            metadata={"category": category}
+        )
+    
+    cache_key = generate_cache_key("company_questions", company_id=company_id, category=category)
+    cached = await get_cached_data(cache_key)
+    if cached:
+        questions = cached
+    else:
+        query = {"company_ids": company_id}
+        if category:
+            query["category"] = category
+        
+        questions = await read_db.questions.find(query, {"_id": 0}).to_list(1000)
+        await set_cached_data(cache_key, questions, ttl=3600)
+    
+    if not is_premium and len(questions) > 3:
+        preview_questions = questions[:3]
+        locked_questions = [
+            {**q, "answer": "🔒 Unlock premium to see the answer", "locked": True} 
+            for q in questions[3:]
+        ]
+        return preview_questions + locked_questions
+    
+    return questions
+
+@router.post("/bookmark/{question_id}")
+async def toggle_bookmark(question_id: str, user: User = Depends(require_premium)):
+    if question_id in user.bookmarked_questions:
+        await db.users.update_one({"clerk_id": user.clerk_id}, {"$pull": {"bookmarked_questions": question_id}})
+        await invalidate_cache_pattern(f"bookmarks_user:{user.clerk_id}")
+        return {"bookmarked": False}
+    else:
+        await db.users.update_one({"clerk_id": user.clerk_id}, {"$addToSet": {"bookmarked_questions": question_id}})
+        await invalidate_cache_pattern(f"bookmarks_user:{user.clerk_id}")
+        return {"bookmarked": True}
+
+@router.get("/bookmarks")
+async def get_bookmarks(user: User = Depends(require_premium)):
+    if not user.bookmarked_questions:
+        return []
+    
+    cache_key = f"bookmarks_user:{user.clerk_id}"
+    cached = await get_cached_data(cache_key)
+    if cached:
+        return cached
+    
+    questions = await db.questions.find({"id": {"$in": user.bookmarked_questions}}, {"_id": 0}).to_list(1000)
+    await set_cached_data(cache_key, questions, ttl=1800)
+    return questions
+
+@router.get("/experiences", response_model=List[Experience])
+async def get_experiences(company_id: Optional[str] = None):
+    cache_key = generate_cache_key("experiences", company_id=company_id)
+    cached = await get_cached_data(cache_key)
+    if cached:
+        return cached
+    
+    query = {}
+    if company_id:
+        query["company_id"] = company_id
+    
+    experiences = await read_db.experiences.find(query, {"_id": 0}).sort("posted_at", -1).to_list(1000)
+    await set_cached_data(cache_key, experiences, ttl=3600)
+    return experiences
+
+@router.get("/experiences/facets")
+async def get_experience_facets(field: Optional[str] = None, limit: int = Query(20, ge=1, le=MAX_FACET_LIMIT)):
+    """Most common companies, roles and statuses among experiences with their counts"""
+    try:
+        return await facets.get("experiences", field, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Related questions and similar companies, precomputed by recommendations.py
+RELATED_QUESTION_PROJECTION = {"_id": 0, "id": 1, "question": 1, "difficulty": 1, "topic_id": 1, "company_ids": 1, "tags": 1}
+SIMILAR_COMPANY_PROJECTION = {"_id": 0, "id": 1, "name": 1, "slug": 1, "logo_url": 1, "question_count": 1}
+
+async def hydrate_neighbors(collection, neighbors: list, projection: dict) -> list:
+    """Attach current documents to stored neighbours, skipping any deleted since the last build"""
+    if not neighbors:
+        return []
+    docs = {
+        doc['id']: doc
+        for doc in await collection.find({"id": {"$in": [n['id'] for n in neighbors]}}, projection).to_list(None)
+    }
+    return [{**docs[n['id']], "score": n['score']} for n in neighbors if n['id'] in docs]
+
+@router.get("/questions/{question_id}/related")
+async def get_related_questions(question_id: str, limit: int = Query(TOP_K, ge=1, le=TOP_K)):
+    """Questions with similar text and tags, across topics and companies (answers not included)"""
+    neighbors = await get_neighbors(read_db, question_key(question_id), limit)
+    return {
+        "question_id": question_id,
+        "related": await hydrate_neighbors(read_db.questions, neighbors, RELATED_QUESTION_PROJECTION)
+    }
+
+@router.get("/companies/{company_id}/similar")
+async def get_similar_companies(company_id: str, limit: int = Query(TOP_K, ge=1, le=TOP_K)):
+    """Companies whose interview questions cover similar ground"""
+    neighbors = await get_neighbors(read_db, recommendation_company_key(company_id), limit)
+    return {
+        "company_id": company_id,
+        "similar": await hydrate_neighbors(read_db.companies, neighbors, SIMILAR_COMPANY_PROJECTION)
+    }
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Response
+
+from app.db import db
+from app.cache import cache_collection
+
+router = APIRouter(prefix="/api")
+
+@router.head("/health")
+async def health_head():
+    return Response(status_code=200)
+
+@router.get("/health")
+async def health_check():
+    try:
+        await db.command('ping')
+        mongo_status = "healthy"
+    except Exception as e:
+        mongo_status = f"unhealthy: {str(e)}"
+    
+    try:
+        await cache_collection.count_documents({})
+        cache_status = "healthy"
+    except Exception as e:
+        cache_status = f"unhealthy: {str(e)}"
+    
+    return {
+        "status": "healthy" if mongo_status == "healthy" and cache_status == "healthy" else "degraded",
+        "mongodb": mongo_status,
+        "cache": cache_status
+    }
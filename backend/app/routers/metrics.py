@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+import hmac
+import os
+
+from app.auth import require_admin
+from app.metrics import registry, CACHE_SOURCES
+from app.models import User
+
+# Prometheus scrapes /metrics on every process with METRICS_TOKEN as a bearer
+# token (configure it as the scrape job's credentials). Without a token the
+# endpoint answers 404, unless METRICS_PUBLIC=true opens it (private networks only)
+router = APIRouter()
+admin_router = APIRouter(prefix="/api")
+routers = [router, admin_router]
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(authorization: str = Header(None)):
+    token = os.environ.get('METRICS_TOKEN')
+    if not token:
+        if os.environ.get('METRICS_PUBLIC', 'false').lower() != 'true':
+            raise HTTPException(status_code=404, detail="Not Found")
+    elif not hmac.compare_digest(authorization or "", f"Bearer {token}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@admin_router.get("/admin/metrics")
+async def get_metrics(user: User = Depends(require_admin)):
+    """The same numbers as /metrics, with latency percentiles, for this process"""
+    snapshot = registry.snapshot()
+    snapshot["cache_hit_ratio"] = {
+        name: round(hits / (hits + misses), 4) if hits + misses else None
+        for name, (hits, misses) in ((name, stats()) for name, stats in CACHE_SOURCES.items())
+    }
+    return snapshot
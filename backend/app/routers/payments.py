@@ -0,0 +1,105 @@
+from fastapi import APIRouter, HTTPException, Depends
+import logging
+import os
+
+from sdk_executor import CircuitOpenError, ProviderTimeoutError
+from app.db import db, log_activity
+from app.auth import require_auth
+from app.models import User, CreateOrderRequest, VerifyPaymentRequest
+from app.services import services, sdk
+from app.limits import payment_limiter, enforce_rate_limit
+
+router = APIRouter(prefix="/api")
+
+# Payment endpoints
+@router.post("/payment/create-order")
+async def create_order(order_req: CreateOrderRequest, user: User = Depends(require_auth)):
+    await enforce_rate_limit(payment_limiter, user.clerk_id, "Too many payment attempts. Please try again in a few minutes.")
+    try:
+        logging.info(f"💰 Payment order request from user: {user.email} (clerk_id: {user.clerk_id})")
+        logging.info(f"💰 Amount requested: ₹{order_req.amount / 100}")
+        
+        # Log payment initiation for analytics
+        await log_activity(
+            user_id=user.clerk_id,
+            user_email=user.email,
+            user_name=user.name,
+            activity_type="payment_initiation",
+            metadata={"amount": order_req.amount, "currency": "INR"}
+        )
+        
+        razorpay_client = await services.get("razorpay")
+        razor_order = await sdk.call("razorpay", razorpay_client.order.create, {
+            "amount": order_req.amount,
+            "currency": "INR",
+            "payment_capture": 1,
+        })
+        
+        logging.info(f"✓ Razorpay order created: {razor_order['id']}")
+        return razor_order
+        
+    except (CircuitOpenError, ProviderTimeoutError) as e:
+        logging.error(f"✗ Payment provider unavailable: {e}")
+        raise HTTPException(status_code=503, detail="Payment service is temporarily unavailable. Please try again shortly.")
+    except Exception as e:
+        logging.error(f"✗ Payment order creation failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to create payment order: {str(e)}")
+
+@router.post("/payment/verify")
+async def verify_payment(payment: VerifyPaymentRequest, user: User = Depends(require_auth)):
+    await enforce_rate_limit(payment_limiter, user.clerk_id, "Too many payment attempts. Please try again in a few minutes.")
+    try:
+        logging.info(f"💰 Payment verification request from user: {user.email}")
+        
+        params_dict = {
+            'razorpay_order_id': payment.razorpay_order_id,
+            'razorpay_payment_id': payment.razorpay_payment_id,
+            'razorpay_signature': payment.razorpay_signature
+        }
+        
+        razorpay_client = await services.get("razorpay")
+        razorpay_client.utility.verify_payment_signature(params_dict)
+        logging.info(f"✓ Payment signature verified")
+        
+        await db.users.update_one({"clerk_id": user.clerk_id}, {"$set": {"is_premium": True}})
+        logging.info(f"✓ User upgraded to premium in MongoDB")
+        
+        clerk_client = await services.get("clerk")
+        if clerk_client:
+            try:
+                await sdk.call(
+                    "clerk",
+                    clerk_client.users.update_metadata,
+                    user_id=user.clerk_id,
+                    public_metadata={"isPremium": True}
+                )
+                logging.info(f"✓ User metadata updated in Clerk")
+            except Exception as e:
+                logging.error(f"⚠️ Failed to update Clerk metadata (non-critical): {e}")
+        
+        return {
+            "success": True,
+            "message": "Payment verified and premium access granted"
+        }
+        
+    except Exception as e:
+        logging.error(f"✗ Payment verification failed: {e}")
+        raise HTTPException(status_code=400, detail=f"Payment verification failed: {str(e)}")
+
+# Admin endpoints (keeping all your existing admin code)
+
+@router.get("/debug/razorpay-status")
+async def check_razorpay_status():
+    key_id = os.environ.get('RAZORPAY_KEY_ID', '')
+    key_secret = os.environ.get('RAZORPAY_KEY_SECRET', '')
+    
+    return {
+        "razorpay_client_exists": services.configured("razorpay"),
+        "razorpay_client_loaded": services.is_loaded("razorpay"),
+        "key_id_present": bool(key_id),
+        "key_secret_present": bool(key_secret),
+        "key_id_length": len(key_id) if key_id else 0,
+        "key_secret_length": len(key_secret) if key_secret else 0,
+        "key_id_prefix": key_id[:15] if len(key_id) >= 15 else key_id,
+        "all_env_vars": list(os.environ.keys())
+    }
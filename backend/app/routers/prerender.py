@@ -0,0 +1,54 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+from typing import Optional
+import os
+
+from prerender import Prerenderer, SnapshotStore
+from seo_documents import GOLDMINE_PAGE, TOPICS_PAGE, company_key, experience_key, topic_key
+from app.db import ROOT_DIR
+from app.cache import seo_documents
+from app.metrics import register_cache
+
+# HTML snapshots of the public pages for crawlers and link previews, which do not
+# run the React app. The reverse proxy sends bot user agents for /company/{id},
+# /experience/{id}, /topics and /goldmine to the same path under /prerender.
+router = APIRouter(prefix="/prerender")
+
+prerenderer = Prerenderer(
+    seo_documents,
+    SnapshotStore(
+        os.environ.get('PRERENDER_DIR', str(ROOT_DIR / 'snapshots')),
+        max_memory=int(os.environ.get('PRERENDER_MEMORY_PAGES', '1024'))
+    )
+)
+register_cache("prerender", lambda: (
+    prerenderer.snapshots.counters["memory_hits"] + prerenderer.snapshots.counters["disk_hits"],
+    prerenderer.snapshots.counters["rendered"]
+))
+
+async def snapshot_response(request: Request, key: str, not_found: str) -> Response:
+    snapshot = await prerenderer.render(key)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    digest, html = snapshot
+    headers = {"ETag": f'"{digest}"', "Cache-Control": "public, max-age=300"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=html, media_type="text/html; charset=utf-8", headers=headers)
+
+@router.get("/company/{company_id}", response_class=Response)
+async def prerender_company(company_id: str, request: Request):
+    return await snapshot_response(request, company_key(company_id), "Company not found")
+
+@router.get("/experience/{experience_id}", response_class=Response)
+async def prerender_experience(experience_id: str, request: Request):
+    return await snapshot_response(request, experience_key(experience_id), "Experience not found")
+
+@router.get("/topics", response_class=Response)
+async def prerender_topics(request: Request, topic: Optional[str] = None):
+    if topic:
+        return await snapshot_response(request, topic_key(topic), "Topic not found")
+    return await snapshot_response(request, TOPICS_PAGE, "Page not found")
+
+@router.get("/goldmine", response_class=Response)
+async def prerender_goldmine(request: Request):
+    return await snapshot_response(request, GOLDMINE_PAGE, "Page not found")
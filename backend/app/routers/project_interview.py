@@ -0,0 +1,404 @@
+from fastapi import APIRouter, HTTPException, Request, Depends
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from datetime import datetime, timezone
+import asyncio
+import json
+import logging
+import os
+
+from sdk_executor import CircuitOpenError, ProviderTimeoutError
+from rate_limiter import Reservation
+from interview_generation import build_prompt, parse_questions, get_model_backend, IncrementalQuestionParser, QUESTION_LEVELS
+from job_queue import JobQueue, PermanentJobError
+from generation_cache import GenerationCache
+from app.db import db, log_activity
+from app.auth import require_premium
+from app.models import User, ProjectInterviewRequest
+from app.services import sdk
+from app.limits import MAX_GENERATIONS_PER_DAY, ai_generation_limiter, enforce_rate_limit
+
+router = APIRouter(prefix="/api")
+
+async def reserve_generation(user_id: str) -> Reservation:
+    return await enforce_rate_limit(ai_generation_limiter, user_id, {
+        "message": "Daily limit reached. You can generate up to 3 sets of questions per day.",
+        "remaining": 0,
+        "reset_at": "midnight UTC"
+    })
+
+async def remaining_generations(user_id: str) -> int:
+    return (await ai_generation_limiter.remaining(user_id)).remaining
+
+@router.get("/project-interview/rate-limit")
+async def get_project_interview_rate_limit(user: User = Depends(require_premium)):
+    """Get remaining generations for today (premium users only)"""
+    status = await ai_generation_limiter.remaining(user.clerk_id)
+    return {
+        "remaining_generations": status.remaining,
+        "max_per_day": MAX_GENERATIONS_PER_DAY,
+        "can_generate": status.allowed
+    }
+
+GENERATION_WORKERS = int(os.environ.get('GENERATION_WORKERS', '2'))
+
+def validate_project_request(request: ProjectInterviewRequest):
+    if not request.project_title.strip():
+        raise HTTPException(status_code=400, detail="Project title is required")
+    if not request.tech_stack or len(request.tech_stack) == 0:
+        raise HTTPException(status_code=400, detail="At least one technology in tech stack is required")
+    if not request.project_description.strip():
+        raise HTTPException(status_code=400, detail="Project description is required")
+    if not request.features_implemented.strip():
+        raise HTTPException(status_code=400, detail="Features implemented is required")
+    if request.student_role not in ["Frontend", "Backend", "Full Stack", "Solo"]:
+        raise HTTPException(status_code=400, detail="Invalid student role. Must be Frontend, Backend, Full Stack, or Solo")
+
+async def generate_interview_questions(request: ProjectInterviewRequest) -> dict:
+    """Call the configured model backend through the SDK executor and parse its answer"""
+    model = get_model_backend()
+    if model is None:
+        raise PermanentJobError("AI service not configured")
+    
+    prompt = build_prompt(
+        request.project_title,
+        request.tech_stack,
+        request.project_description,
+        request.features_implemented,
+        request.student_role
+    )
+    response_text = await sdk.call("gemini", model.generate, prompt)
+    return parse_questions(response_text)
+
+generation_cache = GenerationCache(
+    db.ai_generation_cache,
+    ttl_days=int(os.environ.get('AI_CACHE_TTL_DAYS', '30')),
+    min_similarity=float(os.environ.get('AI_CACHE_MIN_SIMILARITY', '0.6'))
+)
+
+async def lookup_cached_generation(request: ProjectInterviewRequest):
+    """Returns (questions, "exact" | "similar" | "miss"); cache failures count as misses"""
+    if request.refresh:
+        return None, "miss"
+    try:
+        return await generation_cache.lookup(request)
+    except Exception as e:
+        logging.warning(f"AI generation cache lookup failed: {e}")
+        return None, "miss"
+
+async def log_generation(user_id: str, user_email: str, user_name: Optional[str], request: ProjectInterviewRequest, cache: str):
+    await log_activity(
+        user_id=user_id,
+        user_email=user_email,
+        user_name=user_name,
+        activity_type="ai_project_usage",
+        resource_name=request.project_title,
+        metadata={
+            "tech_stack": request.tech_stack,
+            "student_role": request.student_role,
+            "questions_generated": 15,
+            "cache": cache
+        }
+    )
+
+async def record_generation(user_id: str, user_email: str, user_name: Optional[str], request: ProjectInterviewRequest, questions: dict):
+    """Cache and log a fresh generation; its quota slot was already reserved"""
+    try:
+        await generation_cache.store(request, questions)
+    except Exception as e:
+        logging.warning(f"AI generation cache store failed: {e}")
+    
+    await log_generation(user_id, user_email, user_name, request, cache="miss")
+
+async def generate_reserved(request: ProjectInterviewRequest, reservation: Reservation) -> dict:
+    """Generate questions, giving the reserved quota slot back if generation fails"""
+    try:
+        return await generate_interview_questions(request)
+    except BaseException:
+        await ai_generation_limiter.refund(reservation)
+        raise
+
+@router.post("/project-interview/generate")
+async def generate_project_interview_questions(
+    request: ProjectInterviewRequest,
+    user: User = Depends(require_premium)
+):
+    """
+    Generate AI-powered interview questions based on project details.
+    PREMIUM USERS ONLY - Rate limited to 3 generations per day.
+    Holds the request open for the whole generation; prefer POST /project-interview/jobs.
+    """
+    validate_project_request(request)
+    
+    # Cached results are free: they return instantly and do not use up a daily generation
+    cached_questions, cache_status = await lookup_cached_generation(request)
+    if cached_questions:
+        await log_generation(user.clerk_id, user.email, user.name, request, cache=cache_status)
+        return {
+            "success": True,
+            "questions": cached_questions,
+            "remaining_generations": await remaining_generations(user.clerk_id),
+            "cached": cache_status,
+            "generated_at": datetime.now(timezone.utc).isoformat()
+        }
+    
+    reservation = await reserve_generation(user.clerk_id)
+    
+    try:
+        questions_data = await generate_reserved(request, reservation)
+        logging.info(f"Gemini response received for user {user.email}")
+        
+        await record_generation(user.clerk_id, user.email, user.name, request, questions_data)
+        
+        return {
+            "success": True,
+            "questions": questions_data,
+            "remaining_generations": reservation.remaining,
+            "cached": None,
+            "generated_at": datetime.now(timezone.utc).isoformat()
+        }
+        
+    except PermanentJobError as e:
+        logging.error(f"Error generating interview questions: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    except json.JSONDecodeError as e:
+        logging.error(f"Failed to parse AI response: {e}")
+        raise HTTPException(status_code=500, detail="Failed to parse AI response. Please try again.")
+    except (CircuitOpenError, ProviderTimeoutError) as e:
+        logging.error(f"AI service unavailable: {e}")
+        raise HTTPException(status_code=503, detail="AI service is busy. Please try again shortly.")
+    except Exception as e:
+        logging.error(f"Error generating interview questions: {e}")
+        import traceback
+        logging.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Failed to generate questions: {str(e)}")
+
+def format_sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def stream_generated_questions(request: ProjectInterviewRequest):
+    """
+    Stream a generation from the model, yielding ("question", {...}) as soon as each
+    question object is complete and finally ("complete", questions) once the whole
+    document has been validated.
+    """
+    model = get_model_backend()
+    if model is None:
+        raise PermanentJobError("AI service not configured")
+    
+    prompt = build_prompt(
+        request.project_title,
+        request.tech_stack,
+        request.project_description,
+        request.features_implemented,
+        request.student_role
+    )
+    parser = IncrementalQuestionParser()
+    async for chunk in sdk.stream("gemini", model.generate_stream, prompt):
+        for level, index, question in parser.feed(chunk):
+            yield "question", {"level": level, "index": index, "question": question}
+    
+    yield "complete", parse_questions(parser.text)
+
+@router.post("/project-interview/generate/stream")
+async def stream_project_interview_questions(
+    request: ProjectInterviewRequest,
+    http_request: Request,
+    user: User = Depends(require_premium)
+):
+    """
+    Streaming variant of /project-interview/generate. Sends each question as a
+    server-sent "question" event as soon as the model has produced it, then a
+    "done" event with the validated result (or an "error" event).
+    """
+    validate_project_request(request)
+    
+    cached_questions, cache_status = await lookup_cached_generation(request)
+    reservation = None if cached_questions else await reserve_generation(user.clerk_id)
+    
+    async def events():
+        if cached_questions:
+            for level in QUESTION_LEVELS:
+                for index, question in enumerate(cached_questions.get(level, [])):
+                    yield format_sse("question", {"level": level, "index": index, "question": question})
+            await log_generation(user.clerk_id, user.email, user.name, request, cache=cache_status)
+            yield format_sse("done", {
+                "success": True,
+                "questions": cached_questions,
+                "remaining_generations": await remaining_generations(user.clerk_id),
+                "cached": cache_status,
+                "generated_at": datetime.now(timezone.utc).isoformat()
+            })
+            return
+        
+        # The slot is refunded only if the client got no question at all: one that
+        # drops the stream after the questions it wanted still used its generation
+        questions_sent = 0
+        completed = False
+        try:
+            questions_data = None
+            async for kind, payload in stream_generated_questions(request):
+                if kind == "question":
+                    questions_sent += 1
+                    yield format_sse("question", payload)
+                    if await http_request.is_disconnected():
+                        logging.info(f"Client disconnected during streamed generation for {user.email}")
+                        return
+                else:
+                    questions_data = payload
+            
+            completed = True
+            await record_generation(user.clerk_id, user.email, user.name, request, questions_data)
+            yield format_sse("done", {
+                "success": True,
+                "questions": questions_data,
+                "remaining_generations": reservation.remaining,
+                "cached": None,
+                "generated_at": datetime.now(timezone.utc).isoformat()
+            })
+        except (CircuitOpenError, ProviderTimeoutError) as e:
+            logging.error(f"AI service unavailable: {e}")
+            yield format_sse("error", {"message": "AI service is busy. Please try again shortly."})
+        except ValueError as e:
+            logging.error(f"Failed to parse streamed AI response: {e}")
+            yield format_sse("error", {"message": "Failed to parse AI response. Please try again."})
+        except Exception as e:
+            logging.error(f"Error streaming interview questions: {e}")
+            yield format_sse("error", {"message": f"Failed to generate questions: {str(e)}"})
+        finally:
+            if not completed and not questions_sent:
+                await ai_generation_limiter.refund(reservation)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def process_generation_job(job: dict) -> dict:
+    request = ProjectInterviewRequest(**job['payload'])
+    questions_data = await generate_interview_questions(request)
+    await record_generation(job['user_id'], job['user_email'], job.get('user_name'), request, questions_data)
+    return {
+        "questions": questions_data,
+        "remaining_generations": job['rate_limit']['remaining'],
+        "cached": None,
+        "generated_at": datetime.now(timezone.utc).isoformat()
+    }
+
+async def refund_generation_job(job: dict, error: Exception):
+    """A job that failed for good gives its reserved quota slot back"""
+    slot = job.get('rate_limit')
+    if slot:
+        await ai_generation_limiter.refund(Reservation(True, slot['remaining'], 0, slot['key'], token=slot['token']))
+
+generation_queue = JobQueue(
+    db.generation_jobs,
+    process_generation_job,
+    concurrency=GENERATION_WORKERS,
+    on_failure=refund_generation_job
+)
+
+async def start_generation_queue():
+    generation_queue.start()
+    logging.info(f"✓ Generation queue started with {GENERATION_WORKERS} workers")
+
+async def stop_generation_queue():
+    await generation_queue.stop()
+
+# Registered by app/factory.py when this router is mounted
+on_startup = [start_generation_queue]
+on_shutdown = [stop_generation_queue]
+
+def generation_job_view(job: dict) -> dict:
+    return {
+        "job_id": job['id'],
+        "status": job['status'],
+        "progress": job.get('progress'),
+        "result": job.get('result'),
+        "error": job.get('error') if job['status'] == "failed" else None,
+        "created_at": job['created_at'],
+        "updated_at": job['updated_at']
+    }
+
+async def get_own_generation_job(job_id: str, user: User) -> dict:
+    job = await generation_queue.get(job_id)
+    if not job or job.get('user_id') != user.clerk_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/project-interview/jobs", status_code=202)
+async def submit_project_interview_job(
+    request: ProjectInterviewRequest,
+    user: User = Depends(require_premium)
+):
+    """Queue a generation and return immediately; poll the job or follow its events"""
+    validate_project_request(request)
+    
+    owner = {"user_id": user.clerk_id, "user_email": user.email, "user_name": user.name}
+    cached_questions, cache_status = await lookup_cached_generation(request)
+    if cached_questions:
+        # Recorded as an already completed job so clients can treat both paths the same way
+        await log_generation(user.clerk_id, user.email, user.name, request, cache=cache_status)
+        job = await generation_queue.submit(
+            request.model_dump(),
+            **owner,
+            status="completed",
+            progress="completed",
+            result={
+                "questions": cached_questions,
+                "remaining_generations": await remaining_generations(user.clerk_id),
+                "cached": cache_status,
+                "generated_at": datetime.now(timezone.utc).isoformat()
+            }
+        )
+    else:
+        # The slot is reserved now so queued jobs count against the quota straight away
+        reservation = await reserve_generation(user.clerk_id)
+        try:
+            job = await generation_queue.submit(
+                request.model_dump(),
+                **owner,
+                rate_limit={"key": reservation.key, "token": reservation.token, "remaining": reservation.remaining}
+            )
+        except BaseException:
+            await ai_generation_limiter.refund(reservation)
+            raise
+    
+    return {
+        "job_id": job['id'],
+        "status": job['status'],
+        "result": job['result'],
+        "status_url": f"/api/project-interview/jobs/{job['id']}",
+        "events_url": f"/api/project-interview/jobs/{job['id']}/events"
+    }
+
+@router.get("/project-interview/jobs/{job_id}")
+async def get_project_interview_job(job_id: str, user: User = Depends(require_premium)):
+    return generation_job_view(await get_own_generation_job(job_id, user))
+
+@router.get("/project-interview/jobs/{job_id}/events")
+async def stream_project_interview_job(job_id: str, http_request: Request, user: User = Depends(require_premium)):
+    """Server-sent events with the job's status until it completes or fails"""
+    await get_own_generation_job(job_id, user)
+    
+    async def events():
+        last_state = None
+        while True:
+            job = await generation_queue.get(job_id)
+            if job is None:
+                break
+            view = generation_job_view(job)
+            state = (view['status'], view['progress'])
+            if state != last_state:
+                last_state = state
+                yield format_sse(view['status'], view)
+            if view['status'] in ("completed", "failed") or await http_request.is_disconnected():
+                break
+            await asyncio.sleep(1.0)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, HTTPException, Header, Query
+from typing import Optional
+
+from search_index import highlight
+from app.db import read_db
+from app.cache import search_index
+from app.auth import get_current_user
+from app.schema import COMPANY_IDS_SCHEMA
+
+router = APIRouter(prefix="/api")
+
+MAX_PAGE_SIZE = 50
+MAX_PAGES = 50
+ANSWER_SNIPPET_LENGTH = 240
+
+async def start_search_index():
+    search_index.start()
+
+async def stop_search_index():
+    await search_index.stop()
+
+on_startup = [start_search_index]
+on_shutdown = [stop_search_index]
+
+@router.get("/search", dependencies=COMPANY_IDS_SCHEMA)
+async def search_questions(
+    q: str = Query(..., min_length=1, max_length=200),
+    topic_id: Optional[str] = None,
+    company_id: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    page: int = Query(1, ge=1, le=MAX_PAGES),
+    page_size: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    authorization: str = Header(None)
+):
+    """BM25 search over question text, answers, tags and category, with filters and highlighted matches"""
+    if not search_index.ready:
+        raise HTTPException(status_code=503, detail="Search index is warming up", headers={"Retry-After": "5"})
+    
+    total, hits, terms = search_index.search(
+        q,
+        {"topic_id": topic_id, "company_ids": company_id, "difficulty": difficulty},
+        limit=page_size,
+        offset=(page - 1) * page_size
+    )
+    
+    docs = {}
+    if hits:
+        docs = {
+            doc['id']: doc
+            for doc in await read_db.questions.find({"id": {"$in": [h[0] for h in hits]}}, {"_id": 0}).to_list(None)
+        }
+    
+    user = await get_current_user(authorization) if authorization else None
+    is_premium = bool(user and (user.is_premium or user.is_admin))
+    
+    results = []
+    for question_id, score in hits:
+        doc = docs.get(question_id)
+        if not doc:
+            continue
+        # Company question answers are premium, as on /company-questions
+        locked = bool(doc.get('company_ids')) and not is_premium
+        result = {
+            **doc,
+            "score": round(score, 4),
+            "highlight": {
+                "question": highlight(doc.get('question', ''), terms),
+                "answer": None if locked else highlight(doc.get('answer', ''), terms, ANSWER_SNIPPET_LENGTH)
+            }
+        }
+        if locked:
+            result.update({"answer": "🔒 Unlock premium to see the answer", "locked": True})
+        results.append(result)
+    
+    return {
+        "query": q,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "results": results
+    }
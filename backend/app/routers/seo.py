@@ -0,0 +1,190 @@
+from fastapi import APIRouter, HTTPException, Response
+from typing import Optional
+from datetime import datetime, timezone
+import os
+
+from seo_documents import (
+    GOLDMINE_PAGE, TOPICS_PAGE, ALUMNI_PAGE, EXPERIENCES_PAGE,
+    company_key, topic_key, experience_key, experiences_variant_key,
+    experiences_page_payload, encode_payload
+)
+from app.db import read_db
+from app.cache import seo_documents, facets
+
+site_router = APIRouter()
+router = APIRouter(prefix="/api")
+routers = [site_router, router]
+
+# ============= SEO ENHANCEMENT: SITEMAP & ROBOTS.TXT =============
+
+@site_router.get("/sitemap.xml", response_class=Response)
+async def get_sitemap():
+    """Generate dynamic XML sitemap for better SEO"""
+    base_url = os.environ.get('FRONTEND_URL', 'https://yourdomain.com')
+    
+    # Fetch all companies for company-specific pages
+    companies = await read_db.companies.find({}, {"_id": 0, "id": 1, "slug": 1, "name": 1}).to_list(1000)
+    
+    # Fetch all topics for topic-specific pages
+    topics = await read_db.topics.find({}, {"_id": 0, "id": 1, "name": 1}).to_list(1000)
+    
+    # Fetch all experiences
+    experiences = await read_db.experiences.find({}, {"_id": 0, "id": 1}).to_list(1000)
+    
+    # Build sitemap XML
+    sitemap = ['<?xml version="1.0" encoding="UTF-8"?>']
+    sitemap.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
+    
+    # Static pages with high priority
+    static_pages = [
+        {'loc': '/', 'priority': '1.0', 'changefreq': 'daily'},
+        {'loc': '/topics', 'priority': '0.9', 'changefreq': 'daily'},
+        {'loc': '/goldmine', 'priority': '0.9', 'changefreq': 'daily'},
+        {'loc': '/experiences', 'priority': '0.8', 'changefreq': 'weekly'},
+        {'loc': '/alumni', 'priority': '0.7', 'changefreq': 'weekly'},
+        {'loc': '/project-interview-prep', 'priority': '0.8', 'changefreq': 'weekly'},
+        {'loc': '/about', 'priority': '0.5', 'changefreq': 'monthly'},
+        {'loc': '/contact', 'priority': '0.5', 'changefreq': 'monthly'},
+        {'loc': '/faq', 'priority': '0.6', 'changefreq': 'monthly'},
+    ]
+    
+    for page in static_pages:
+        sitemap.append(f'''
+  <url>
+    <loc>{base_url}{page['loc']}</loc>
+    <lastmod>{datetime.now(timezone.utc).strftime('%Y-%m-%d')}</lastmod>
+    <changefreq>{page['changefreq']}</changefreq>
+    <priority>{page['priority']}</priority>
+  </url>''')
+    
+    # Company-specific pages (HIGHEST SEO PRIORITY - these are goldmine pages)
+    for company in companies:
+        company_id = company.get('id')
+        if company_id:
+            sitemap.append(f'''
+  <url>
+    <loc>{base_url}/company/{company_id}</loc>
+    <lastmod>{datetime.now(timezone.utc).strftime('%Y-%m-%d')}</lastmod>
+    <changefreq>weekly</changefreq>
+    <priority>0.95</priority>
+  </url>''')
+    
+    # Topic-specific pages (HIGH SEO PRIORITY for "java interview questions" etc)
+    for topic in topics:
+        topic_id = topic.get('id')
+        if topic_id:
+            sitemap.append(f'''
+  <url>
+    <loc>{base_url}/topics?topic={topic_id}</loc>
+    <lastmod>{datetime.now(timezone.utc).strftime('%Y-%m-%d')}</lastmod>
+    <changefreq>weekly</changefreq>
+    <priority>0.92</priority>
+  </url>''')
+    
+    # Experience pages
+    for exp in experiences:
+        sitemap.append(f'''
+  <url>
+    <loc>{base_url}/experience/{exp['id']}</loc>
+    <lastmod>{datetime.now(timezone.utc).strftime('%Y-%m-%d')}</lastmod>
+    <changefreq>monthly</changefreq>
+    <priority>0.6</priority>
+  </url>''')
+    
+    sitemap.append('</urlset>')
+    
+    return Response(
+        content=''.join(sitemap),
+        media_type='application/xml',
+        headers={'Cache-Control': 'public, max-age=3600'}
+    )
+
+@site_router.get("/robots.txt", response_class=Response)
+async def get_robots():
+    """Robots.txt for SEO crawling"""
+    base_url = os.environ.get('FRONTEND_URL', 'https://yourdomain.com')
+    
+    robots_content = f"""User-agent: *
+Allow: /
+Allow: /topics
+Allow: /goldmine
+Allow: /company/*
+Allow: /experiences
+Allow: /experience/*
+Allow: /alumni
+
+Disallow: /admin
+Disallow: /api/admin
+Disallow: /dashboard
+
+Sitemap: {base_url}/sitemap.xml
+"""
+    
+    return Response(
+        content=robots_content,
+        media_type='text/plain',
+        headers={'Cache-Control': 'public, max-age=86400'}
+    )
+
+# ============= SEO ENHANCEMENT: STRUCTURED DATA ENDPOINTS =============
+
+# Payloads are precomputed into seo_documents whenever content changes and served
+# as stored bytes, so a crawler hit costs at most one _id lookup
+
+def seo_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+@router.get("/seo/company/{company_id}")
+async def get_company_seo_data(company_id: str):
+    """Get SEO-optimized company data with structured data markup"""
+    body = await seo_documents.get_or_build(company_key(company_id))
+    if body is None:
+        raise HTTPException(status_code=404, detail="Company not found")
+    return seo_response(body)
+
+@router.get("/seo/experience/{experience_id}")
+async def get_experience_seo_data(experience_id: str):
+    """Get SEO-optimized experience data"""
+    body = await seo_documents.get_or_build(experience_key(experience_id))
+    if body is None:
+        raise HTTPException(status_code=404, detail="Experience not found")
+    return seo_response(body)
+
+@router.get("/seo/goldmine")
+async def get_goldmine_seo_data():
+    """Get SEO-optimized data for goldmine/companies page"""
+    return seo_response(await seo_documents.get_or_build(GOLDMINE_PAGE))
+
+@router.get("/seo/topics-page")
+async def get_topics_page_seo_data():
+    """Get SEO-optimized data for topics/home page"""
+    return seo_response(await seo_documents.get_or_build(TOPICS_PAGE))
+
+@router.get("/seo/alumni")
+async def get_alumni_seo_data():
+    """Get SEO-optimized data for alumni page"""
+    return seo_response(await seo_documents.get_or_build(ALUMNI_PAGE))
+
+@router.get("/seo/experiences")
+async def get_experiences_page_seo_data(company_name: Optional[str] = None):
+    """Get SEO-optimized data for experiences listing page"""
+    if not company_name:
+        return seo_response(await seo_documents.get_or_build(EXPERIENCES_PAGE))
+    
+    body = await seo_documents.get(experiences_variant_key(company_name))
+    if body is None:
+        # Only companies with experiences get a stored variant; arbitrary names
+        # are answered from the in-memory facet counts and never trigger a rebuild
+        counts = await facets.counts("experiences", "company_name")
+        if company_name in counts:
+            seo_documents.schedule([EXPERIENCES_PAGE])
+        body = encode_payload(experiences_page_payload(counts, company_name))
+    return seo_response(body)
+
+@router.get("/seo/topic/{topic_id}")
+async def get_topic_seo_data(topic_id: str):
+    """Get SEO-optimized topic data with structured data markup"""
+    body = await seo_documents.get_or_build(topic_key(topic_id))
+    if body is None:
+        raise HTTPException(status_code=404, detail="Topic not found")
+    return seo_response(body)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import Optional
+
+from suggest import MAX_SUGGESTIONS
+from app.cache import suggestions
+
+router = APIRouter(prefix="/api")
+
+# Suggestions only change on admin writes; browsers and CDNs may reuse them for a
+# few minutes and revalidate with the ETag after that
+SUGGEST_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=3600"
+
+@router.get("/suggest", response_class=Response)
+async def suggest(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    types: Optional[str] = Query(None, description="Comma-separated: company, topic, alumni, alumni_company"),
+    limit: int = Query(8, ge=1, le=MAX_SUGGESTIONS)
+):
+    """Typeahead suggestions for companies, topics and alumni matching a prefix"""
+    kinds = [kind.strip() for kind in types.split(",") if kind.strip()] if types else None
+    try:
+        digest, body = await suggestions.suggest(q, kinds, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    headers = {"ETag": f'"{digest}"', "Cache-Control": SUGGEST_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,36 @@
+from fastapi import Depends, HTTPException
+import time
+
+from migrations import COMPANY_IDS_VERSION, schema_version
+from app.db import db
+
+# The schema version this process last saw applied. Routes reading data that a
+# migration reshapes depend on require_schema(version) and answer 503 until
+# `python migrations.py` has applied it; once it has, the check costs nothing.
+RECHECK_SECONDS = 30
+
+_state = {"version": 0, "checked_at": float("-inf")}
+
+def note_schema_version(version: int):
+    _state["version"] = version
+    _state["checked_at"] = time.monotonic()
+
+async def schema_at_least(version: int) -> bool:
+    """Re-reads the stored version at most every RECHECK_SECONDS while it is behind"""
+    if _state["version"] < version and time.monotonic() - _state["checked_at"] >= RECHECK_SECONDS:
+        note_schema_version(await schema_version(db))
+    return _state["version"] >= version
+
+def require_schema(version: int):
+    """Dependency: 503 with Retry-After while the database schema is older than version"""
+    async def check():
+        if not await schema_at_least(version):
+            raise HTTPException(
+                status_code=503,
+                detail=f"Database migration to v{version} pending",
+                headers={"Retry-After": str(RECHECK_SECONDS)}
+            )
+    return check
+
+# Routes that read or write questions by company_ids
+COMPANY_IDS_SCHEMA = [Depends(require_schema(COMPANY_IDS_VERSION))]
@@ -0,0 +1,15 @@
+import os
+
+from sdk_executor import SDKExecutor
+from services import build_service_registry, clerk_caller_errors, razorpay_caller_errors, cloudinary_caller_errors
+
+# Clerk, Razorpay and Cloudinary are imported and configured on first use, so
+# cold starts serving public reads never load a payment or auth SDK
+services = build_service_registry()
+
+# Blocking third-party SDK calls run here instead of inside async handlers
+sdk = SDKExecutor(max_workers=int(os.environ.get('SDK_MAX_WORKERS', '32')))
+sdk.register("clerk", max_concurrency=16, timeout=5.0, expected_exceptions=clerk_caller_errors)
+sdk.register("razorpay", max_concurrency=8, timeout=10.0, expected_exceptions=razorpay_caller_errors)
+sdk.register("cloudinary", max_concurrency=4, timeout=60.0, expected_exceptions=cloudinary_caller_errors)
+sdk.register("gemini", max_concurrency=int(os.environ.get('GEMINI_MAX_CONCURRENCY', '4')), timeout=120.0)
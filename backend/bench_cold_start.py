@@ -0,0 +1,57 @@
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def cold_start(path: str, timeout: float = 60.0) -> float:
+    """Seconds from launching a fresh server process to its first successful response"""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"No response from {path} within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+def main():
+    """Cold-start benchmark: python bench_cold_start.py [runs] [path]"""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    path = sys.argv[2] if len(sys.argv) > 2 else "/robots.txt"
+    
+    print(f"Measuring time to first served request ({path}) over {runs} cold starts "
+          f"against {os.environ.get('DB_NAME', 'the .env database')}...")
+    samples = []
+    for run in range(1, runs + 1):
+        seconds = cold_start(path)
+        samples.append(seconds)
+        print(f"  run {run}: {seconds * 1000:.0f} ms")
+    
+    print(f"\nmedian {statistics.median(samples) * 1000:.0f} ms, "
+          f"min {min(samples) * 1000:.0f} ms, max {max(samples) * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Literal, Optional, Type
+from pydantic import BaseModel, ValidationError
+from pymongo import DeleteOne, UpdateOne
+
+MAX_BULK_OPERATIONS = 5000
+
+class BulkOperation(BaseModel):
+    """A single edit or delete in a bulk admin request"""
+    op: Literal["update", "delete"]
+    id: str
+    data: dict = {}
+
+class BulkRequest(BaseModel):
+    operations: List[BulkOperation]
+
+@dataclass
+class BulkPlan:
+    requests: list = field(default_factory=list)  # pymongo write models, one per touched document
+    changes: list = field(default_factory=list)   # (old_doc, new_doc or None when deleted)
+    errors: list = field(default_factory=list)    # {"index", "id", "error"} per rejected operation
+    updated: int = 0
+    deleted: int = 0
+
+def plan_bulk(operations: List[BulkOperation], existing: dict, model: Type[BaseModel]) -> BulkPlan:
+    """
+    Fold a batch of operations into at most one write per document.
+    Several operations on the same id are applied in order, so only the final
+    state is written and side effects are computed once per document.
+    Updates are partial: data is merged onto the current document and the
+    merged document is validated with model.
+    """
+    plan = BulkPlan()
+    state = {}
+    
+    for index, operation in enumerate(operations):
+        current = state.get(operation.id, existing.get(operation.id))
+        if current is None:
+            plan.errors.append({"index": index, "id": operation.id, "error": "Not found"})
+            continue
+        
+        if operation.op == "delete":
+            state[operation.id] = None
+            continue
+        
+        data = {k: v for k, v in operation.data.items() if k not in ("_id", "id")}
+        if not data:
+            plan.errors.append({"index": index, "id": operation.id, "error": "No fields to update"})
+            continue
+        try:
+            validated = model(**{**current, **data}).model_dump()
+        except ValidationError as e:
+            plan.errors.append({
+                "index": index,
+                "id": operation.id,
+                "error": "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            })
+            continue
+        state[operation.id] = {**current, **{k: validated[k] for k in data if k in validated}}
+    
+    for doc_id, new_doc in state.items():
+        old_doc = existing.get(doc_id)
+        if old_doc is None:
+            continue
+        if new_doc is None:
+            plan.requests.append(DeleteOne({"id": doc_id}))
+            plan.changes.append((old_doc, None))
+            plan.deleted += 1
+            continue
+        diff = {k: v for k, v in new_doc.items() if old_doc.get(k) != v}
+        if diff:
+            plan.requests.append(UpdateOne({"id": doc_id}, {"$set": diff}))
+            plan.changes.append((old_doc, new_doc))
+            plan.updated += 1
+    
+    return plan
+
+def company_count_deltas(changes) -> Counter:
+    """question_count deltas for (old_doc, new_doc) question pairs; None stands for no document"""
+    deltas = Counter()
+    for old_doc, new_doc in changes:
+        old_companies = set((old_doc or {}).get('company_ids') or [])
+        new_companies = set((new_doc or {}).get('company_ids') or [])
+        deltas.update(new_companies - old_companies)
+        deltas.subtract(old_companies - new_companies)
+    return deltas
+
+def question_side_effects(changes: list) -> tuple:
+    """
+    Collapse the side effects of a batch of question changes into one set of
+    counter deltas and one list of cache patterns.
+    """
+    companies = set()
+    topics_touched = False
+    
+    for old_doc, new_doc in changes:
+        companies.update(old_doc.get('company_ids') or [])
+        companies.update((new_doc or {}).get('company_ids') or [])
+        if old_doc.get('topic_id') or (new_doc and new_doc.get('topic_id')):
+            topics_touched = True
+    
+    deltas = {c: d for c, d in company_count_deltas(changes).items() if c and d}
+    patterns = [f"company_questions*company_id:{company_id}" for company_id in sorted(companies)]
+    if topics_touched:
+        patterns.append("questions*")
+    if changes:
+        patterns.append("bookmarks*")
+    if deltas:
+        patterns.append("companies*")
+    return deltas, patterns
+
+def bulk_response(plan: BulkPlan, extra: Optional[dict] = None) -> dict:
+    return {
+        "success": not plan.errors,
+        "updated": plan.updated,
+        "deleted": plan.deleted,
+        "errors": plan.errors,
+        **(extra or {})
+    }
@@ -0,0 +1,319 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from datetime import datetime, timezone
+from pymongo import DeleteMany, ReplaceOne, UpdateOne
+
+from minhash import band_keys, signature, words
+
+# Near-duplicate detection for question text. A question is reduced to its set of
+# word 3-grams ("shingles"); two questions are near-duplicates when the Jaccard
+# similarity of those sets reaches DUPLICATE_THRESHOLD. Candidates are found with
+# MinHash LSH (see minhash.py): questions sharing any band key are compared. A
+# pair at 0.8 similarity shares a band 99.98% of the time, one at 0.3 about 12%.
+#
+# Keys live in question_fingerprints ({_id: question id, bands, company_ids}) with a
+# multikey index on bands, kept in step by the admin question endpoints.
+FINGERPRINT_COLLECTION = "question_fingerprints"
+
+DUPLICATE_THRESHOLD = 0.8
+SHINGLE_SIZE = 3
+MAX_CANDIDATES = 100
+
+def shingles(text: str) -> Set[str]:
+    tokens = words(text)
+    if len(tokens) <= SHINGLE_SIZE:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def text_band_keys(text: str) -> List[str]:
+    """LSH keys for a question text; empty for text without words"""
+    return band_keys(signature(shingles(text)))
+
+def fingerprint(question: dict) -> dict:
+    return {"bands": text_band_keys(question.get('question', '')), "company_ids": question.get('company_ids') or []}
+
+# ============= STORAGE =============
+
+async def save_fingerprints(db, questions: Iterable[dict], session=None):
+    requests = [ReplaceOne({"_id": q['id']}, fingerprint(q), upsert=True) for q in questions if q and q.get('id')]
+    if requests:
+        await db[FINGERPRINT_COLLECTION].bulk_write(requests, ordered=False, session=session)
+
+async def remove_fingerprints(db, question_ids: Iterable[str], session=None):
+    ids = [question_id for question_id in question_ids if question_id]
+    if ids:
+        await db[FINGERPRINT_COLLECTION].bulk_write([DeleteMany({"_id": {"$in": ids}})], session=session)
+
+async def add_fingerprint_companies(db, merges: Dict[str, List[str]], session=None):
+    """Record companies added to stored questions ({question id: company ids})"""
+    requests = [
+        UpdateOne({"_id": question_id}, {"$addToSet": {"company_ids": {"$each": company_ids}}})
+        for question_id, company_ids in merges.items() if company_ids
+    ]
+    if requests:
+        await db[FINGERPRINT_COLLECTION].bulk_write(requests, ordered=False, session=session)
+
+async def pull_fingerprint_company(db, question_ids: List[str], company_id: str, session=None):
+    if question_ids:
+        await db[FINGERPRINT_COLLECTION].update_many(
+            {"_id": {"$in": question_ids}}, {"$pull": {"company_ids": company_id}}, session=session
+        )
+
+async def create_fingerprint_indexes(db):
+    await db[FINGERPRINT_COLLECTION].create_index("bands")
+
+async def rebuild_fingerprints(db) -> int:
+    """Fingerprint every question (backfill)"""
+    count = 0
+    batch = []
+    async for question in db.questions.find({"id": {"$type": "string"}}, {"_id": 0, "id": 1, "question": 1, "company_ids": 1}):
+        batch.append(question)
+        if len(batch) >= 1000:
+            await save_fingerprints(db, batch)
+            count += len(batch)
+            batch = []
+    await save_fingerprints(db, batch)
+    return count + len(batch)
+
+# ============= MATCHING =============
+
+async def find_duplicates(
+    db,
+    questions: Sequence[dict],
+    threshold: float = DUPLICATE_THRESHOLD
+) -> List[List[dict]]:
+    """
+    For each new question, the stored questions and earlier questions of the same
+    batch it nearly duplicates: [{id, question, company_ids, topic_id, similarity}],
+    most similar first. Two round trips for the whole batch.
+    """
+    keys = [text_band_keys(q.get('question', '')) for q in questions]
+    own_ids = {q.get('id') for q in questions}
+    all_keys = list({key for question_keys in keys for key in question_keys})
+    
+    candidates: Dict[str, dict] = {}
+    by_band: Dict[str, List[str]] = {}
+    if all_keys:
+        fingerprints = await db[FINGERPRINT_COLLECTION].find(
+            {"bands": {"$in": all_keys}, "_id": {"$nin": list(own_ids)}}, {"bands": 1}
+        ).limit(MAX_CANDIDATES * len(questions)).to_list(None)
+        for fp in fingerprints:
+            for key in fp['bands']:
+                by_band.setdefault(key, []).append(fp['_id'])
+        wanted = {candidate_id for question_keys in keys for key in question_keys for candidate_id in by_band.get(key, ())}
+        if wanted:
+            candidates = {
+                doc['id']: doc
+                for doc in await db.questions.find(
+                    {"id": {"$in": list(wanted)}},
+                    {"_id": 0, "id": 1, "question": 1, "company_ids": 1, "topic_id": 1}
+                ).to_list(None)
+            }
+    
+    candidate_shingles = {candidate_id: shingles(doc.get('question', '')) for candidate_id, doc in candidates.items()}
+    seen_in_batch: Dict[str, List[int]] = {}
+    batch_shingles = []
+    results = []
+    for index, question in enumerate(questions):
+        own = shingles(question.get('question', ''))
+        batch_shingles.append(own)
+        matches = []
+        for candidate_id in {c for key in keys[index] for c in by_band.get(key, ()) if c in candidates}:
+            similarity = jaccard(own, candidate_shingles[candidate_id])
+            if similarity >= threshold:
+                matches.append({**candidates[candidate_id], "similarity": round(similarity, 3)})
+        for earlier in {e for key in keys[index] for e in seen_in_batch.get(key, ())}:
+            similarity = jaccard(own, batch_shingles[earlier])
+            if similarity >= threshold:
+                previous = questions[earlier]
+                matches.append({
+                    "id": previous.get('id'), "question": previous.get('question'),
+                    "company_ids": previous.get('company_ids') or [], "topic_id": previous.get('topic_id'),
+                    "similarity": round(similarity, 3)
+                })
+        for key in keys[index]:
+            seen_in_batch.setdefault(key, []).append(index)
+        matches.sort(key=lambda match: -match['similarity'])
+        results.append(matches)
+    return results
+
+def fold_duplicates(docs: List[dict], rows: list, duplicates: List[List[dict]]) -> Tuple[List[dict], list, Dict[str, List[str]], int]:
+    """
+    Fold each new question into its closest near-duplicate in the same bank (see
+    same_bank): an earlier new question takes over its company_ids, a stored one
+    is returned in {stored id: company ids to add}. Questions without such a
+    duplicate are kept. Returns the remaining docs and their rows, those merges
+    and how many questions were folded.
+    """
+    positions = {doc['id']: index for index, doc in enumerate(docs)}
+    redirect: Dict[str, str] = {}
+    merges: Dict[str, List[str]] = {}
+    keep = []
+    for index, (doc, matches) in enumerate(zip(docs, duplicates)):
+        target = next((match for match in matches if same_bank(doc, match)), None)
+        if target is None:
+            keep.append(index)
+            continue
+        # An earlier question folded away already points at its own target
+        target_id = redirect.get(target['id'], target['id'])
+        redirect[doc['id']] = target_id
+        if target_id in positions:
+            target = docs[positions[target_id]]
+            target['company_ids'] = list(dict.fromkeys(target['company_ids'] + doc['company_ids']))
+        else:
+            merges[target_id] = list(dict.fromkeys(merges.get(target_id, []) + doc['company_ids']))
+    return [docs[i] for i in keep], [rows[i] for i in keep], merges, len(docs) - len(keep)
+
+def same_home(question: dict, match: dict) -> bool:
+    """Whether a duplicate sits where the new question would (a shared company, or both in the topic bank)"""
+    companies, match_companies = set(question.get('company_ids') or []), set(match.get('company_ids') or [])
+    return bool(companies & match_companies) if companies or match_companies else True
+
+def same_bank(question: dict, match: dict) -> bool:
+    """
+    Whether question can be folded into match: both in the same topic bank, or
+    both company questions. A topic question (free to read) never absorbs a
+    company question, and a company question never lands in a topic bank.
+    """
+    return (question.get('topic_id') or "") == (match.get('topic_id') or "")
+
+async def duplicate_groups(db, threshold: float = DUPLICATE_THRESHOLD, company_id: Optional[str] = None) -> List[dict]:
+    """
+    Clusters of near-duplicate questions across the whole bank, largest first:
+    [{"questions": [...], "company_ids": [...]}]. Pairs come from shared band keys
+    and are verified on their shingles.
+    """
+    match = {"company_ids": company_id} if company_id else {}
+    buckets = await db[FINGERPRINT_COLLECTION].aggregate([
+        {"$match": match},
+        {"$unwind": "$bands"},
+        {"$group": {"_id": "$bands", "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ], allowDiskUse=True).to_list(None)
+    
+    pairs: Set[Tuple[str, str]] = set()
+    for bucket in buckets:
+        ids = sorted(bucket['ids'])
+        pairs.update((a, b) for i, a in enumerate(ids) for b in ids[i + 1:])
+    if not pairs:
+        return []
+    
+    involved = list({question_id for pair in pairs for question_id in pair})
+    docs = {
+        doc['id']: doc
+        for doc in await db.questions.find(
+            {"id": {"$in": involved}},
+            {"_id": 0, "id": 1, "question": 1, "answer": 1, "company_ids": 1, "topic_id": 1,
+             "category": 1, "difficulty": 1, "tags": 1, "created_at": 1}
+        ).to_list(None)
+    }
+    shingle_sets = {question_id: shingles(doc.get('question', '')) for question_id, doc in docs.items()}
+    
+    parent = {question_id: question_id for question_id in docs}
+    
+    def find(question_id: str) -> str:
+        while parent[question_id] != question_id:
+            parent[question_id] = parent[parent[question_id]]
+            question_id = parent[question_id]
+        return question_id
+    
+    for a, b in pairs:
+        if a in docs and b in docs and jaccard(shingle_sets[a], shingle_sets[b]) >= threshold:
+            parent[find(a)] = find(b)
+    
+    clusters: Dict[str, List[dict]] = {}
+    for question_id, doc in docs.items():
+        clusters.setdefault(find(question_id), []).append(doc)
+    groups = [
+        {
+            "questions": sorted(members, key=lambda doc: doc['id']),
+            "company_ids": sorted({c for doc in members for c in doc.get('company_ids') or []})
+        }
+        for members in clusters.values()
+        if len(members) > 1
+    ]
+    groups.sort(key=lambda group: (-len(group['questions']), group['questions'][0]['id']))
+    return groups
+
+# ============= MERGING =============
+
+def _normalized(text) -> str:
+    return " ".join((text or "").split())
+
+def exact_copies(group: dict) -> List[List[dict]]:
+    """
+    The members of a duplicate group that are copies of one another: same bank,
+    same question and answer up to whitespace, same category and difficulty.
+    Only these are merged without review; nothing but their ids is lost.
+    """
+    copies: Dict[tuple, List[dict]] = {}
+    for doc in group['questions']:
+        key = (
+            doc.get('topic_id') or "", _normalized(doc.get('question')).lower(), _normalized(doc.get('answer')),
+            doc.get('category'), doc.get('difficulty')
+        )
+        copies.setdefault(key, []).append(doc)
+    return [members for members in copies.values() if len(members) > 1]
+
+def plan_merge(members: List[dict]) -> Tuple[str, dict, List[str]]:
+    """
+    (surviving id, fields to set on it, ids to delete) for a set of exact copies.
+    The oldest question survives and takes every company and tag of the set.
+    """
+    members = sorted(members, key=lambda doc: (doc.get('created_at') or "", doc['id']))
+    fields = {
+        "company_ids": list(dict.fromkeys(c for doc in members for c in doc.get('company_ids') or [])),
+        "tags": list(dict.fromkeys(t for doc in members for t in doc.get('tags') or [])),
+    }
+    return members[0]['id'], fields, [doc['id'] for doc in members[1:]]
+
+async def merge_duplicates(db) -> dict:
+    """
+    Fold exact copies of a question (see exact_copies) into one question shared
+    by all of their companies, pointing bookmarks at the survivor. Other
+    near-duplicates are only counted: they are left for review under
+    /api/admin/questions/duplicates. Run once when questions moved to
+    company_ids; safe to re-run.
+    """
+    groups = await duplicate_groups(db)
+    updates, fingerprints, removed, changed = [], [], [], []
+    bookmark_moves = []
+    to_review = 0
+    for group in groups:
+        copies = exact_copies(group)
+        if len(group['questions']) - sum(len(members) - 1 for members in copies) > 1:
+            to_review += 1
+        for members in copies:
+            survivor_id, fields, merged_ids = plan_merge(members)
+            updates.append(UpdateOne({"id": survivor_id}, {"$set": fields}))
+            survivor = next(doc for doc in members if doc['id'] == survivor_id)
+            fingerprints.append({**survivor, **fields})
+            removed.extend(merged_ids)
+            changed.extend([survivor_id, *merged_ids])
+            bookmark_moves.append((survivor_id, merged_ids))
+    
+    for start in range(0, len(updates), 1000):
+        await db.questions.bulk_write(updates[start:start + 1000], ordered=False)
+    for survivor_id, merged_ids in bookmark_moves:
+        # A user may have bookmarked several copies: add the survivor before pulling them
+        await db.users.update_many(
+            {"bookmarked_questions": {"$in": merged_ids}},
+            {"$addToSet": {"bookmarked_questions": survivor_id}}
+        )
+        await db.users.update_many(
+            {"bookmarked_questions": {"$in": merged_ids}},
+            {"$pull": {"bookmarked_questions": {"$in": merged_ids}}}
+        )
+    for start in range(0, len(removed), 1000):
+        await db.questions.delete_many({"id": {"$in": removed[start:start + 1000]}})
+    await remove_fingerprints(db, removed)
+    await save_fingerprints(db, fingerprints)
+    if changed:
+        # Picked up by every worker's search index on its next sync
+        now = datetime.now(timezone.utc)
+        await db.search_changes.insert_many([{"question_id": question_id, "created_at": now} for question_id in changed])
+    return {"merged_into": len(bookmark_moves), "merged": len(removed), "to_review": to_review}
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from pymongo import DeleteMany, UpdateOne
+
+# Value counts for the filterable fields of alumni and experiences, maintained on
+# every write so filter dropdowns and SEO pages never need a distinct() scan.
+# One document per (source, field, value): {_id, source, field, value, count}.
+FACET_COLLECTION = "facet_counts"
+
+FACET_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "alumni": ("company", "role", "location", "graduation_year"),
+    "experiences": ("company_name", "role", "status"),
+}
+
+MAX_FACET_LIMIT = 500
+
+def _facet_id(source: str, field: str, value) -> str:
+    return f"{source}|{field}|{type(value).__name__}|{value}"
+
+def facet_deltas(source: str, changes: Iterable[Tuple[Optional[dict], Optional[dict]]]) -> Counter:
+    """(field, value) -> count delta for (old_doc, new_doc) pairs; None stands for a missing side"""
+    deltas = Counter()
+    for old_doc, new_doc in changes:
+        for field in FACET_FIELDS[source]:
+            old_value = old_doc.get(field) if old_doc else None
+            new_value = new_doc.get(field) if new_doc else None
+            if old_value == new_value:
+                continue
+            if old_value not in (None, ""):
+                deltas[(field, old_value)] -= 1
+            if new_value not in (None, ""):
+                deltas[(field, new_value)] += 1
+    return Counter({key: delta for key, delta in deltas.items() if delta})
+
+def facet_projection(source: str) -> dict:
+    """Projection loading just the faceted fields of a document"""
+    return {"_id": 0, **{field: 1 for field in FACET_FIELDS[source]}}
+
+async def top_facet_values(db, source: str, field: str, limit: int = 0) -> List[dict]:
+    """[{"value", "count"}] for one field, most common first"""
+    return await db[FACET_COLLECTION].find(
+        {"source": source, "field": field, "count": {"$gt": 0}},
+        {"_id": 0, "value": 1, "count": 1}
+    ).sort("count", -1).limit(limit).to_list(None)
+
+async def apply_facet_deltas(db, source: str, deltas: Counter, session=None) -> bool:
+    """Apply count deltas with atomic $inc in one bulk write, dropping values that reach zero"""
+    if not deltas:
+        return False
+    collection = db[FACET_COLLECTION]
+    requests = [
+        UpdateOne(
+            {"_id": _facet_id(source, field, value)},
+            {"$inc": {"count": delta}, "$setOnInsert": {"source": source, "field": field, "value": value}},
+            upsert=True
+        )
+        for (field, value), delta in deltas.items()
+    ]
+    if any(delta < 0 for delta in deltas.values()):
+        requests.append(DeleteMany({"source": source, "count": {"$lte": 0}}))
+    await collection.bulk_write(requests, ordered=True, session=session)
+    return True
+
+async def rebuild_facets(db, source: Optional[str] = None):
+    """Recount facets from scratch with one aggregation per source"""
+    collection = db[FACET_COLLECTION]
+    for name in ([source] if source else list(FACET_FIELDS)):
+        fields = FACET_FIELDS[name]
+        result = await db[name].aggregate([
+            {"$facet": {
+                field: [
+                    {"$match": {field: {"$nin": [None, ""]}}},
+                    {"$group": {"_id": f"${field}", "count": {"$sum": 1}}}
+                ]
+                for field in fields
+            }}
+        ]).to_list(None)
+        rows = result[0] if result else {}
+        
+        documents = [
+            {"_id": _facet_id(name, field, row['_id']), "source": name, "field": field, "value": row['_id'], "count": row['count']}
+            for field in fields
+            for row in rows.get(field, [])
+        ]
+        await collection.delete_many({"source": name})
+        if documents:
+            await collection.insert_many(documents, ordered=False)
+
+async def create_facet_indexes(db):
+    await db[FACET_COLLECTION].create_index([("source", 1), ("field", 1), ("count", -1)])
+
+class FacetService:
+    """
+    Facet counts per source, loaded with one indexed query and kept in memory
+    for ttl seconds. Writers in this process call invalidate() after applying
+    deltas; other processes see the change once their copy expires.
+    """
+    
+    def __init__(self, db, ttl: float = 60.0):
+        self.db = db
+        self.ttl = ttl
+        self._memory: Dict[str, Tuple[float, Dict[str, List[dict]]]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+    
+    async def _load(self, source: str) -> Dict[str, List[dict]]:
+        cached = self._memory.get(source)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
+        lock = self._locks.setdefault(source, asyncio.Lock())
+        async with lock:
+            cached = self._memory.get(source)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+            rows = await self.db[FACET_COLLECTION].find(
+                {"source": source, "count": {"$gt": 0}},
+                {"_id": 0, "field": 1, "value": 1, "count": 1}
+            ).sort([("field", 1), ("count", -1)]).to_list(None)
+            
+            by_field = {field: [] for field in FACET_FIELDS[source]}
+            for row in rows:
+                if row['field'] in by_field:
+                    by_field[row['field']].append({"value": row['value'], "count": row['count']})
+            for values in by_field.values():
+                values.sort(key=lambda item: (-item['count'], str(item['value'])))
+            self._memory[source] = (time.monotonic() + self.ttl, by_field)
+            return by_field
+    
+    async def get(self, source: str, field: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, List[dict]]:
+        """{field: [{"value", "count"}, ...]} most common first, at most limit values per field"""
+        if field and field not in FACET_FIELDS[source]:
+            raise ValueError(f"Unknown facet '{field}'; choose from {', '.join(FACET_FIELDS[source])}")
+        by_field = await self._load(source)
+        fields = [field] if field else list(by_field)
+        return {name: by_field[name][:limit] if limit else by_field[name] for name in fields}
+    
+    async def counts(self, source: str, field: str) -> Dict:
+        """value -> count for one field"""
+        return {item['value']: item['count'] for item in (await self._load(source))[field]}
+    
+    def invalidate(self, source: str):
+        self._memory.pop(source, None)
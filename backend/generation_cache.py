@@ -0,0 +1,123 @@
+import hashlib
+from datetime import datetime, timezone, timedelta
+from typing import List, Optional, Tuple
+
+from minhash import band_keys, estimated_jaccard, signature, words
+
+_STOPWORDS = frozenset("a an and the of to in for with on using by is it my app application project".split())
+
+def normalize_text(text: str) -> str:
+    return " ".join(words(text))
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in words(text) if t not in _STOPWORDS]
+
+def _normalize_tech(tech: str) -> str:
+    # "Node.js", "nodejs" and "Node" are the same technology
+    tech = normalize_text(tech)
+    if tech.endswith(" js"):
+        tech = tech[:-3]
+    elif tech.endswith("js") and len(tech) > 4:
+        tech = tech[:-2]
+    return tech
+
+def normalize_tech_stack(tech_stack: List[str]) -> List[str]:
+    return sorted({_normalize_tech(t) for t in tech_stack if _normalize_tech(t)})
+
+def project_fingerprint(title: str, tech_stack: List[str], description: str, features: str, role: str) -> str:
+    """Exact-match key: identical after lowercasing, dropping punctuation and reordering the tech stack"""
+    canonical = "\x1f".join([
+        normalize_text(title),
+        ",".join(normalize_tech_stack(tech_stack)),
+        normalize_text(description),
+        normalize_text(features),
+        normalize_text(role)
+    ])
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def project_shingles(title: str, tech_stack: List[str], description: str, features: str) -> set:
+    """Token set for MinHash: content words from the free text plus tagged tech stack entries"""
+    shingles = set()
+    for text in (title, description, features):
+        shingles.update(_tokens(text))
+    shingles.update(f"tech:{tech}" for tech in normalize_tech_stack(tech_stack))
+    return shingles
+
+class GenerationCache:
+    """
+    Cache of AI-generated interview questions keyed on the project description.
+    Exact repeats hit by fingerprint; near-duplicates ("Todo app, React + Node" vs
+    "todo list app with Node.js and React") hit through MinHash LSH bands (see
+    minhash.py) and are accepted above min_similarity estimated Jaccard, for the
+    same candidate role.
+    Entries older than ttl_days are never served and are removed by a TTL index.
+    """
+    
+    def __init__(self, collection, ttl_days: int = 30, min_similarity: float = 0.6, max_candidates: int = 50):
+        self.collection = collection
+        self.ttl_days = ttl_days
+        self.min_similarity = min_similarity
+        self.max_candidates = max_candidates
+    
+    @staticmethod
+    def _keys(request) -> Tuple[str, List[int]]:
+        fingerprint = project_fingerprint(
+            request.project_title, request.tech_stack, request.project_description,
+            request.features_implemented, request.student_role
+        )
+        return fingerprint, signature(project_shingles(
+            request.project_title, request.tech_stack, request.project_description, request.features_implemented
+        ))
+    
+    async def lookup(self, request) -> Tuple[Optional[dict], str]:
+        """Returns (questions, "exact" | "similar") on a hit, (None, "miss") otherwise"""
+        fingerprint, minhash = self._keys(request)
+        now = datetime.now(timezone.utc)
+        
+        entry = await self.collection.find_one(
+            {"fingerprint": fingerprint, "expires_at": {"$gt": now}},
+            {"_id": 0, "questions": 1}
+        )
+        if entry:
+            return entry['questions'], "exact"
+        
+        candidates = await self.collection.find(
+            {
+                "bands": {"$in": band_keys(minhash)},
+                "role": normalize_text(request.student_role),
+                "expires_at": {"$gt": now}
+            },
+            {"_id": 0, "minhash": 1, "questions": 1}
+        ).limit(self.max_candidates).to_list(self.max_candidates)
+        
+        best = None
+        for candidate in candidates:
+            similarity = estimated_jaccard(minhash, candidate['minhash'])
+            if similarity >= self.min_similarity and (best is None or similarity > best[0]):
+                best = (similarity, candidate)
+        if best:
+            return best[1]['questions'], "similar"
+        return None, "miss"
+    
+    async def store(self, request, questions: dict):
+        fingerprint, minhash = self._keys(request)
+        now = datetime.now(timezone.utc)
+        await self.collection.update_one(
+            {"fingerprint": fingerprint},
+            {"$set": {
+                "fingerprint": fingerprint,
+                "minhash": minhash,
+                "bands": band_keys(minhash),
+                "role": normalize_text(request.student_role),
+                "title": request.project_title,
+                "questions": questions,
+                "created_at": now,
+                "expires_at": now + timedelta(days=self.ttl_days)
+            }},
+            upsert=True
+        )
+    
+    async def create_indexes(self):
+        await self.collection.create_index("fingerprint", unique=True)
+        await self.collection.create_index([("bands", 1), ("role", 1)])
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
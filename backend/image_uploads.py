@@ -0,0 +1,165 @@
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it images are uploaded unchanged
+    Image = None
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', str(10 * 1024 * 1024)))
+MAX_IMAGE_DIMENSION = int(os.environ.get('MAX_IMAGE_DIMENSION', '1024'))
+WEBP_QUALITY = int(os.environ.get('WEBP_QUALITY', '85'))
+
+class UploadTooLargeError(Exception):
+    pass
+
+@dataclass
+class SpooledUpload:
+    path: str
+    sha256: str
+    size: int
+    content_type: Optional[str] = None
+    
+    def cleanup(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+def _write_chunk(handle, hasher, chunk: bytes):
+    handle.write(chunk)
+    hasher.update(chunk)
+
+async def spool_upload(upload, max_bytes: int = MAX_UPLOAD_BYTES, chunk_size: int = UPLOAD_CHUNK_SIZE) -> SpooledUpload:
+    """
+    Copy an UploadFile to a temp file chunk by chunk, hashing as it goes.
+    Fails as soon as the size limit is crossed instead of after reading everything.
+    """
+    size = 0
+    hasher = hashlib.sha256()
+    suffix = Path(getattr(upload, "filename", None) or "").suffix.lower()[:10]
+    handle = tempfile.NamedTemporaryFile(prefix="upload-", suffix=suffix, delete=False)
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLargeError(f"File exceeds the {max_bytes // (1024 * 1024)} MB limit")
+            await asyncio.to_thread(_write_chunk, handle, hasher, chunk)
+    except BaseException:
+        handle.close()
+        os.unlink(handle.name)
+        raise
+    handle.close()
+    return SpooledUpload(path=handle.name, sha256=hasher.hexdigest(), size=size, content_type=upload.content_type)
+
+def prepare_image(path: str, max_dimension: int = MAX_IMAGE_DIMENSION, quality: int = WEBP_QUALITY) -> tuple:
+    """
+    Downscale a raster image to fit max_dimension and re-encode it as WebP.
+    Returns (path, content_type). Anything Pillow cannot open (SVG, PDF...) or
+    animated images are returned unchanged. Blocking: run in a worker thread.
+    """
+    if Image is None:
+        return path, None
+    try:
+        with Image.open(path) as image:
+            if getattr(image, "is_animated", False):
+                return path, None
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((max_dimension, max_dimension))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "P") else "RGB")
+            out_path = f"{path}.webp"
+            image.save(out_path, "WEBP", quality=quality, method=4)
+            return out_path, "image/webp"
+    except Exception as e:
+        logging.info(f"Skipping image conversion for {path}: {e}")
+        return path, None
+
+class LocalImageStore:
+    """Stores images on the local filesystem; used for development and tests"""
+    
+    def __init__(self, root: str, base_url: str = "/uploads"):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+    
+    async def put(self, path: str, key: str, content_type: Optional[str] = None) -> str:
+        suffix = ".webp" if content_type == "image/webp" else Path(path).suffix
+        target = self.root / f"{key}{suffix}"
+        await asyncio.to_thread(self._copy, path, target)
+        return f"{self.base_url}/{target.name}"
+    
+    @staticmethod
+    def _copy(source, target: Path):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source, target)
+
+class CloudinaryImageStore:
+    """Uploads images to Cloudinary through the SDK executor; the SDK is loaded on the first upload"""
+    
+    def __init__(self, sdk, services, folder: str = "interview_prep/companies"):
+        self.sdk = sdk
+        self.services = services
+        self.folder = folder
+    
+    async def put(self, path: str, key: str, content_type: Optional[str] = None) -> str:
+        uploader = await self.services.get("cloudinary")
+        result = await self.sdk.call(
+            "cloudinary",
+            uploader.upload,
+            path,
+            folder=self.folder,
+            public_id=key,
+            overwrite=False,
+            resource_type="auto"
+        )
+        return result['secure_url']
+
+async def store_image(upload, store, uploads_collection, max_bytes: int = MAX_UPLOAD_BYTES) -> dict:
+    """
+    Spool, hash, dedupe, convert and store an uploaded image.
+    Images whose original bytes were uploaded before are never processed or uploaded again.
+    """
+    spooled = await spool_upload(upload, max_bytes=max_bytes)
+    converted_path = None
+    try:
+        existing = await uploads_collection.find_one({"sha256": spooled.sha256}, {"_id": 0, "url": 1})
+        if existing:
+            return {"url": existing['url'], "deduplicated": True, "sha256": spooled.sha256}
+        
+        converted_path, content_type = await asyncio.to_thread(prepare_image, spooled.path)
+        key = spooled.sha256[:32]
+        url = await store.put(converted_path, key, content_type or spooled.content_type)
+        
+        await uploads_collection.update_one(
+            {"sha256": spooled.sha256},
+            {"$setOnInsert": {
+                "sha256": spooled.sha256,
+                "url": url,
+                "original_size": spooled.size,
+                "stored_size": os.path.getsize(converted_path),
+                "content_type": content_type or spooled.content_type,
+                "filename": getattr(upload, "filename", None),
+                "created_at": datetime.now(timezone.utc).isoformat()
+            }},
+            upsert=True
+        )
+        return {"url": url, "deduplicated": False, "sha256": spooled.sha256}
+    finally:
+        if converted_path and converted_path != spooled.path:
+            try:
+                os.unlink(converted_path)
+            except FileNotFoundError:
+                pass
+        spooled.cleanup()
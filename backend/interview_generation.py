@@ -0,0 +1,234 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Iterator, List, Optional
+
+QUESTION_LEVELS = ("easy_questions", "medium_questions", "hard_questions")
+QUESTIONS_PER_LEVEL = 5
+
+SYSTEM_PROMPT = """You are an expert technical interviewer with years of experience interviewing candidates for software engineering positions at top tech companies. Your job is to generate personalized interview questions based on a candidate's project experience.
+Generate questions that:
+1. Test the candidate's understanding of their own project
+2. Probe technical decisions and trade-offs
+3. Explore scalability, performance, and design considerations
+4. Are relevant to the technologies they used
+5. Match the difficulty level specified
+
+Always output ONLY valid JSON in the exact format requested. No markdown, no explanations."""
+
+def build_prompt(project_title: str, tech_stack: List[str], project_description: str,
+                 features_implemented: str, student_role: str) -> str:
+    user_prompt = f"""Based on the following project details, generate exactly 15 interview questions - 5 Easy, 5 Medium, and 5 Hard.
+
+PROJECT DETAILS:
+- Title: {project_title}
+- Tech Stack: {', '.join(tech_stack)}
+- Description: {project_description}
+- Features Implemented: {features_implemented}
+- Candidate Role: {student_role}
+
+DIFFICULTY GUIDELINES:
+- Easy: Basic understanding questions, "What is...", "How did you...", "Explain..."
+- Medium: Design decisions, "Why did you choose...", "What challenges...", "How would you improve..."
+- Hard: Deep technical, scalability, system design, edge cases, performance optimization
+
+Output ONLY a valid JSON object in this exact format (no markdown code blocks):
+{{
+  "easy_questions": [
+    {{"question": "...", "difficulty": "easy", "topic": "..."}},
+    {{"question": "...", "difficulty": "easy", "topic": "..."}},
+    {{"question": "...", "difficulty": "easy", "topic": "..."}},
+    {{"question": "...", "difficulty": "easy", "topic": "..."}},
+    {{"question": "...", "difficulty": "easy", "topic": "..."}}
+  ],
+  "medium_questions": [
+    {{"question": "...", "difficulty": "medium", "topic": "..."}},
+    {{"question": "...", "difficulty": "medium", "topic": "..."}},
+    {{"question": "...", "difficulty": "medium", "topic": "..."}},
+    {{"question": "...", "difficulty": "medium", "topic": "..."}},
+    {{"question": "...", "difficulty": "medium", "topic": "..."}}
+  ],
+  "hard_questions": [
+    {{"question": "...", "difficulty": "hard", "topic": "..."}},
+    {{"question": "...", "difficulty": "hard", "topic": "..."}},
+    {{"question": "...", "difficulty": "hard", "topic": "..."}},
+    {{"question": "...", "difficulty": "hard", "topic": "..."}},
+    {{"question": "...", "difficulty": "hard", "topic": "..."}}
+  ]
+}}"""
+    return f"{SYSTEM_PROMPT}\n\n{user_prompt}"
+
+def strip_code_fences(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+def parse_questions(text: str) -> dict:
+    """Parse and validate the model's JSON output. Raises ValueError (incl. JSONDecodeError)."""
+    questions_data = json.loads(strip_code_fences(text))
+    if not isinstance(questions_data, dict) or not all(key in questions_data for key in QUESTION_LEVELS):
+        raise ValueError("Invalid response structure from AI")
+    return questions_data
+
+class IncrementalQuestionParser:
+    """
+    Scans streamed model output and returns each question object as soon as its
+    closing brace arrives, without waiting for the rest of the JSON document.
+    Expects the documented shape {"easy_questions": [{...}, ...], ...}; anything
+    before the opening brace (such as a ```json fence) is ignored.
+    The full text is kept so the final document can still be validated with parse_questions.
+    """
+    
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_key = None
+        self._level = None
+        self._object_start = None
+        self.counts = {level: 0 for level in QUESTION_LEVELS}
+    
+    def feed(self, chunk: str) -> List[tuple]:
+        """Returns [(level, index, question), ...] for questions completed by this chunk"""
+        self.text += chunk
+        completed = []
+        text = self.text
+        
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = text[self._string_start + 1:pos]
+                continue
+            
+            if char == '"' and self._depth > 0:
+                self._in_string = True
+                self._string_start = pos
+            elif char in "{[":
+                if char == "[" and self._depth == 1:
+                    self._level = self._last_key
+                self._depth += 1
+                if char == "{" and self._depth == 3:
+                    self._object_start = pos
+            elif char in "}]" and self._depth > 0:
+                if char == "}" and self._depth == 3 and self._object_start is not None:
+                    question = self._complete(text[self._object_start:pos + 1])
+                    if question is not None:
+                        completed.append((self._level, self.counts[self._level], question))
+                        self.counts[self._level] += 1
+                    self._object_start = None
+                self._depth -= 1
+        
+        self._pos = len(text)
+        return completed
+    
+    def _complete(self, fragment: str) -> Optional[dict]:
+        if self._level not in self.counts:
+            return None
+        try:
+            question = json.loads(fragment)
+        except ValueError:
+            return None
+        return question if isinstance(question, dict) and question.get("question") else None
+
+class GeminiModel:
+    """Gemini backend. The SDK is configured once per process, on first use."""
+    
+    def __init__(self, api_key: str, model_name: str = "gemini-2.5-flash"):
+        self.api_key = api_key
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+    
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import google.generativeai as genai
+                    genai.configure(api_key=self.api_key)
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+    
+    def generate(self, prompt: str) -> str:
+        """Blocking call; run it through the SDK executor"""
+        return self._get_model().generate_content(prompt).text
+    
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """Blocking iterator of text chunks; run it through SDKExecutor.stream"""
+        for chunk in self._get_model().generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+
+class FakeInterviewModel:
+    """Deterministic stand-in for tests and local development: same prompt, same questions"""
+    
+    def __init__(self, chunk_size: int = 64, chunk_delay: float = 0.0):
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+    
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """Streams the same answer as generate, wrapped in a code fence like the real model often does"""
+        text = f"```json\n{self.generate(prompt)}\n```"
+        for start in range(0, len(text), self.chunk_size):
+            if self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            yield text[start:start + self.chunk_size]
+    
+    def generate(self, prompt: str) -> str:
+        digest = hashlib.sha256(prompt.encode()).hexdigest()
+        data = {
+            level: [
+                {
+                    "question": f"{level.split('_')[0].title()} question {i + 1} ({digest[i * 4:i * 4 + 8]})",
+                    "difficulty": level.split('_')[0],
+                    "topic": f"topic-{digest[i]}"
+                }
+                for i in range(QUESTIONS_PER_LEVEL)
+            ]
+            for level in QUESTION_LEVELS
+        }
+        return json.dumps(data)
+
+_model_backend = None
+_model_backend_lock = threading.Lock()
+
+def get_model_backend() -> Optional[object]:
+    """
+    Process-wide model backend, chosen by AI_MODEL_BACKEND (gemini | fake).
+    Returns None when Gemini is selected but GEMINI_API_KEY is not configured.
+    """
+    global _model_backend
+    if _model_backend is None:
+        with _model_backend_lock:
+            if _model_backend is None:
+                if os.environ.get('AI_MODEL_BACKEND', 'gemini') == 'fake':
+                    _model_backend = FakeInterviewModel()
+                else:
+                    api_key = os.environ.get('GEMINI_API_KEY')
+                    if not api_key:
+                        logging.error("GEMINI_API_KEY not configured")
+                        return None
+                    _model_backend = GeminiModel(api_key)
+    return _model_backend
+
+def set_model_backend(backend):
+    """Override the process-wide backend (tests)"""
+    global _model_backend
+    _model_backend = backend
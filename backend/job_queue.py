@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import traceback
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Awaitable, Callable, Optional
+
+from pymongo import ReturnDocument
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying the job cannot help"""
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+class JobQueue:
+    """
+    Durable job queue on a MongoDB collection with an in-process worker pool.
+    Jobs are claimed atomically with find_one_and_update, so several processes can
+    share one collection. A job whose worker died is picked up again once its lease expires,
+    until it has used max_attempts; then it is marked failed, so a job that kills its
+    worker (out of memory, a crash) is not retried forever.
+    """
+    
+    def __init__(
+        self,
+        collection,
+        handler: Callable[[dict], Awaitable[dict]],
+        concurrency: int = 2,
+        poll_interval: float = 2.0,
+        lease_seconds: int = 300,
+        max_attempts: int = 2,
+        on_failure: Optional[Callable[[dict, Exception], Awaitable[None]]] = None
+    ):
+        self.collection = collection
+        self.handler = handler
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.on_failure = on_failure
+        self._workers = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker_id = uuid.uuid4().hex[:12]
+    
+    async def submit(self, payload: dict, **fields) -> dict:
+        job = {
+            "id": str(uuid.uuid4()),
+            "status": "queued",
+            "payload": payload,
+            "result": None,
+            "error": None,
+            "attempts": 0,
+            "progress": "queued",
+            "created_at": _now(),
+            "updated_at": _now(),
+            "lease_expires_at": None,
+            **fields
+        }
+        await self.collection.insert_one(dict(job))
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+    
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await self.collection.find_one({"id": job_id}, {"_id": 0})
+    
+    async def set_progress(self, job_id: str, progress: str):
+        await self.collection.update_one({"id": job_id}, {"$set": {"progress": progress, "updated_at": _now()}})
+    
+    async def _claim(self) -> Optional[dict]:
+        now = _now()
+        lease = (datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)).isoformat()
+        return await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": "queued"},
+                {"status": "running", "lease_expires_at": {"$lt": now}, "attempts": {"$lt": self.max_attempts}}
+            ]},
+            {
+                "$set": {
+                    "status": "running",
+                    "progress": "generating",
+                    "worker": self._worker_id,
+                    "lease_expires_at": lease,
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", 1)],
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+    
+    async def _fail_abandoned(self):
+        """Fail jobs whose lease expired on their last attempt (the worker died running them)"""
+        while True:
+            job = await self.collection.find_one_and_update(
+                {"status": "running", "lease_expires_at": {"$lt": _now()}, "attempts": {"$gte": self.max_attempts}},
+                {"$set": {
+                    "status": "failed",
+                    "progress": "failed",
+                    "error": "The worker stopped while running the job",
+                    "updated_at": _now()
+                }},
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER
+            )
+            if job is None:
+                return
+            logging.error(f"Job {job['id']} failed: its worker stopped on attempt {job['attempts']}")
+            await self._notify_failure(job, RuntimeError(job['error']))
+    
+    async def _run(self, job: dict):
+        try:
+            result = await self.handler(job)
+            await self.collection.update_one(
+                {"id": job['id']},
+                {"$set": {"status": "completed", "progress": "completed", "result": result, "updated_at": _now()}}
+            )
+        except Exception as e:
+            logging.error(f"Job {job['id']} failed (attempt {job['attempts']}): {e}")
+            logging.debug(traceback.format_exc())
+            retry = job['attempts'] < self.max_attempts and not isinstance(e, PermanentJobError)
+            await self.collection.update_one(
+                {"id": job['id']},
+                {"$set": {
+                    "status": "queued" if retry else "failed",
+                    "progress": "retrying" if retry else "failed",
+                    "error": str(e),
+                    "updated_at": _now()
+                }}
+            )
+            if not retry:
+                await self._notify_failure(job, e)
+    
+    async def _notify_failure(self, job: dict, error: Exception):
+        if self.on_failure is not None:
+            try:
+                await self.on_failure(job, error)
+            except Exception as hook_error:
+                logging.warning(f"Job {job['id']} failure hook failed: {hook_error}")
+    
+    async def _worker(self):
+        while True:
+            try:
+                job = await self._claim()
+            except Exception as e:
+                logging.warning(f"Job queue claim failed: {e}")
+                job = None
+            
+            if job is None:
+                try:
+                    await self._fail_abandoned()
+                except Exception as e:
+                    logging.warning(f"Job queue cleanup failed: {e}")
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            await self._run(job)
+    
+    def start(self):
+        if self._workers or self.concurrency <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+    
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
@@ -0,0 +1,255 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from pymongo import monitoring
+
+# In-process instrumentation: request latency per route, MongoDB commands per
+# collection, plus whatever other components report through callbacks, rendered
+# in the Prometheus text format (or as JSON for the admin view). Recording is a
+# bisect and a few dict operations, so it stays on for every request.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Family:
+    """A named metric with one series per label set"""
+    type = "untyped"
+    
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+    
+    def samples(self) -> Iterable[Sample]:
+        return ()
+    
+    def snapshot(self):
+        return [{**labels, "value": value} for _, labels, value in self.samples()]
+
+class Counter(Family):
+    type = "counter"
+    
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, labels: tuple = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in sorted(self._values.items()):
+            yield self.name, dict(zip(self.labels, labels)), value
+
+class Histogram(Family):
+    """Latency histogram per label set; counts are kept per bucket and made cumulative on render"""
+    type = "histogram"
+    
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket..., count above the last bucket, sum]
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, labels: tuple, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+    
+    def samples(self) -> Iterable[Sample]:
+        for labels, series in sorted(self._series.items()):
+            label_dict = dict(zip(self.labels, labels))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), series[:-1]):
+                cumulative += count
+                yield f"{self.name}_bucket", {**label_dict, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", label_dict, series[-1]
+            yield f"{self.name}_count", label_dict, cumulative
+    
+    def quantile(self, series: list, q: float) -> Optional[float]:
+        """Estimated from the buckets by linear interpolation, as histogram_quantile does"""
+        total = sum(series[:-1])
+        if not total:
+            return None
+        rank = q * total
+        cumulative, lower = 0, 0.0
+        for bound, count in zip(self.buckets, series):
+            if count and cumulative + count >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound
+        return self.buckets[-1]
+    
+    def snapshot(self):
+        result = []
+        for labels, series in sorted(self._series.items()):
+            count = sum(series[:-1])
+            result.append({
+                **dict(zip(self.labels, labels)),
+                "count": count,
+                "avg_ms": round(series[-1] / count * 1000, 2) if count else None,
+                **{
+                    f"p{int(q * 100)}_ms": round(value * 1000, 2) if value is not None else None
+                    for q in (0.5, 0.95, 0.99)
+                    for value in [self.quantile(series, q)]
+                }
+            })
+        return result
+
+class Collected(Family):
+    """
+    A family read from a callback at scrape time, for numbers other components
+    already keep. The callback yields (name suffix, labels, value) samples.
+    """
+    
+    def __init__(self, name: str, help: str, type: str, collect: Callable[[], Iterable[Tuple[str, dict, float]]]):
+        super().__init__(name, help)
+        self.type = type
+        self.collect = collect
+    
+    def samples(self) -> Iterable[Sample]:
+        for suffix, labels, value in self.collect():
+            if value is not None:
+                yield self.name + suffix, labels, value
+    
+    def snapshot(self):
+        return [
+            {**({"series": name} if name != self.name else {}), **labels, "value": value}
+            for name, labels, value in self.samples()
+        ]
+
+class MetricsRegistry:
+    def __init__(self, families: Iterable[Family] = ()):
+        self.families: List[Family] = list(families)
+    
+    def add(self, family: Family) -> Family:
+        self.families.append(family)
+        return family
+    
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4"""
+        lines = []
+        for family in self.families:
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for name, labels, value in family.samples():
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {_format_value(value)}" if label_text else f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+    
+    def snapshot(self) -> dict:
+        return {family.name: family.snapshot() for family in self.families}
+
+# ============= HTTP =============
+
+class HttpMetrics:
+    def __init__(self):
+        self.requests = Histogram(
+            "http_request_duration_seconds", "Time to serve a request, by route template",
+            ("method", "route", "status")
+        )
+        self.families = [self.requests]
+
+class MetricsMiddleware:
+    """ASGI middleware timing every request under its route template (not the raw path)"""
+    
+    def __init__(self, app, metrics: HttpMetrics):
+        self.app = app
+        self.metrics = metrics
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Set by the router on the shared scope; unmatched paths share one series
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            self.metrics.requests.observe((scope["method"], route, str(status)), time.perf_counter() - start)
+
+# ============= MONGODB =============
+
+def command_collection(command_name: str, command) -> str:
+    """The collection a command runs on; "" for database and admin commands"""
+    target = command.get("collection") if command_name == "getMore" else command.get(command_name)
+    return target if isinstance(target, str) else ""
+
+def documents_in_reply(command_name: str, reply) -> int:
+    """Documents returned by a cursor batch, or written by a write command"""
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or ())
+    if command_name in ("insert", "update", "delete"):
+        return reply.get("n", 0)
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") else 0
+    return 0
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    Per-collection command counts, durations and documents, fed by the driver's
+    command monitoring (pass it in event_listeners). Events arrive on driver
+    threads; started events are matched to their outcome by request id.
+    """
+    MAX_PENDING = 10000
+    
+    def __init__(self):
+        self.durations = Histogram(
+            "mongodb_command_duration_seconds", "MongoDB command round trips, by collection and command",
+            ("collection", "command")
+        )
+        self.documents = Counter(
+            "mongodb_command_documents_total", "Documents returned by cursors or written, by collection and command",
+            ("collection", "command")
+        )
+        self.failures = Counter(
+            "mongodb_command_failures_total", "MongoDB commands that failed, by collection and command",
+            ("collection", "command")
+        )
+        self.families = [self.durations, self.documents, self.failures]
+        self._pending: Dict[int, str] = {}
+    
+    def started(self, event):
+        if len(self._pending) > self.MAX_PENDING:
+            # Outcomes that never arrived (a dropped connection): start over rather than grow
+            self._pending.clear()
+        self._pending[event.request_id] = command_collection(event.command_name, event.command)
+    
+    def succeeded(self, event):
+        labels = (self._pending.pop(event.request_id, ""), event.command_name)
+        self.durations.observe(labels, event.duration_micros / 1e6)
+        documents = documents_in_reply(event.command_name, event.reply)
+        if documents:
+            self.documents.inc(labels, documents)
+    
+    def failed(self, event):
+        labels = (self._pending.pop(event.request_id, ""), event.command_name)
+        self.durations.observe(labels, event.duration_micros / 1e6)
+        self.failures.inc(labels)
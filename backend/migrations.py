@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import sys
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Awaitable, Callable, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
+import os
+from dotenv import load_dotenv
+from pathlib import Path
+
+from generation_cache import GenerationCache
+from rate_limiter import create_rate_limit_indexes
+from seo_documents import ALUMNI_PAGE, EXPERIENCES_PAGE, create_seo_indexes, rebuild_seo_documents, write_seo_documents
+from facets import create_facet_indexes, rebuild_facets
+from search_index import create_search_indexes
+from dedupe import create_fingerprint_indexes, merge_duplicates, rebuild_fingerprints
+from reconcile_question_counts import reconcile_question_counts
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# The applied version lives in a single document so app startup can check it with one read.
+# Run `python migrations.py` on every deploy, before the new code takes traffic.
+SCHEMA_COLLECTION = "schema_migrations"
+SCHEMA_DOC_ID = "schema"
+LOCK_SECONDS = 600
+
+class MigrationLockedError(Exception):
+    """Another process is running migrations right now"""
+
+# ============= MIGRATIONS =============
+# Append only: a migration's number is its position, and a deployed database
+# never runs the same one twice. Change an index by adding a new migration.
+
+async def remove_null_id_documents(db):
+    null_users = await db.users.count_documents({"clerk_id": None})
+    if null_users > 0:
+        logging.warning(f"Found {null_users} users with null clerk_id - deleting them")
+        await db.users.delete_many({"clerk_id": None})
+    
+    await asyncio.gather(*(
+        db[name].delete_many({"id": None})
+        for name in ("questions", "topics", "companies", "experiences")
+    ))
+
+async def drop_legacy_user_indexes(db):
+    existing = await db.users.index_information()
+    for index_name in ("id_1", "email_1"):
+        if index_name in existing:
+            await db.users.drop_index(index_name)
+            logging.info(f"✓ Dropped old index: {index_name}")
+
+async def create_indexes(db):
+    await asyncio.gather(
+        db.topics.create_index("id", unique=True),
+        
+        db.questions.create_index("id", unique=True),
+        db.questions.create_index("topic_id"),
+        db.questions.create_index("company_id"),
+        db.questions.create_index([("difficulty", 1), ("topic_id", 1)]),
+        db.questions.create_index([("category", 1), ("company_id", 1)]),
+        
+        db.companies.create_index("id", unique=True),
+        db.companies.create_index("name"),
+        db.companies.create_index("slug", unique=True),
+        
+        db.experiences.create_index("id", unique=True),
+        db.experiences.create_index("company_id"),
+        db.experiences.create_index([("posted_at", -1)]),
+        
+        db.users.create_index("clerk_id", unique=True),
+        db.users.create_index("email"),
+        db.users.create_index("bookmarked_questions"),
+        
+        db.image_uploads.create_index("sha256", unique=True),
+        
+        create_rate_limit_indexes(db.rate_limits),
+        GenerationCache(db.ai_generation_cache).create_indexes(),
+        
+        db.generation_jobs.create_index("id", unique=True),
+        db.generation_jobs.create_index([("status", 1), ("created_at", 1)]),
+        db.generation_jobs.create_index([("user_id", 1), ("status", 1)]),
+        
+        db.admin_jobs.create_index("id", unique=True),
+        db.admin_jobs.create_index([("type", 1), ("resource_id", 1)]),
+        
+        # Analytics indexes for better query performance
+        db.activities.create_index("id", unique=True),
+        db.activities.create_index("user_id"),
+        db.activities.create_index("activity_type"),
+        db.activities.create_index([("timestamp", -1)]),
+        db.activities.create_index([("activity_type", 1), ("timestamp", -1)]),
+        db.activities.create_index([("user_id", 1), ("activity_type", 1)]),
+        
+        db.cache.create_index("key", unique=True),
+        db.cache.create_index("expires_at", expireAfterSeconds=0)
+    )
+
+async def create_alumni_indexes(db):
+    # Previously only created by the separate alumni server
+    await asyncio.gather(
+        db.alumni.create_index("id", unique=True),
+        db.alumni.create_index("company"),
+        db.alumni.create_index("name"),
+        db.alumni.create_index("role"),
+        db.alumni.create_index("location"),
+        db.alumni.create_index("graduation_year")
+    )
+
+async def build_seo_documents(db):
+    await create_seo_indexes(db)
+    count = await rebuild_seo_documents(db)
+    logging.info(f"✓ Built SEO documents for {count} keys")
+
+async def build_facet_counts(db):
+    await create_facet_indexes(db)
+    await rebuild_facets(db)
+    # These pages read the facet counts
+    await write_seo_documents(db, [ALUMNI_PAGE, EXPERIENCES_PAGE])
+
+async def build_question_fingerprints(db):
+    await create_fingerprint_indexes(db)
+    count = await rebuild_fingerprints(db)
+    logging.info(f"✓ Fingerprinted {count} questions")
+
+async def share_questions_across_companies(db):
+    # Offline (see OFFLINE_MIGRATIONS): it deletes merged copies and drops the
+    # company_id field the previous code reads. Safe to re-run after a failure.
+    # A single company_id joins the company_ids array (kept if a question already
+    # has one); topic questions get []
+    await db.questions.update_many(
+        {"company_id": {"$exists": True}},
+        [
+            {"$set": {"company_ids": {"$setUnion": [
+                {"$ifNull": ["$company_ids", []]},
+                {"$cond": [{"$ifNull": ["$company_id", False]}, ["$company_id"], []]}
+            ]}}},
+            {"$unset": "company_id"}
+        ]
+    )
+    await db.questions.update_many({"company_ids": {"$exists": False}}, {"$set": {"company_ids": []}})
+    
+    # Multikey: serves company pages, with or without a category, and question counts
+    await db.questions.create_index([("company_ids", 1), ("category", 1)])
+    existing = await db.questions.index_information()
+    for index_name in ("company_id_1", "category_1_company_id_1"):
+        if index_name in existing:
+            await db.questions.drop_index(index_name)
+            logging.info(f"✓ Dropped old index: {index_name}")
+    
+    # Exact copies made one per company collapse into one shared question;
+    # questions that differ in any content are only reported
+    await rebuild_fingerprints(db)
+    report = await merge_duplicates(db)
+    logging.info(f"✓ Merged {report['merged']} copied questions into {report['merged_into']}")
+    if report['to_review']:
+        logging.warning(
+            f"⚠️ {report['to_review']} groups of near-duplicate questions left for review "
+            f"(GET /api/admin/questions/duplicates)"
+        )
+    await reconcile_question_counts(db)
+    await rebuild_seo_documents(db)
+
+MIGRATIONS: List[Tuple[str, Callable[..., Awaitable[None]]]] = [
+    ("Remove documents with null ids", remove_null_id_documents),
+    ("Drop legacy users indexes", drop_legacy_user_indexes),
+    ("Create collection indexes", create_indexes),
+    ("Create alumni indexes", create_alumni_indexes),
+    ("Precompute SEO documents", build_seo_documents),
+    ("Count alumni and experience facets", build_facet_counts),
+    ("Create search change log index", create_search_indexes),
+    ("Fingerprint questions for duplicate detection", build_question_fingerprints),
+    ("Share questions across companies with company_ids", share_questions_across_companies),
+    # Band keys moved to the MinHash shared with the generation cache (minhash.py)
+    ("Re-fingerprint questions with the shared MinHash", build_question_fingerprints),
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# Questions carry company_ids instead of company_id from this version on
+COMPANY_IDS_VERSION = 9
+
+# Migrations that rewrite or delete data the running code reads. Only
+# `python migrations.py` applies them, before switching traffic to new code;
+# migrating at app startup (AUTO_MIGRATE) stops short of them.
+OFFLINE_MIGRATIONS = {COMPANY_IDS_VERSION}
+
+# ============= RUNNER =============
+
+async def schema_version(db) -> int:
+    """The applied schema version (0 for a fresh database)"""
+    doc = await db[SCHEMA_COLLECTION].find_one({"_id": SCHEMA_DOC_ID}, {"version": 1})
+    return doc.get('version', 0) if doc else 0
+
+async def _acquire_lock(collection, owner: str):
+    now = datetime.now(timezone.utc)
+    try:
+        await collection.update_one(
+            {"_id": SCHEMA_DOC_ID, "$or": [{"locked_until": None}, {"locked_until": {"$lt": now}}]},
+            {"$set": {"locked_until": now + timedelta(seconds=LOCK_SECONDS), "locked_by": owner}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # The document exists but did not match: someone else holds the lock
+        raise MigrationLockedError("Migrations are already running in another process")
+
+async def migrate(db, target: Optional[int] = None, online_only: bool = False) -> List[int]:
+    """
+    Apply pending migrations in order up to target (default: latest); returns the
+    versions applied. With online_only, stops before the first offline migration.
+    """
+    target = SCHEMA_VERSION if target is None else target
+    collection = db[SCHEMA_COLLECTION]
+    owner = uuid.uuid4().hex
+    await _acquire_lock(collection, owner)
+    
+    applied = []
+    try:
+        version = await schema_version(db)
+        if online_only:
+            target = min([number - 1 for number in OFFLINE_MIGRATIONS if version < number <= target], default=target)
+        for number in range(version + 1, target + 1):
+            description, migration = MIGRATIONS[number - 1]
+            started = time.perf_counter()
+            logging.info(f"Applying migration {number}: {description}")
+            await migration(db)
+            await collection.update_one(
+                {"_id": SCHEMA_DOC_ID},
+                {
+                    "$set": {
+                        "version": number,
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                        # Renewed per migration so a long chain does not outlive its lock
+                        "locked_until": datetime.now(timezone.utc) + timedelta(seconds=LOCK_SECONDS)
+                    },
+                    "$push": {"history": {
+                        "version": number,
+                        "description": description,
+                        "applied_at": datetime.now(timezone.utc).isoformat(),
+                        "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+                    }}
+                }
+            )
+            applied.append(number)
+            logging.info(f"✓ Migration {number} applied")
+    finally:
+        await collection.update_one(
+            {"_id": SCHEMA_DOC_ID, "locked_by": owner},
+            {"$unset": {"locked_until": "", "locked_by": ""}}
+        )
+    return applied
+
+async def main():
+    """Bring the database schema up to date: python migrations.py [--status] [--to N]"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = sys.argv[1:]
+    mongo_url = os.environ['MONGO_URL']
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[os.environ['DB_NAME']]
+    
+    version = await schema_version(db)
+    print(f"Database schema version: {version} (latest: {SCHEMA_VERSION})")
+    
+    if "--status" in args:
+        for number, (description, _) in enumerate(MIGRATIONS, start=1):
+            print(f"  {'✓' if number <= version else ' '} {number}. {description}")
+    else:
+        target = int(args[args.index("--to") + 1]) if "--to" in args else None
+        applied = await migrate(db, target)
+        if applied:
+            print(f"\n✅ Applied migrations {', '.join(map(str, applied))}")
+        else:
+            print("\n✅ Schema is up to date")
+    
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from html import escape
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from seo_documents import SeoDocumentStore, base_url
+
+# Bump when the template changes so snapshots rendered by older code are not reused
+SNAPSHOT_VERSION = "1"
+
+MAX_FAQ_ITEMS = 15
+
+def _faq_items(structured_data: dict) -> list:
+    """The FAQPage questions, whether the page's JSON-LD is a single node or a @graph"""
+    nodes = structured_data.get('@graph', [structured_data])
+    for node in nodes:
+        if node.get('@type') == 'FAQPage':
+            return node.get('mainEntity', [])[:MAX_FAQ_ITEMS]
+    return []
+
+def render_snapshot(payload: dict, site_url: str) -> bytes:
+    """A minimal HTML page, without JavaScript, carrying a page's meta tags, JSON-LD and FAQ text"""
+    title = escape(payload.get('title', ''))
+    description = escape(payload.get('description', ''))
+    url = escape(f"{site_url}{payload.get('canonical', '')}")
+    image = escape((payload.get('company') or {}).get('logo_url') or f"{site_url}/og-image.png")
+    keywords = payload.get('keywords')
+    # "</" would end the script element early
+    json_ld = json.dumps(payload.get('structuredData', {}), ensure_ascii=False).replace("</", "<\\/")
+    
+    faq = "".join(
+        f"<li><h2>{escape(item.get('name', ''))}</h2>"
+        f"<p>{escape(item.get('acceptedAnswer', {}).get('text', ''))}</p></li>"
+        for item in _faq_items(payload.get('structuredData', {}))
+    )
+    
+    return (
+        '<!doctype html>\n<html lang="en">\n<head>\n'
+        '<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f'<title>{title}</title>\n'
+        f'<meta name="title" content="{title}">\n'
+        f'<meta name="description" content="{description}">\n'
+        + (f'<meta name="keywords" content="{escape(keywords)}">\n' if keywords else '')
+        + f'<link rel="canonical" href="{url}">\n'
+        '<meta name="robots" content="index, follow">\n'
+        '<meta property="og:type" content="website">\n'
+        f'<meta property="og:url" content="{url}">\n'
+        f'<meta property="og:title" content="{title}">\n'
+        f'<meta property="og:description" content="{description}">\n'
+        f'<meta property="og:image" content="{image}">\n'
+        '<meta property="og:site_name" content="InterviewGuru Pro">\n'
+        '<meta name="twitter:card" content="summary_large_image">\n'
+        f'<meta name="twitter:title" content="{title}">\n'
+        f'<meta name="twitter:description" content="{description}">\n'
+        f'<meta name="twitter:image" content="{image}">\n'
+        f'<script type="application/ld+json">{json_ld}</script>\n'
+        '</head>\n<body>\n<main>\n'
+        f'<h1>{title}</h1>\n'
+        f'<p>{description}</p>\n'
+        + (f'<ol>{faq}</ol>\n' if faq else '')
+        + f'<p><a href="{url}">Open on InterviewGuru Pro</a></p>\n'
+        '</main>\n</body>\n</html>\n'
+    ).encode("utf-8")
+
+class SnapshotStore:
+    """
+    Rendered pages keyed by (page, digest of the SEO document they came from):
+    an in-memory LRU in front of one file per page on disk, so a restarted
+    process serves snapshots without re-rendering. A changed document has a new
+    digest, so stale snapshots are never served, only replaced.
+    """
+    
+    def __init__(self, directory: str, max_memory: int = 1024):
+        self.directory = Path(directory)
+        self.max_memory = max_memory
+        self._memory: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "rendered": 0}
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logging.warning(f"⚠️ Snapshot directory unavailable, keeping snapshots in memory only: {e}")
+    
+    def _stem(self, key: str) -> str:
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:24]
+    
+    def _remember(self, key: str, digest: str, html: bytes):
+        self._memory[key] = (digest, html)
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+    
+    def get(self, key: str, digest: str) -> Optional[bytes]:
+        cached = self._memory.get(key)
+        if cached and cached[0] == digest:
+            self._memory.move_to_end(key)
+            self.counters["memory_hits"] += 1
+            return cached[1]
+        try:
+            # Small local files; a blocking read is cheaper than a thread hop
+            html = (self.directory / f"{self._stem(key)}-{digest}.html").read_bytes()
+        except OSError:
+            return None
+        self.counters["disk_hits"] += 1
+        self._remember(key, digest, html)
+        return html
+    
+    def put(self, key: str, digest: str, html: bytes):
+        self.counters["rendered"] += 1
+        self._remember(key, digest, html)
+        stem = self._stem(key)
+        path = self.directory / f"{stem}-{digest}.html"
+        try:
+            temp = path.with_suffix(f".{os.getpid()}.tmp")
+            temp.write_bytes(html)
+            os.replace(temp, path)
+            for old in self.directory.glob(f"{stem}-*.html"):
+                if old != path:
+                    old.unlink(missing_ok=True)
+        except OSError as e:
+            logging.warning(f"⚠️ Could not write snapshot for {key}: {e}")
+    
+    def discard(self, key: str):
+        self._memory.pop(key, None)
+        for old in self.directory.glob(f"{self._stem(key)}-*.html"):
+            old.unlink(missing_ok=True)
+    
+    def is_cached(self, key: str) -> bool:
+        return key in self._memory
+    
+    def stats(self) -> dict:
+        return {**self.counters, "in_memory": len(self._memory)}
+
+class Prerenderer:
+    """HTML snapshots of SEO pages for crawlers and link previews"""
+    
+    def __init__(self, documents: SeoDocumentStore, snapshots: SnapshotStore):
+        self.documents = documents
+        self.snapshots = snapshots
+        documents.add_listener(self.regenerate)
+    
+    async def render(self, key: str, group: Optional[str] = None) -> Optional[Tuple[str, bytes]]:
+        """(etag, html) for the page, or None when it does not exist"""
+        started = time.perf_counter()
+        body = await self.documents.get_or_build(key, group)
+        if body is None:
+            return None
+        digest = hashlib.blake2b(body, digest_size=12, person=f"snapshot-v{SNAPSHOT_VERSION}".encode()).hexdigest()
+        html = self.snapshots.get(key, digest)
+        if html is None:
+            html = render_snapshot(json.loads(body), base_url())
+            self.snapshots.put(key, digest, html)
+            logging.info(f"✓ Rendered snapshot {key} in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return digest, html
+    
+    async def regenerate(self, page_ids: Iterable[str]):
+        """Re-render pages this process has served once their SEO documents were rebuilt"""
+        for page_id in page_ids:
+            if not self.snapshots.is_cached(page_id):
+                continue
+            if await self.render(page_id) is None:
+                self.snapshots.discard(page_id)
+    
+    def stats(self) -> dict:
+        return self.snapshots.stats()
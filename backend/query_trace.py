@@ -0,0 +1,195 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from pymongo import monitoring
+
+from metrics import Histogram, command_collection
+
+# Per-request MongoDB query tracing. QueryTraceMiddleware puts a QueryTrace in a
+# context variable; QueryTracer, a driver command listener, adds every command
+# issued under it. Motor runs driver calls with a copy of the caller's context,
+# so commands land in the trace of the request that awaited them.
+#
+# Requests over the round-trip or DB-time thresholds are logged with the shapes
+# of their queries (collection, command and filter keys, never values), which
+# makes a query per item (N+1) stand out as one shape repeated many times.
+
+REPEATED_SHAPE_THRESHOLD = 3
+
+ROUND_TRIP_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+_current_trace: ContextVar[Optional["QueryTrace"]] = ContextVar("query_trace", default=None)
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in enforcing mode when a request issues more queries than its endpoint declares"""
+
+@dataclass
+class QueryTrace:
+    queries: List[Tuple[str, float]] = field(default_factory=list)  # (shape, seconds) per round trip
+    pending: Dict[int, str] = field(default_factory=dict)
+    finished: bool = False
+    
+    @property
+    def round_trips(self) -> int:
+        return len(self.queries)
+    
+    @property
+    def db_seconds(self) -> float:
+        return sum(seconds for _, seconds in self.queries)
+    
+    def shapes(self) -> List[Tuple[str, int]]:
+        """Distinct query shapes with how often each ran, most frequent first"""
+        return Counter(shape for shape, _ in self.queries).most_common()
+    
+    def repeated(self, threshold: int = REPEATED_SHAPE_THRESHOLD) -> List[Tuple[str, int]]:
+        return [(shape, count) for shape, count in self.shapes() if count >= threshold]
+    
+    def describe(self) -> str:
+        return "; ".join(f"{count}× {shape}" if count > 1 else shape for shape, count in self.shapes())
+
+def _filter_keys(query) -> List[str]:
+    if not isinstance(query, dict):
+        return []
+    keys = []
+    for key, value in query.items():
+        if key in ("$and", "$or", "$nor") and isinstance(value, list):
+            keys.extend(k for clause in value for k in _filter_keys(clause))
+        else:
+            keys.append(key)
+    return keys
+
+def _keys_text(query) -> str:
+    return "{" + ", ".join(sorted(set(_filter_keys(query)))) + "}"
+
+def query_shape(command_name: str, command) -> str:
+    """e.g. "find questions {category, company_ids}" or "aggregate activities $match{activity_type}>$facet" """
+    collection = command_collection(command_name, command)
+    detail = ""
+    if command_name in ("find", "count", "distinct"):
+        detail = _keys_text(command.get("filter", command.get("query")))
+        if command_name == "distinct":
+            detail = f"{command.get('key')} {detail}"
+    elif command_name == "findAndModify":
+        detail = _keys_text(command.get("query"))
+    elif command_name == "aggregate":
+        detail = ">".join(
+            f"{stage_name}{_keys_text(stage[stage_name]) if stage_name == '$match' else ''}"
+            for stage in command.get("pipeline", []) if isinstance(stage, dict)
+            for stage_name in list(stage)[:1]
+        )
+    elif command_name in ("update", "delete"):
+        statements = command.get("updates" if command_name == "update" else "deletes") or []
+        detail = _keys_text(statements[0].get("q")) if statements else ""
+        if len(statements) > 1:
+            detail += f" ×{len(statements)} statements"
+    elif command_name == "insert":
+        detail = f"{len(command.get('documents') or ())} docs"
+    return " ".join(part for part in (command_name, collection, detail) if part)
+
+class QueryTracer(monitoring.CommandListener):
+    """Driver command listener feeding the current request's QueryTrace, if any"""
+    
+    def started(self, event):
+        trace = _current_trace.get()
+        if trace is not None and not trace.finished:
+            trace.pending[event.request_id] = query_shape(event.command_name, event.command)
+    
+    def succeeded(self, event):
+        self._record(event)
+    
+    def failed(self, event):
+        self._record(event)
+    
+    @staticmethod
+    def _record(event):
+        trace = _current_trace.get()
+        if trace is None:
+            return
+        shape = trace.pending.pop(event.request_id, None)
+        if shape is not None:
+            trace.queries.append((shape, event.duration_micros / 1e6))
+
+@contextmanager
+def trace_queries():
+    """Trace the queries issued inside the block (scripts and tests): with trace_queries() as trace: ..."""
+    trace = QueryTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finished = True
+        _current_trace.reset(token)
+
+def query_budget(max_round_trips: int):
+    """Declare how many MongoDB round trips an endpoint may take per request (auth lookups included)"""
+    def decorate(endpoint):
+        endpoint.query_budget = max_round_trips
+        return endpoint
+    return decorate
+
+class QueryTraceMiddleware:
+    """
+    ASGI middleware tracing each request's queries until its response is sent
+    (background tasks that run afterwards are not counted). Requests over
+    max_queries round trips or max_db_ms of DB time are logged. With
+    enforce_budgets, exceeding an endpoint's query_budget raises
+    QueryBudgetExceeded, which fails the request under a test client.
+    """
+    
+    def __init__(
+        self,
+        app,
+        max_queries: int = 10,
+        max_db_ms: float = 250.0,
+        enforce_budgets: bool = False,
+        round_trips: Optional[Histogram] = None
+    ):
+        self.app = app
+        self.max_queries = max_queries
+        self.max_db_ms = max_db_ms
+        self.enforce_budgets = enforce_budgets
+        self.round_trips = round_trips
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        trace = QueryTrace()
+        token = _current_trace.set(trace)
+        start = time.perf_counter()
+        
+        async def send_and_close(message):
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                trace.finished = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_and_close)
+        finally:
+            trace.finished = True
+            _current_trace.reset(token)
+        self.report(scope, trace, time.perf_counter() - start)
+    
+    def report(self, scope, trace: QueryTrace, seconds: float):
+        route = getattr(scope.get("route"), "path", None) or "unmatched"
+        if self.round_trips is not None:
+            self.round_trips.observe((route,), trace.round_trips)
+        
+        db_ms = trace.db_seconds * 1000
+        if trace.round_trips > self.max_queries or db_ms > self.max_db_ms:
+            repeated = trace.repeated()
+            logging.warning(
+                f"⚠️ {scope['method']} {route}: {trace.round_trips} queries, {db_ms:.1f} ms in MongoDB "
+                f"of {seconds * 1000:.1f} ms{' (possible N+1)' if repeated else ''} - {trace.describe()}"
+            )
+        
+        budget = getattr(scope.get("endpoint"), "query_budget", None)
+        if self.enforce_budgets and budget is not None and trace.round_trips > budget:
+            raise QueryBudgetExceeded(
+                f"{scope['method']} {route} issued {trace.round_trips} queries, budget {budget}: {trace.describe()}"
+            )
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import Iterator, Optional, Tuple
+
+SUPPORTED_FORMATS = ("csv", "json", "ndjson")
+
+# Columns that hold lists in CSV uploads, e.g. "arrays;hashing"
+CSV_LIST_FIELDS = ("tags", "company_ids")
+CSV_LIST_SEPARATOR = ";"
+
+def detect_format(filename: Optional[str], content_type: Optional[str], explicit: Optional[str] = None) -> str:
+    """Work out the upload format from an explicit value, the file extension or the content type"""
+    if explicit:
+        fmt = explicit.lower()
+    else:
+        ext = (filename or "").rsplit(".", 1)[-1].lower() if "." in (filename or "") else ""
+        content_type = (content_type or "").lower()
+        if ext in ("ndjson", "jsonl") or "ndjson" in content_type or "jsonl" in content_type:
+            fmt = "ndjson"
+        elif ext == "json" or content_type == "application/json":
+            fmt = "json"
+        elif ext == "csv" or "csv" in content_type:
+            fmt = "csv"
+        else:
+            fmt = ""
+    
+    if fmt == "jsonl":
+        fmt = "ndjson"
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported import format. Use one of: {', '.join(SUPPORTED_FORMATS)}")
+    return fmt
+
+def _normalize_csv_row(row: dict) -> dict:
+    record = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        key = key.strip()
+        value = value.strip() if isinstance(value, str) else value
+        if value in ("", None):
+            continue
+        if key in CSV_LIST_FIELDS:
+            value = [v.strip() for v in value.split(CSV_LIST_SEPARATOR) if v.strip()]
+        record[key] = value
+    return record
+
+def iter_records(binary_file, fmt: str) -> Iterator[Tuple[int, object]]:
+    """
+    Yield (row_number, record) pairs from an uploaded file without loading it whole
+    (except JSON arrays, which have to be parsed in one go).
+    A record that cannot be parsed is yielded as the exception instead of a dict.
+    Row numbers are 1-based; for CSV they count data rows, not the header.
+    """
+    if fmt == "csv":
+        text = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+        for row_number, row in enumerate(csv.DictReader(text), start=1):
+            yield row_number, _normalize_csv_row(row)
+        text.detach()
+    elif fmt == "ndjson":
+        row_number = 0
+        for line in binary_file:
+            line = line.strip()
+            if not line:
+                continue
+            row_number += 1
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield row_number, e
+                continue
+            yield row_number, record if isinstance(record, dict) else ValueError("Each line must be a JSON object")
+    else:
+        try:
+            records = json.load(binary_file)
+        except ValueError as e:
+            yield 0, e
+            return
+        if isinstance(records, dict):
+            records = records.get("questions", [])
+        if not isinstance(records, list):
+            yield 0, ValueError("JSON upload must be an array of questions or {\"questions\": [...]}")
+            return
+        for row_number, record in enumerate(records, start=1):
+            yield row_number, record if isinstance(record, dict) else ValueError("Each item must be a JSON object")
+
+def next_chunk(records: Iterator, size: int) -> list:
+    return list(islice(records, size))
@@ -0,0 +1,219 @@
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+@dataclass
+class Reservation:
+    allowed: bool
+    remaining: int
+    reset_at: float          # epoch seconds when a slot is guaranteed to free up
+    key: str
+    token: object = None     # identifies the reserved slot for refunds
+    
+    @property
+    def retry_after(self) -> int:
+        return max(1, int(self.reset_at - time.time()) + 1)
+    
+    def reset_at_iso(self) -> str:
+        return datetime.fromtimestamp(self.reset_at, timezone.utc).isoformat()
+
+class _TokenBucket:
+    __slots__ = ("tokens", "updated")
+    
+    def __init__(self, capacity: float):
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+class RateLimiter:
+    """
+    Atomic limiter on a MongoDB collection: a slot is checked and reserved with a
+    single find_one_and_update, so concurrent requests cannot all slip past the check.
+    
+    mode="fixed": at most `limit` per aligned window (e.g. per UTC day); a counter
+    document per key and window, denied via the unique index when it is full.
+    mode="sliding": at most `limit` in any trailing `window` seconds; a document per
+    key holding recent hit timestamps, trimmed in the same update.
+    
+    An in-process front cache rejects users that are certainly over the limit without
+    touching MongoDB: fixed windows remember a denial until the window ends, sliding
+    windows keep a token bucket (capacity=limit, refilled at limit/window) that only
+    ever sees this process's hits and so is never stricter than the real limit.
+    """
+    
+    def __init__(self, collection, name: str, limit: int, window: int, mode: str = "fixed", max_local_keys: int = 50000):
+        if mode not in ("fixed", "sliding"):
+            raise ValueError("mode must be 'fixed' or 'sliding'")
+        self.collection = collection
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.mode = mode
+        self.max_local_keys = max_local_keys
+        self._denied_until: Dict[str, float] = {}
+        self._buckets: Dict[str, _TokenBucket] = {}
+    
+    def _key(self, subject: str) -> str:
+        return f"{self.name}:{subject}"
+    
+    def _window_bounds(self, now: float) -> tuple:
+        start = int(now // self.window) * self.window
+        return start, start + self.window
+    
+    # ----- in-process front cache -----
+    
+    def _trim_local(self):
+        if len(self._denied_until) > self.max_local_keys:
+            now = time.time()
+            self._denied_until = {k: v for k, v in self._denied_until.items() if v > now}
+        if len(self._buckets) > self.max_local_keys:
+            self._buckets.clear()
+    
+    def _bucket(self, key: str) -> _TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._trim_local()
+            bucket = self._buckets[key] = _TokenBucket(self.limit)
+        now = time.monotonic()
+        bucket.tokens = min(self.limit, bucket.tokens + (now - bucket.updated) * self.limit / self.window)
+        bucket.updated = now
+        return bucket
+    
+    def _locally_denied(self, key: str, now: float) -> Optional[Reservation]:
+        if self.mode == "fixed":
+            until = self._denied_until.get(key)
+            if until and until > now:
+                return Reservation(False, 0, until, key)
+            return None
+        bucket = self._bucket(key)
+        if bucket.tokens < 1:
+            return Reservation(False, 0, now + (1 - bucket.tokens) * self.window / self.limit, key)
+        return None
+    
+    # ----- MongoDB -----
+    
+    async def reserve(self, subject: str) -> Reservation:
+        key = self._key(subject)
+        now = time.time()
+        
+        denied = self._locally_denied(key, now)
+        if denied:
+            return denied
+        
+        if self.mode == "fixed":
+            reservation = await self._reserve_fixed(key, now)
+            if not reservation.allowed:
+                self._trim_local()
+                self._denied_until[key] = reservation.reset_at
+        else:
+            reservation = await self._reserve_sliding(key, now)
+            if reservation.allowed:
+                self._bucket(key).tokens -= 1
+        return reservation
+    
+    async def _reserve_fixed(self, key: str, now: float) -> Reservation:
+        window_start, window_end = self._window_bounds(now)
+        # A duplicate key means the window document exists but did not match, i.e. it is
+        # full - or that a concurrent first request created it a moment ago, hence one retry
+        for attempt in range(2):
+            try:
+                doc = await self.collection.find_one_and_update(
+                    {"key": key, "window": window_start, "count": {"$lt": self.limit}},
+                    {
+                        "$inc": {"count": 1},
+                        "$setOnInsert": {"expires_at": datetime.fromtimestamp(window_end, timezone.utc)}
+                    },
+                    upsert=True,
+                    projection={"_id": 0, "count": 1},
+                    return_document=ReturnDocument.AFTER
+                )
+                return Reservation(True, self.limit - doc['count'], window_end, key, token=window_start)
+            except DuplicateKeyError:
+                continue
+        return Reservation(False, 0, window_end, key)
+    
+    async def _reserve_sliding(self, key: str, now: float) -> Reservation:
+        # Integer microseconds with random low digits: unique per hit, so a refund removes exactly one
+        hit = int(now * 1_000_000) + random.randrange(1000)
+        cutoff = int((now - self.window) * 1_000_000)
+        update = [
+            {"$set": {"hits": {"$filter": {
+                "input": {"$ifNull": ["$hits", []]},
+                "cond": {"$gt": ["$$this", cutoff]}
+            }}}},
+            {"$set": {"allowed": {"$lt": [{"$size": "$hits"}, self.limit]}}},
+            {"$set": {
+                "hits": {"$cond": ["$allowed", {"$concatArrays": ["$hits", [hit]]}, "$hits"]},
+                "expires_at": datetime.fromtimestamp(now + self.window, timezone.utc)
+            }}
+        ]
+        try:
+            doc = await self._apply_sliding(key, update)
+        except DuplicateKeyError:
+            # Lost the race to create this key's document; it exists now
+            doc = await self._apply_sliding(key, update)
+        hits = doc.get('hits', [])
+        reset_at = (min(hits) / 1_000_000 + self.window) if hits else now
+        if doc.get('allowed'):
+            return Reservation(True, self.limit - len(hits), reset_at, key, token=hit)
+        return Reservation(False, 0, reset_at, key)
+    
+    async def _apply_sliding(self, key: str, update: list) -> dict:
+        return await self.collection.find_one_and_update(
+            {"key": key},
+            update,
+            upsert=True,
+            projection={"_id": 0, "hits": 1, "allowed": 1},
+            return_document=ReturnDocument.AFTER
+        )
+    
+    async def refund(self, reservation: Optional[Reservation]):
+        """Give back a slot whose work failed"""
+        if reservation is None or not reservation.allowed or reservation.token is None:
+            return
+        if self.mode == "fixed":
+            await self.collection.update_one(
+                {"key": reservation.key, "window": reservation.token, "count": {"$gt": 0}},
+                {"$inc": {"count": -1}}
+            )
+            self._denied_until.pop(reservation.key, None)
+        else:
+            await self.collection.update_one({"key": reservation.key}, {"$pull": {"hits": reservation.token}})
+            bucket = self._buckets.get(reservation.key)
+            if bucket:
+                bucket.tokens = min(self.limit, bucket.tokens + 1)
+        reservation.token = None
+    
+    async def remaining(self, subject: str) -> Reservation:
+        """Current quota without reserving anything (one read)"""
+        key = self._key(subject)
+        now = time.time()
+        if self.mode == "fixed":
+            window_start, window_end = self._window_bounds(now)
+            doc = await self.collection.find_one({"key": key, "window": window_start}, {"_id": 0, "count": 1})
+            used = doc['count'] if doc else 0
+            return Reservation(used < self.limit, max(0, self.limit - used), window_end, key)
+        doc = await self.collection.find_one({"key": key}, {"_id": 0, "hits": 1})
+        cutoff = (now - self.window) * 1_000_000
+        hits = [h for h in (doc or {}).get('hits', []) if h > cutoff]
+        reset_at = (min(hits) / 1_000_000 + self.window) if hits else now
+        return Reservation(len(hits) < self.limit, max(0, self.limit - len(hits)), reset_at, key)
+
+async def create_rate_limit_indexes(collection):
+    # Fixed-window documents are unique per (key, window); sliding ones have no window field
+    await collection.create_index(
+        [("key", 1), ("window", 1)],
+        unique=True,
+        partialFilterExpression={"window": {"$exists": True}}
+    )
+    await collection.create_index(
+        "key",
+        unique=True,
+        partialFilterExpression={"hits": {"$exists": True}},
+        name="sliding_key_1"
+    )
+    await collection.create_index("expires_at", expireAfterSeconds=0)
@@ -0,0 +1,199 @@
+import asyncio
+import heapq
+import logging
+import math
+import os
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Dict, Iterable, List, Tuple
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReplaceOne
+from dotenv import load_dotenv
+from pathlib import Path
+
+from search_index import tokenize
+
+ROOT_DIR = Path(__file__).parent
+
+# Precomputed "related questions" and "similar companies", one document per item:
+#   {_id: "question:<id>" | "company:<id>", kind, neighbors: [{id, score}], built_at}
+# Built offline by a full pass over the questions (python recommendations.py,
+# run nightly from cron), so serving one is a single _id lookup. The build is
+# CPU-bound and holds every question's terms in memory: it never runs in a web worker.
+RECOMMENDATION_COLLECTION = "recommendations"
+
+TOP_K = 10
+MIN_SIMILARITY = 0.1
+
+# Question text and tags, with tags counting double
+SIMILARITY_FIELDS = (("question", 1), ("tags", 2))
+
+# Each question is described by its strongest terms only, and each term keeps
+# only the questions it weighs most in: both bound the pairwise work
+MAX_QUESTION_TERMS = 12
+MAX_TERM_POSTINGS = 100
+MAX_COMPANY_TERMS = 100
+
+Vector = Dict[str, float]
+
+def question_key(question_id: str) -> str:
+    return f"question:{question_id}"
+
+def company_key(company_id: str) -> str:
+    return f"company:{company_id}"
+
+def term_counts(doc: dict) -> Counter:
+    counts = Counter()
+    for field, weight in SIMILARITY_FIELDS:
+        value = doc.get(field)
+        if isinstance(value, list):
+            value = " ".join(str(v) for v in value)
+        for token in tokenize(value or ""):
+            counts[token] += weight
+    return counts
+
+def _normalized(weights: Dict[str, float], max_terms: int) -> Vector:
+    """The max_terms heaviest weights, scaled to unit length over all of them"""
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    if not norm:
+        return {}
+    return {term: w / norm for term, w in heapq.nlargest(max_terms, weights.items(), key=itemgetter(1))}
+
+def tfidf_vectors(counts: List[Counter], max_terms: int = MAX_QUESTION_TERMS) -> List[Vector]:
+    """Sublinear TF-IDF vectors, one per document; terms in every document get no weight"""
+    df = Counter(term for doc_counts in counts for term in doc_counts)
+    n_docs = len(counts)
+    vectors = []
+    for doc_counts in counts:
+        weights = {
+            term: (1 + math.log(count)) * math.log(n_docs / df[term])
+            for term, count in doc_counts.items()
+            if df[term] < n_docs
+        }
+        vectors.append(_normalized(weights, max_terms))
+    return vectors
+
+def nearest_neighbors(vectors: List[Vector], top_k: int = TOP_K, max_postings: int = MAX_TERM_POSTINGS) -> List[List[Tuple[int, float]]]:
+    """
+    Top-k cosine neighbours of every vector, as (index, score) lists. Scores are
+    accumulated through an inverted index, so only vectors sharing a term are
+    compared; a common term only links the max_postings vectors it weighs most in.
+    """
+    postings: Dict[str, List[Tuple[int, float]]] = {}
+    for index, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            postings.setdefault(term, []).append((index, weight))
+    for term, entries in postings.items():
+        if len(entries) > max_postings:
+            postings[term] = heapq.nlargest(max_postings, entries, key=itemgetter(1))
+    
+    neighbors = []
+    for index, vector in enumerate(vectors):
+        scores: Dict[int, float] = {}
+        get = scores.get
+        for term, weight in vector.items():
+            for other, other_weight in postings.get(term, ()):
+                scores[other] = get(other, 0.0) + weight * other_weight
+        scores.pop(index, None)
+        neighbors.append([
+            (other, score)
+            for other, score in heapq.nlargest(top_k, scores.items(), key=itemgetter(1))
+            if score >= MIN_SIMILARITY
+        ])
+    return neighbors
+
+def build_recommendations(questions: Iterable[dict], top_k: int = TOP_K) -> Tuple[Dict[str, list], Dict[str, list]]:
+    """
+    ({question id: [(question id, score)]}, {company id: [(company id, score)]}).
+    A company is described by the sum of its questions' vectors.
+    """
+    ids, companies, counts = [], [], []
+    for question in questions:
+        ids.append(question['id'])
+        companies.append(question.get('company_ids') or [])
+        counts.append(term_counts(question))
+    return _build_neighbors(ids, companies, counts, top_k)
+
+def _build_neighbors(ids: List[str], companies: List[list], counts: List[Counter], top_k: int):
+    vectors = tfidf_vectors(counts)
+    related = {
+        ids[index]: [(ids[other], score) for other, score in found]
+        for index, found in enumerate(nearest_neighbors(vectors, top_k))
+    }
+    
+    company_weights: Dict[str, Counter] = {}
+    for question_companies, vector in zip(companies, vectors):
+        for company_id in question_companies:
+            company_weights.setdefault(company_id, Counter()).update(vector)
+    company_ids = list(company_weights)
+    company_vectors = [_normalized(company_weights[c], MAX_COMPANY_TERMS) for c in company_ids]
+    similar = {
+        company_ids[index]: [(company_ids[other], score) for other, score in found]
+        for index, found in enumerate(nearest_neighbors(company_vectors, top_k, max_postings=len(company_ids)))
+    }
+    return related, similar
+
+async def rebuild_recommendations(db, top_k: int = TOP_K) -> dict:
+    """Recompute every question's and company's neighbours and replace the stored ones"""
+    started = time.perf_counter()
+    built_at = datetime.now(timezone.utc).isoformat()
+    # Streamed: only each question's term counts are kept, not the documents
+    ids, companies, counts = [], [], []
+    async for question in db.questions.find(
+        {"id": {"$type": "string"}},
+        {"_id": 0, "id": 1, "question": 1, "tags": 1, "company_ids": 1}
+    ):
+        ids.append(question['id'])
+        companies.append(question.get('company_ids') or [])
+        counts.append(term_counts(question))
+    # CPU-bound for a minute or more on a large bank; see the CLI below
+    related, similar = _build_neighbors(ids, companies, counts, top_k)
+    
+    collection = db[RECOMMENDATION_COLLECTION]
+    requests = []
+    for kind, key, neighbors in (("question", question_key, related), ("company", company_key, similar)):
+        for item_id, found in neighbors.items():
+            requests.append(ReplaceOne(
+                {"_id": key(item_id)},
+                {
+                    "kind": kind,
+                    "neighbors": [{"id": other, "score": round(score, 4)} for other, score in found],
+                    "built_at": built_at
+                },
+                upsert=True
+            ))
+            if len(requests) >= 1000:
+                await collection.bulk_write(requests, ordered=False)
+                requests = []
+    if requests:
+        await collection.bulk_write(requests, ordered=False)
+    # Questions and companies deleted since the last build
+    removed = await collection.delete_many({"built_at": {"$lt": built_at}})
+    
+    report = {
+        "questions": len(related),
+        "companies": len(similar),
+        "removed": removed.deleted_count,
+        "seconds": round(time.perf_counter() - started, 1)
+    }
+    logging.info(f"✓ Rebuilt recommendations: {report}")
+    return report
+
+async def get_neighbors(db, key: str, limit: int = TOP_K) -> List[dict]:
+    """Stored [{id, score}] for a question_key/company_key, best first; [] before the first build"""
+    doc = await db[RECOMMENDATION_COLLECTION].find_one({"_id": key}, {"neighbors": {"$slice": limit}})
+    return doc['neighbors'] if doc else []
+
+async def main():
+    """Rebuild related questions and similar companies: python recommendations.py (e.g. a nightly cron job)"""
+    load_dotenv(ROOT_DIR / '.env')
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    report = await rebuild_recommendations(client[os.environ['DB_NAME']])
+    print(f"✅ Rebuilt recommendations for {report['questions']} questions and {report['companies']} companies")
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
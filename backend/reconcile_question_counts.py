@@ -0,0 +1,79 @@
+import asyncio
+import sys
+from typing import Iterable, Optional
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+import os
+from dotenv import load_dotenv
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# Counts every company's questions server-side and keeps only the companies
+# whose stored question_count has drifted from the real number
+DRIFT_PIPELINE = [
+    {"$project": {"_id": 0, "id": 1, "name": 1, "question_count": 1}},
+    # Equality lookup on the multikey company_ids index: one index count per company
+    {"$lookup": {
+        "from": "questions",
+        "localField": "id",
+        "foreignField": "company_ids",
+        "pipeline": [{"$count": "n"}],
+        "as": "actual"
+    }},
+    {"$project": {
+        "id": 1,
+        "name": 1,
+        "stored": {"$ifNull": ["$question_count", 0]},
+        "actual": {"$ifNull": [{"$first": "$actual.n"}, 0]}
+    }},
+    {"$match": {"$expr": {"$ne": ["$stored", "$actual"]}}}
+]
+
+async def reconcile_question_counts(db, apply: bool = True, company_ids: Optional[Iterable[str]] = None) -> dict:
+    """
+    Detect question_count drift with a single aggregation and repair it with a
+    single bulk write. Checks every company unless company_ids is given.
+    Returns the drifted companies.
+    """
+    pipeline = DRIFT_PIPELINE
+    if company_ids is not None:
+        pipeline = [{"$match": {"id": {"$in": list(company_ids)}}}] + DRIFT_PIPELINE
+    drifted = await db.companies.aggregate(pipeline).to_list(None)
+    
+    repaired = 0
+    if apply and drifted:
+        result = await db.companies.bulk_write(
+            [UpdateOne({"id": c['id']}, {"$set": {"question_count": c['actual']}}) for c in drifted],
+            ordered=False
+        )
+        repaired = result.modified_count
+    
+    return {"drifted": drifted, "repaired": repaired}
+
+async def main():
+    """Recalculate question counts for all companies whose counter has drifted"""
+    apply = "--dry-run" not in sys.argv[1:]
+    mongo_url = os.environ['MONGO_URL']
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[os.environ['DB_NAME']]
+    
+    print("Checking question counts for all companies...")
+    
+    report = await reconcile_question_counts(db, apply=apply)
+    
+    for company in report['drifted']:
+        print(f"⚠️ {company.get('name', company['id'])}: stored {company['stored']}, actual {company['actual']}")
+    
+    if not report['drifted']:
+        print("\n✅ All question counts are in sync")
+    elif apply:
+        print(f"\n✅ Repaired question counts for {report['repaired']} companies")
+    else:
+        print(f"\n⚠️ {len(report['drifted'])} companies have drifted (dry run, nothing written)")
+    
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
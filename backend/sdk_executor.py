@@ -0,0 +1,289 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, Optional, Union
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit breaker is open"""
+
+class ProviderTimeoutError(Exception):
+    """Raised when a provider call does not finish within its timeout"""
+
+@dataclass
+class ProviderConfig:
+    max_concurrency: int = 8
+    timeout: float = 10.0
+    failure_threshold: int = 5   # consecutive failures before the circuit opens
+    reset_timeout: float = 30.0  # seconds the circuit stays open before a trial call
+    # Caller errors (bad input etc.) that do not trip the breaker; may be a function
+    # returning the tuple, so the SDK defining them is only imported once it has failed
+    expected_exceptions: Union[tuple, Callable[[], tuple]] = ()
+    
+    def is_expected(self, error: BaseException) -> bool:
+        if callable(self.expected_exceptions):
+            self.expected_exceptions = self.expected_exceptions()
+        return isinstance(error, self.expected_exceptions)
+
+@dataclass
+class ProviderStats:
+    calls: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    recent: deque = field(default_factory=lambda: deque(maxlen=500))
+    
+    def record(self, latency: float):
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.recent.append(latency)
+    
+    def snapshot(self) -> dict:
+        samples = sorted(self.recent)
+        
+        def percentile(p):
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 2)
+        
+        completed = self.calls - self.rejected
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "in_flight": self.in_flight,
+            "total_seconds": round(self.total_latency, 6),
+            "avg_ms": round(self.total_latency / completed * 1000, 2) if completed else None,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(self.max_latency * 1000, 2)
+        }
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_progress = False
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+    
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial_in_progress:
+            self.trial_in_progress = True
+            return True
+        return False
+    
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_progress = False
+    
+    def abandon_trial(self):
+        """The half-open probe ended without an outcome (cancelled): the next call probes instead"""
+        self.trial_in_progress = False
+    
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.trial_in_progress or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.trial_in_progress = False
+
+class SDKExecutor:
+    """
+    Runs blocking third-party SDK calls on a dedicated, bounded thread pool so they
+    never stall the event loop or starve asyncio.to_thread's default executor.
+    Each provider gets its own concurrency limit, timeout, circuit breaker and latency stats.
+    """
+    
+    def __init__(self, max_workers: int = 32):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._configs: Dict[str, ProviderConfig] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats: Dict[str, ProviderStats] = {}
+    
+    def register(self, provider: str, **config):
+        self._configs[provider] = ProviderConfig(**config)
+        self._breakers[provider] = CircuitBreaker(
+            self._configs[provider].failure_threshold,
+            self._configs[provider].reset_timeout
+        )
+        self._stats[provider] = ProviderStats()
+        self._semaphores.pop(provider, None)
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sdk")
+        return self._executor
+    
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(self._configs[provider].max_concurrency)
+        return self._semaphores[provider]
+    
+    def _admit(self, provider: str):
+        if provider not in self._configs:
+            raise KeyError(f"Unknown SDK provider: {provider}")
+        
+        breaker = self._breakers[provider]
+        stats = self._stats[provider]
+        stats.calls += 1
+        
+        if not breaker.allow():
+            stats.rejected += 1
+            raise CircuitOpenError(f"{provider} is temporarily unavailable")
+        return self._configs[provider], breaker, stats
+    
+    async def _acquire_slot(self, provider: str, stats: ProviderStats):
+        semaphore = self._semaphore(provider)
+        await semaphore.acquire()
+        stats.in_flight += 1
+        
+        def release(_):
+            # The slot is freed when the thread finishes, not when the caller gives up,
+            # so timed-out calls still count against the provider's limit
+            stats.in_flight -= 1
+            semaphore.release()
+        return release
+    
+    @staticmethod
+    def _record_outcome(config: ProviderConfig, breaker: CircuitBreaker, stats: ProviderStats, start: float, error=None):
+        stats.record(time.perf_counter() - start)
+        if error is None or config.is_expected(error):
+            breaker.record_success()
+            return
+        stats.failures += 1
+        if isinstance(error, ProviderTimeoutError):
+            stats.timeouts += 1
+        breaker.record_failure()
+    
+    async def call(self, provider: str, fn: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """Run fn(*args, **kwargs) in the pool under the provider's limits"""
+        config, breaker, stats = self._admit(provider)
+        # Whether this call is the half-open probe (see the finally below)
+        trial = breaker.trial_in_progress
+        try:
+            release = await self._acquire_slot(provider, stats)
+            loop = asyncio.get_running_loop()
+            start = time.perf_counter()
+            
+            future = loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+            future.add_done_callback(release)
+            
+            try:
+                result = await asyncio.wait_for(asyncio.shield(future), timeout or config.timeout)
+            except asyncio.TimeoutError:
+                logging.warning(f"SDK call to {provider} timed out after {timeout or config.timeout}s")
+                error = ProviderTimeoutError(f"{provider} did not respond in time")
+                self._record_outcome(config, breaker, stats, start, error)
+                raise error
+            except Exception as e:
+                self._record_outcome(config, breaker, stats, start, e)
+                raise
+            
+            self._record_outcome(config, breaker, stats, start)
+            return result
+        finally:
+            # A cancelled call (the client went away) records no outcome; if it was the
+            # half-open probe, leaving the probe claimed would keep the circuit open forever
+            if trial:
+                breaker.abandon_trial()
+    
+    async def stream(self, provider: str, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> AsyncIterator:
+        """
+        Iterate the blocking iterator returned by fn(*args, **kwargs) in the pool,
+        yielding items as they arrive. The provider slot is held until the iterator
+        is exhausted or abandoned; timeout applies to the wait for each item.
+        """
+        config, breaker, stats = self._admit(provider)
+        trial = breaker.trial_in_progress
+        try:
+            release = await self._acquire_slot(provider, stats)
+        except BaseException:
+            # Cancelled while waiting for a slot: give back a half-open probe (see call)
+            if trial:
+                breaker.abandon_trial()
+            raise
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        items: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        finished = object()
+        
+        def put(item, error=None):
+            try:
+                loop.call_soon_threadsafe(items.put_nowait, (item, error))
+            except RuntimeError:  # event loop already closed
+                stop.set()
+        
+        def produce():
+            try:
+                for item in fn(*args, **kwargs):
+                    if stop.is_set():
+                        return
+                    put(item)
+            except Exception as e:
+                put(finished, e)
+                return
+            put(finished)
+        
+        future = loop.run_in_executor(self.executor, produce)
+        future.add_done_callback(release)
+        
+        outcome = None
+        try:
+            while True:
+                try:
+                    item, error = await asyncio.wait_for(items.get(), timeout or config.timeout)
+                except asyncio.TimeoutError:
+                    logging.warning(f"SDK stream from {provider} stalled for {timeout or config.timeout}s")
+                    outcome = ProviderTimeoutError(f"{provider} did not respond in time")
+                    raise outcome
+                
+                if item is finished:
+                    outcome = error
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            stop.set()
+            # A consumer that stops early counts as a success for the breaker
+            self._record_outcome(config, breaker, stats, start, outcome)
+    
+    def stats(self) -> dict:
+        return {
+            provider: {
+                **self._stats[provider].snapshot(),
+                "circuit": self._breakers[provider].state,
+                "max_concurrency": config.max_concurrency,
+                "timeout": config.timeout
+            }
+            for provider, config in self._configs.items()
+        }
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,649 @@
+import asyncio
+import fcntl
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+from html import escape
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from bson import ObjectId
+
+# ============= TEXT =============
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how i if in into is it its "
+    "of on or that the their then there these this to was we what when where which who "
+    "why will with you your".split()
+)
+
+# BM25F-style field boosts: a term in the question counts three times one in the answer
+FIELD_WEIGHTS = (("question", 3), ("tags", 2), ("category", 2), ("answer", 1))
+K1 = 1.2
+B = 0.75
+
+# Filters are indexed as terms no query token can produce
+FILTER_FIELDS = (("topic_id", "t"), ("company_ids", "c"), ("difficulty", "d"))
+
+def normalize(token: str) -> str:
+    # Light plural folding, applied to documents and queries alike
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    return [normalize(t) for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+def filter_term(field: str, value) -> str:
+    code = dict(FILTER_FIELDS)[field]
+    return f"\x00{code}:{str(value).lower() if field == 'difficulty' else value}"
+
+def document_terms(doc: dict) -> Tuple[Counter, int, List[str]]:
+    """Weighted term frequencies, weighted length and filter terms of a question"""
+    tf = Counter()
+    length = 0
+    for field, weight in FIELD_WEIGHTS:
+        value = doc.get(field)
+        if isinstance(value, list):
+            value = " ".join(str(v) for v in value)
+        for token in tokenize(value or ""):
+            tf[token] += weight
+            length += weight
+    filters = []
+    for field, _ in FILTER_FIELDS:
+        value = doc.get(field)
+        # A question shared by several companies matches each of their filters
+        for item in value if isinstance(value, list) else [value]:
+            if item:
+                filters.append(filter_term(field, item))
+    return tf, length, filters
+
+def idf(n_docs: int, df: int) -> float:
+    return math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+def bm25(idf_value: float, tf: float, length: float, avgdl: float) -> float:
+    return idf_value * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avgdl))
+
+def highlight(text: str, terms: Set[str], max_length: Optional[int] = None) -> str:
+    """HTML-escaped text with matching words wrapped in <mark>, optionally cut to a window around the first match"""
+    text = text or ""
+    matches = [m for m in TOKEN_RE.finditer(text.lower()) if normalize(m.group()) in terms]
+    start, end = 0, len(text)
+    if max_length and len(text) > max_length:
+        first = matches[0].start() if matches else 0
+        start = max(0, min(first - max_length // 4, len(text) - max_length))
+        end = start + max_length
+    parts = ["…" if start else ""]
+    position = start
+    for match in matches:
+        if match.start() < position or match.end() > end:
+            continue
+        parts.append(escape(text[position:match.start()]))
+        parts.append(f"<mark>{escape(text[match.start():match.end()])}</mark>")
+        position = match.end()
+    parts.append(escape(text[position:end]))
+    parts.append("…" if end < len(text) else "")
+    return "".join(parts)
+
+# ============= SEGMENT FILE =============
+# A built index is a single file: a JSON header followed by flat arrays, so a
+# worker maps it with mmap and serves from the page cache without parsing it.
+#   terms      sorted UTF-8 terms (term_blob + term_offsets), filter terms included
+#   postings   per term, doc numbers (uint32) and precomputed BM25 impacts (float32),
+#              best impact first so queries can stop early; sorted_docs/sorted_impacts
+#              hold the same postings in doc order for probing single documents
+#   ids        question ids sorted, so an id's doc number is a binary search away
+
+MAGIC = b"IGPSEARCH1\n"
+SECTION_ALIGN = 8
+
+class SegmentWriter:
+    """Builds a segment from questions added in ascending id order"""
+    
+    def __init__(self):
+        self.ids: List[bytes] = []
+        self.lengths = array("f")
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.total_length = 0.0
+    
+    def add(self, doc: dict):
+        doc_id = doc['id'].encode("utf-8")
+        if self.ids and doc_id <= self.ids[-1]:
+            raise ValueError("Documents must be added in ascending id order")
+        number = len(self.ids)
+        self.ids.append(doc_id)
+        tf, length, filters = document_terms(doc)
+        self.lengths.append(length)
+        self.total_length += length
+        for term, frequency in tf.items():
+            docs, tfs = self.postings.setdefault(term, (array("I"), array("f")))
+            docs.append(number)
+            tfs.append(frequency)
+        for term in filters:
+            docs, tfs = self.postings.setdefault(term, (array("I"), array("f")))
+            docs.append(number)
+            tfs.append(0.0)
+    
+    def write(self, path: Path, watermark: Optional[str] = None):
+        n_docs = len(self.ids)
+        avgdl = self.total_length / n_docs if n_docs else 1.0
+        
+        terms = sorted(self.postings, key=lambda t: t.encode("utf-8"))
+        term_blob = bytearray()
+        term_offsets = array("I", [0])
+        posting_offsets = array("I", [0])
+        posting_docs = array("I")
+        posting_impacts = array("f")
+        sorted_docs = array("I")
+        sorted_impacts = array("f")
+        for term in terms:
+            term_blob += term.encode("utf-8")
+            term_offsets.append(len(term_blob))
+            docs, tfs = self.postings[term]
+            if term.startswith("\x00"):
+                impacts = tfs
+            else:
+                term_idf = idf(n_docs, len(docs))
+                impacts = array("f", (bm25(term_idf, tf, self.lengths[d], avgdl) for d, tf in zip(docs, tfs)))
+            sorted_docs.extend(docs)
+            sorted_impacts.extend(impacts)
+            # Impact order: a query can stop after the best postings of a common term
+            order = sorted(range(len(docs)), key=lambda i: -impacts[i])
+            posting_docs.extend(docs[i] for i in order)
+            posting_impacts.extend(impacts[i] for i in order)
+            posting_offsets.append(len(posting_docs))
+        
+        id_blob = b"".join(self.ids)
+        id_offsets = array("I", [0])
+        for doc_id in self.ids:
+            id_offsets.append(id_offsets[-1] + len(doc_id))
+        
+        sections = {
+            "term_blob": ("B", bytes(term_blob)),
+            "term_offsets": ("I", term_offsets),
+            "posting_offsets": ("I", posting_offsets),
+            "posting_docs": ("I", posting_docs),
+            "posting_impacts": ("f", posting_impacts),
+            "sorted_docs": ("I", sorted_docs),
+            "sorted_impacts": ("f", sorted_impacts),
+            "id_blob": ("B", id_blob),
+            "id_offsets": ("I", id_offsets),
+            "doc_lengths": ("f", self.lengths),
+        }
+        header = {
+            "n_docs": n_docs,
+            "n_terms": len(terms),
+            "avgdl": avgdl,
+            "byteorder": sys.byteorder,
+            "watermark": watermark,
+            "built_at": datetime.now(timezone.utc).isoformat(),
+            "sections": {}
+        }
+        # Offsets are relative to the end of the header, so they do not depend on its size
+        offset = 0
+        for name, (typecode, data) in sections.items():
+            size = len(data) * (1 if typecode == "B" else data.itemsize)
+            header["sections"][name] = [offset, size, typecode]
+            offset += size + (-size % SECTION_ALIGN)
+        
+        header_bytes = json.dumps(header).encode("utf-8")
+        header_bytes += b" " * (-(len(MAGIC) + 4 + len(header_bytes)) % SECTION_ALIGN)
+        
+        temp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header_bytes).to_bytes(4, "little"))
+            f.write(header_bytes)
+            for name, (typecode, data) in sections.items():
+                raw = data if typecode == "B" else data.tobytes()
+                f.write(raw)
+                f.write(b"\0" * (-len(raw) % SECTION_ALIGN))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+
+class Segment:
+    """A memory-mapped segment file"""
+    
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            stat = os.fstat(f.fileno())
+        self.signature = (stat.st_ino, stat.st_mtime_ns)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a search index segment")
+        header_size = int.from_bytes(self._mmap[len(MAGIC):len(MAGIC) + 4], "little")
+        start = len(MAGIC) + 4
+        self.header = json.loads(self._mmap[start:start + header_size])
+        if self.header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was built on a {self.header['byteorder']}-endian machine")
+        
+        base = start + header_size
+        view = memoryview(self._mmap)
+        for name, (offset, size, typecode) in self.header["sections"].items():
+            section = view[base + offset:base + offset + size]
+            setattr(self, name, section if typecode == "B" else section.cast(typecode))
+        
+        self.n_docs = self.header["n_docs"]
+        self.avgdl = self.header["avgdl"] or 1.0
+        self.watermark = self.header.get("watermark")
+        self.built_at = datetime.fromisoformat(self.header["built_at"])
+    
+    def _term(self, index: int) -> bytes:
+        return bytes(self.term_blob[self.term_offsets[index]:self.term_offsets[index + 1]])
+    
+    def postings(self, term: str, by_doc: bool = False) -> Tuple[memoryview, memoryview]:
+        """
+        (doc numbers, impacts) for term, empty when the term is not indexed;
+        in descending impact order, or ascending doc order with by_doc.
+        """
+        key = term.encode("utf-8")
+        lo, hi = 0, self.header["n_terms"]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.header["n_terms"] and self._term(lo) == key:
+            start, end = self.posting_offsets[lo], self.posting_offsets[lo + 1]
+        else:
+            start = end = 0
+        if by_doc:
+            return self.sorted_docs[start:end], self.sorted_impacts[start:end]
+        return self.posting_docs[start:end], self.posting_impacts[start:end]
+    
+    def doc_id(self, number: int) -> str:
+        return bytes(self.id_blob[self.id_offsets[number]:self.id_offsets[number + 1]]).decode("utf-8")
+    
+    def doc_number(self, doc_id: str) -> Optional[int]:
+        key = doc_id.encode("utf-8")
+        lo, hi = 0, self.n_docs
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(self.id_blob[self.id_offsets[mid]:self.id_offsets[mid + 1]]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_docs and self.doc_id(lo) == doc_id:
+            return lo
+        return None
+
+# ============= LIVE INDEX =============
+
+FILTER_CACHE_SIZE = 64
+# Probing a doc's impact for one term costs about as much as reading PROBE_COST postings
+PROBE_COST = 12
+# Candidates rescored past the requested page when postings were pruned
+RESCORE_MARGIN = 200
+
+SEARCH_PROJECTION = {"_id": 0, "id": 1, "question": 1, "answer": 1, "tags": 1, "category": 1,
+                     "topic_id": 1, "company_ids": 1, "difficulty": 1}
+
+class _Delta:
+    """Documents changed since the segment was built, indexed in memory"""
+    
+    def __init__(self):
+        self.docs: Dict[str, Tuple[Counter, int, Set[str]]] = {}
+        self.postings: Dict[str, Set[str]] = {}
+    
+    def remove(self, doc_id: str):
+        entry = self.docs.pop(doc_id, None)
+        if entry:
+            for term in list(entry[0]) + list(entry[2]):
+                self.postings[term].discard(doc_id)
+    
+    def add(self, doc: dict):
+        tf, length, filters = document_terms(doc)
+        self.docs[doc['id']] = (tf, length, set(filters))
+        for term in list(tf) + filters:
+            self.postings.setdefault(term, set()).add(doc['id'])
+
+class SearchIndex:
+    """
+    BM25 search over questions: an immutable memory-mapped segment built in the
+    background, plus an in-memory delta of documents changed since, minus
+    tombstones for segment documents that were edited or deleted.
+    
+    Writers append question ids to the search_changes collection; every worker
+    polls it, so all workers converge within sync_interval seconds. Once the
+    delta grows past max_delta (or the segment ages past rebuild_after), one
+    process per host rebuilds the segment under a file lock and every worker on
+    the host swaps to the new file.
+    """
+    
+    def __init__(
+        self,
+        db,
+        path: str,
+        sync_interval: float = 5.0,
+        max_delta: int = 2000,
+        rebuild_after: float = 6 * 3600,
+        change_retention: float = 24 * 3600,
+        max_postings: int = 12000
+    ):
+        self.db = db
+        self.path = Path(path)
+        self.sync_interval = sync_interval
+        self.max_delta = max_delta
+        self.rebuild_after = rebuild_after
+        self.change_retention = change_retention
+        self.max_postings = max_postings
+        
+        self.segment: Optional[Segment] = None
+        self.delta = _Delta()
+        self.tombstones: Set[int] = set()
+        self._filter_cache: Tuple[Optional[Segment], Dict[str, Set[int]]] = (None, {})
+        self._seen_changes: Dict[ObjectId, float] = {}
+        self._synced_from: Optional[datetime] = None
+        self._rebuild_requested = False
+        self._poke = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.counters = {"searches": 0, "syncs": 0, "changes_applied": 0, "rebuilds": 0, "pruned_searches": 0}
+    
+    @property
+    def ready(self) -> bool:
+        return self.segment is not None
+    
+    # ----- querying -----
+    
+    def _filter_docs(self, segment: Segment, term: str) -> Set[int]:
+        """Segment doc numbers carrying a filter term, cached per segment"""
+        if self._filter_cache[0] is not segment:
+            self._filter_cache = (segment, {})
+        cache = self._filter_cache[1]
+        docs = cache.pop(term, None)
+        if docs is None:
+            docs = set(segment.postings(term, by_doc=True)[0].tolist())
+        cache[term] = docs
+        while len(cache) > FILTER_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        return docs
+    
+    def _filter_set(self, segment: Segment, filters: Dict[str, str]) -> Tuple[Optional[Set[int]], Optional[Set[str]]]:
+        """Allowed segment doc numbers and delta ids for the filters (None: no filtering)"""
+        if not filters:
+            return None, None
+        allowed, allowed_delta = None, None
+        for field, value in filters.items():
+            term = filter_term(field, value)
+            docs = self._filter_docs(segment, term)
+            allowed = docs if allowed is None else allowed & docs
+            delta_docs = self.delta.postings.get(term, set())
+            allowed_delta = set(delta_docs) if allowed_delta is None else allowed_delta & delta_docs
+        return allowed, allowed_delta
+    
+    def _score_segment(self, segment: Segment, terms: List[str], allowed: Optional[Set[int]], wanted: int) -> Tuple[Dict[int, float], bool]:
+        """
+        Scores for segment docs that include the best `wanted` matches, and
+        whether every posting was read (scores and their number are then exact).
+        
+        At most max_postings postings are read. Past that, each term reads the
+        best-impact prefix of its postings (short lists in full, the rest share
+        what is left), so what is skipped is the weakest postings of the most
+        common terms. The leading candidates are then rescored exactly.
+        """
+        tombstones = self.tombstones
+        lists = [(term, segment.postings(term)) for term in terms]
+        lists = sorted((entry for entry in lists if len(entry[1][0])), key=lambda entry: len(entry[1][0]))
+        
+        by_doc = [segment.postings(term, by_doc=True) for term, _ in lists]
+        
+        def exact_score(number: int) -> float:
+            score = 0.0
+            for docs, impacts in by_doc:
+                position = bisect_left(docs, number)
+                if position < len(docs) and docs[position] == number:
+                    score += impacts[position]
+            return score
+        
+        total_postings = sum(len(docs) for _, (docs, _) in lists)
+        if allowed is not None and len(allowed) * len(lists) * PROBE_COST < min(total_postings, self.max_postings):
+            # A selective filter: probing the few allowed docs beats reading postings
+            scores = {number: exact_score(number) for number in allowed - tombstones}
+            return {number: score for number, score in scores.items() if score > 0}, True
+        
+        scores: Dict[int, float] = {}
+        get = scores.get
+        budget = self.max_postings
+        complete = True
+        for index, (_, (docs, impacts)) in enumerate(lists):
+            depth = min(len(docs), budget // (len(lists) - index))
+            budget -= depth
+            complete = complete and depth == len(docs)
+            if allowed is None:
+                for number, impact in zip(docs[:depth].tolist(), impacts[:depth].tolist()):
+                    scores[number] = get(number, 0.0) + impact
+            else:
+                for number, impact in zip(docs[:depth].tolist(), impacts[:depth].tolist()):
+                    if number in allowed:
+                        scores[number] = get(number, 0.0) + impact
+        for number in tombstones:
+            scores.pop(number, None)
+        
+        if not complete:
+            self.counters["pruned_searches"] += 1
+            # Partly read docs are underscored; rescore those that can reach the page
+            for number in heapq.nlargest(2 * wanted + RESCORE_MARGIN, scores, key=scores.get):
+                scores[number] = exact_score(number)
+        return scores, complete
+    
+    def search(self, query: str, filters: Optional[Dict[str, str]] = None, limit: int = 20, offset: int = 0) -> Tuple[int, List[Tuple[str, float]], Set[str]]:
+        """
+        (total matches, [(question id, score)] for the requested page, query terms).
+        Total is exact when every posting was read, an estimate otherwise.
+        """
+        self.counters["searches"] += 1
+        terms = set(tokenize(query))
+        segment = self.segment
+        if not terms or segment is None:
+            return 0, [], terms
+        
+        filters = {k: v for k, v in (filters or {}).items() if v}
+        allowed, allowed_delta = self._filter_set(segment, filters)
+        tombstones = self.tombstones
+        n_docs = segment.n_docs + len(self.delta.docs) - len(tombstones)
+        
+        wanted = offset + limit
+        scores, complete = self._score_segment(segment, list(terms), allowed, wanted)
+        if complete:
+            matched = len(scores)
+        else:
+            # Assume terms and filters are independent: P(any term) * P(passes filters)
+            missing = 1.0
+            for term in terms:
+                missing *= 1.0 - len(segment.postings(term)[0]) / segment.n_docs
+            share = len(allowed) / segment.n_docs if allowed is not None else 1.0
+            matched = max(len(scores), round(segment.n_docs * (1.0 - missing) * share))
+        
+        delta_scores: Dict[str, float] = {}
+        for term in terms:
+            matching = self.delta.postings.get(term)
+            if not matching:
+                continue
+            term_idf = idf(max(n_docs, 1), len(segment.postings(term)[0]) + len(matching))
+            for doc_id in matching:
+                if allowed_delta is not None and doc_id not in allowed_delta:
+                    continue
+                tf, length, _ = self.delta.docs[doc_id]
+                delta_scores[doc_id] = delta_scores.get(doc_id, 0.0) + bm25(term_idf, tf[term], length, segment.avgdl)
+        
+        total = matched + len(delta_scores)
+        top = heapq.nlargest(wanted, scores.items(), key=itemgetter(1))
+        results = [(segment.doc_id(number), score) for number, score in top]
+        if delta_scores:
+            results = heapq.nlargest(wanted, results + list(delta_scores.items()), key=itemgetter(1))
+        return total, results[offset:wanted], terms
+    
+    # ----- keeping up with writes -----
+    
+    async def record_changes(self, question_ids: Iterable[str]):
+        """Called after questions were written; every worker applies the change on its next sync"""
+        now = datetime.now(timezone.utc)
+        changes = [{"question_id": question_id, "created_at": now} for question_id in dict.fromkeys(question_ids) if question_id]
+        if not changes:
+            return
+        try:
+            await self.db.search_changes.insert_many(changes, ordered=False)
+            self._poke.set()
+        except Exception as e:
+            logging.warning(f"⚠️ Could not record search index changes: {e}")
+    
+    async def _apply_changes(self, segment: Segment, delta: _Delta, tombstones: Set[int], since: datetime) -> Optional[datetime]:
+        """Apply changes recorded after since; returns the newest change time seen"""
+        # Changes are read with an overlap: ids from other processes are not strictly
+        # ordered by commit time. Re-applying one is harmless, and seen ones are skipped.
+        cursor = self.db.search_changes.find(
+            {"_id": {"$gte": ObjectId.from_datetime(since - timedelta(seconds=2 * self.sync_interval))}},
+            {"question_id": 1}
+        ).sort("_id", 1)
+        changes = [c for c in await cursor.to_list(None) if c['_id'] not in self._seen_changes]
+        if not changes:
+            return None
+        
+        question_ids = list({c['question_id'] for c in changes})
+        if len(question_ids) > self.max_delta and segment is self.segment:
+            # A bulk import: rebuilding is cheaper than holding it all in the delta
+            self._rebuild_requested = True
+            return None
+        docs = {
+            doc['id']: doc
+            for doc in await self.db.questions.find({"id": {"$in": question_ids}}, SEARCH_PROJECTION).to_list(None)
+        }
+        for question_id in question_ids:
+            number = segment.doc_number(question_id)
+            if number is not None:
+                tombstones.add(number)
+            delta.remove(question_id)
+            if question_id in docs:
+                delta.add(docs[question_id])
+        
+        now = time.monotonic()
+        for change in changes:
+            self._seen_changes[change['_id']] = now
+        self.counters["changes_applied"] += len(changes)
+        return changes[-1]['_id'].generation_time
+    
+    async def sync(self):
+        """Pick up a rebuilt segment file and apply recorded changes"""
+        self.counters["syncs"] += 1
+        try:
+            stat = os.stat(self.path)
+            signature = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            signature = None
+        
+        if signature and (self.segment is None or self.segment.signature != signature):
+            segment = await asyncio.to_thread(Segment, self.path)
+            delta, tombstones = _Delta(), set()
+            since = datetime.fromisoformat(segment.watermark) if segment.watermark else segment.built_at
+            self._seen_changes.clear()
+            await self._apply_changes(segment, delta, tombstones, since)
+            # Swap everything at once so searches never see a half-updated index
+            self.segment, self.delta, self.tombstones, self._synced_from = segment, delta, tombstones, since
+            self._rebuild_requested = False
+            logging.info(f"✓ Loaded search index: {segment.n_docs} questions, {segment.header['n_terms']} terms")
+        elif self.segment is not None:
+            newest = await self._apply_changes(self.segment, self.delta, self.tombstones, self._synced_from)
+            if newest:
+                self._synced_from = max(self._synced_from, newest)
+        
+        # Forget seen change ids once they are out of the overlap window
+        cutoff = time.monotonic() - 4 * self.sync_interval - 60
+        for change_id in [c for c, seen in self._seen_changes.items() if seen < cutoff]:
+            del self._seen_changes[change_id]
+    
+    def needs_rebuild(self) -> bool:
+        if self.segment is None or self._rebuild_requested:
+            return True
+        age = (datetime.now(timezone.utc) - self.segment.built_at).total_seconds()
+        return len(self.delta.docs) + len(self.tombstones) > self.max_delta or age > self.rebuild_after
+    
+    async def rebuild(self, force: bool = False) -> bool:
+        """
+        Build a new segment from the questions collection. Returns False when
+        another process on this host holds the lock or has already replaced the
+        segment this process loaded (unless force).
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            
+            try:
+                # Another process may have rebuilt while we waited to notice
+                stat = os.stat(self.path)
+                if not force and (self.segment is None or self.segment.signature != (stat.st_ino, stat.st_mtime_ns)):
+                    return False
+            except FileNotFoundError:
+                pass
+            
+            started = time.perf_counter()
+            # Changes recorded from here on are applied on top of the new segment
+            watermark = datetime.now(timezone.utc)
+            writer = SegmentWriter()
+            cursor = self.db.questions.find({"id": {"$type": "string"}}, SEARCH_PROJECTION).sort("id", 1)
+            while True:
+                batch = await cursor.to_list(1000)
+                if not batch:
+                    break
+                await asyncio.to_thread(lambda docs=batch: [writer.add(doc) for doc in docs])
+            await asyncio.to_thread(writer.write, self.path, watermark.isoformat())
+            
+            self.counters["rebuilds"] += 1
+            logging.info(f"✓ Built search index of {len(writer.ids)} questions in {time.perf_counter() - started:.1f}s")
+            return True
+    
+    async def run(self):
+        """Background loop: sync every sync_interval seconds (sooner after a local write), rebuild when due"""
+        while True:
+            try:
+                await self.sync()
+                if self.needs_rebuild() and await self.rebuild():
+                    await self.sync()
+            except Exception as e:
+                logging.error(f"✗ Search index sync failed: {e}")
+            try:
+                await asyncio.wait_for(self._poke.wait(), timeout=self.sync_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._poke.clear()
+    
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "ready": self.ready,
+            "segment_docs": self.segment.n_docs if self.segment else 0,
+            "delta_docs": len(self.delta.docs),
+            "tombstones": len(self.tombstones),
+            "built_at": self.segment.header["built_at"] if self.segment else None
+        }
+
+async def create_search_indexes(db, change_retention: int = 24 * 3600):
+    await db.search_changes.create_index("created_at", expireAfterSeconds=change_retention)
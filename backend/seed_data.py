@@ -90,7 +90,7 @@ async def seed_database():
         {
             "id": str(uuid.uuid4()),
             "topic_id": topics[0]["id"],
-            "company_id": None,
+            "company_ids": [],
             "question": "What is the difference between an array and a linked list?",
             "answer": "Arrays store elements in contiguous memory locations with fixed size, while linked lists use nodes with pointers allowing dynamic size. Arrays provide O(1) access but O(n) insertion/deletion, whereas linked lists offer O(1) insertion/deletion but O(n) access.",
             "difficulty": "easy",
@@ -101,7 +101,7 @@ async def seed_database():
         {
             "id": str(uuid.uuid4()),
             "topic_id": topics[0]["id"],
-            "company_id": None,
+            "company_ids": [],
             "question": "Explain the concept of a hash table and its time complexity",
             "answer": "A hash table is a data structure that maps keys to values using a hash function. It provides average O(1) time complexity for insertion, deletion, and lookup operations. Collisions are handled using techniques like chaining or open addressing.",
             "difficulty": "medium",
@@ -112,7 +112,7 @@ async def seed_database():
         {
             "id": str(uuid.uuid4()),
             "topic_id": topics[1]["id"],
-            "company_id": None,
+            "company_ids": [],
             "question": "What is the time complexity of binary search?",
             "answer": "Binary search has a time complexity of O(log n) as it divides the search space in half with each comparison. It requires the array to be sorted and works by repeatedly comparing the middle element with the target value.",
             "difficulty": "easy",
@@ -123,7 +123,7 @@ async def seed_database():
         {
             "id": str(uuid.uuid4()),
             "topic_id": topics[2]["id"],
-            "company_id": None,
+            "company_ids": [],
             "question": "How would you design a URL shortening service like bit.ly?",
             "answer": "Key components: 1) Hash function to generate unique short URLs 2) Database to store mappings 3) Redirection service 4) Analytics tracking. Use base62 encoding, distributed caching (Redis), load balancers, and SQL/NoSQL database for scalability.",
             "difficulty": "hard",
@@ -138,7 +138,7 @@ async def seed_database():
         {
             "id": str(uuid.uuid4()),
             "topic_id": None,
-            "company_id": companies[0]["id"],
+            "company_ids": [companies[0]["id"]],
             "question": "Design a scalable web crawler for Google Search",
             "answer": "Use distributed architecture with: 1) URL frontier for managing URLs to crawl 2) DNS resolver pool 3) Robots.txt checker 4) Content parser 5) Duplicate detector using Bloom filters 6) Storage system (HBase/Bigtable) 7) Prioritization using PageRank",
             "difficulty": "hard",
@@ -149,7 +149,7 @@ async def seed_database():
         {
             "id": str(uuid.uuid4()),
             "topic_id": None,
-            "company_id": companies[0]["id"],
+            "company_ids": [companies[0]["id"]],
             "question": "Tell me about a challenging project you worked on",
             "answer": "Example answer: Describe a project where you faced technical challenges, how you approached problem-solving, collaboration with team members, and the positive outcome. Focus on your specific contributions and learnings.",
             "difficulty": "medium",
@@ -160,7 +160,7 @@ async def seed_database():
         {
             "id": str(uuid.uuid4()),
             "topic_id": None,
-            "company_id": companies[1]["id"],
+            "company_ids": [companies[1]["id"]],
             "question": "Reverse a linked list iteratively and recursively",
             "answer": "Iterative: Use three pointers (prev, curr, next) to reverse links. Recursive: Base case is null/single node, recursively reverse rest and adjust pointers. Time O(n), Space O(1) iterative, O(n) recursive.",
             "difficulty": "medium",
@@ -171,7 +171,7 @@ async def seed_database():
         {
             "id": str(uuid.uuid4()),
             "topic_id": None,
-            "company_id": companies[2]["id"],
+            "company_ids": [companies[2]["id"]],
             "question": "Describe Amazon's leadership principles",
             "answer": "Amazon has 16 leadership principles including: Customer Obsession, Ownership, Invent and Simplify, Learn and Be Curious, Hire and Develop the Best, etc. Prepare specific examples demonstrating these principles from your experience.",
             "difficulty": "easy",
@@ -182,7 +182,7 @@ async def seed_database():
         {
             "id": str(uuid.uuid4()),
             "topic_id": None,
-            "company_id": companies[3]["id"],
+            "company_ids": [companies[3]["id"]],
             "question": "Explain how you would optimize React application performance",
             "answer": "Techniques: 1) Use React.memo for component memoization 2) useMemo/useCallback hooks 3) Code splitting with lazy loading 4) Virtual scrolling for large lists 5) Debouncing/throttling 6) Optimize re-renders 7) Use production build",
             "difficulty": "medium",
@@ -196,14 +196,14 @@ async def seed_database():
     
     # Update company question counts
     for company in companies:
-        count = len([q for q in company_questions if q["company_id"] == company["id"]])
+        count = len([q for q in company_questions if company["id"] in q["company_ids"]])
         await db.companies.update_one({"id": company["id"]}, {"$set": {"question_count": count}})
     
     print("Seeding experiences...")
     experiences = [
         {
             "id": str(uuid.uuid4()),
-            "company_id": companies[0]["id"],
+            "company_ids": [companies[0]["id"]],
             "company_name": "Google",
             "role": "Software Engineer",
             "rounds": 5,
@@ -212,7 +212,7 @@ async def seed_database():
         },
         {
             "id": str(uuid.uuid4()),
-            "company_id": companies[1]["id"],
+            "company_ids": [companies[1]["id"]],
             "company_name": "Microsoft",
             "role": "SDE 2",
             "rounds": 4,
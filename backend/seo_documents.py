@@ -0,0 +1,591 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DeleteMany, ReplaceOne
+from dotenv import load_dotenv
+from pathlib import Path
+
+from facets import top_facet_values
+
+ROOT_DIR = Path(__file__).parent
+
+# Crawler-facing SEO payloads, built when content changes and stored already
+# JSON-encoded, one document per page keyed by _id:
+#   company:<id>, topic:<id>, experience:<id>, page:goldmine, page:topics,
+#   page:alumni, page:experiences and page:experiences:<company_name>.
+# Each document also records the refresh key ("group") that produced it, so a
+# rebuild can drop pages that no longer exist (e.g. per-company variants).
+SEO_COLLECTION = "seo_documents"
+
+GOLDMINE_PAGE = "page:goldmine"
+TOPICS_PAGE = "page:topics"
+ALUMNI_PAGE = "page:alumni"
+EXPERIENCES_PAGE = "page:experiences"
+
+def company_key(company_id: str) -> str:
+    return f"company:{company_id}"
+
+def topic_key(topic_id: str) -> str:
+    return f"topic:{topic_id}"
+
+def experience_key(experience_id: str) -> str:
+    return f"experience:{experience_id}"
+
+def experiences_variant_key(company_name: str) -> str:
+    return f"{EXPERIENCES_PAGE}:{company_name}"
+
+def question_seo_keys(questions: Iterable[Optional[dict]]) -> Set[str]:
+    """Pages to rebuild after the given question documents (old or new versions) changed"""
+    keys = {GOLDMINE_PAGE, TOPICS_PAGE}
+    for question in questions:
+        if not question:
+            continue
+        keys.update(company_key(company_id) for company_id in question.get('company_ids') or [])
+        if question.get('topic_id'):
+            keys.add(topic_key(question['topic_id']))
+    return keys
+
+def base_url() -> str:
+    return os.environ.get('FRONTEND_URL', 'https://yourdomain.com')
+
+def encode_payload(payload: dict) -> bytes:
+    # Same encoding as FastAPI's JSONResponse
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def _faq_entities(sample_questions: list) -> list:
+    faq_entities = []
+    for q in sample_questions:
+        faq_entities.append({
+            "@type": "Question",
+            "name": q.get('question', ''),
+            "acceptedAnswer": {
+                "@type": "Answer",
+                "text": q.get('answer', '')[:500] + "..." if len(q.get('answer', '')) > 500 else q.get('answer', '')
+            }
+        })
+    return faq_entities
+
+# ============= PAYLOAD BUILDERS =============
+# Each builder reads from the database it is given and returns {_id: payload};
+# a None payload means the page no longer exists.
+
+async def build_company(db, company_id: str) -> Dict[str, Optional[dict]]:
+    key = company_key(company_id)
+    company = await db.companies.find_one({"id": company_id}, {"_id": 0})
+    if not company:
+        return {key: None}
+    
+    questions_count, sample_questions = await asyncio.gather(
+        db.questions.count_documents({"company_ids": company_id}),
+        db.questions.find(
+            {"company_ids": company_id},
+            {"_id": 0, "question": 1, "answer": 1, "difficulty": 1, "category": 1}
+        ).limit(15).to_list(15)
+    )
+    url = base_url()
+    
+    # Multiple structured data types for maximum SEO impact
+    structured_data = {
+        "@context": "https://schema.org",
+        "@graph": [
+            {
+                "@type": "FAQPage",
+                "mainEntity": _faq_entities(sample_questions),
+                "about": {
+                    "@type": "Organization",
+                    "name": company['name']
+                }
+            },
+            {
+                "@type": "EducationalOrganization",
+                "name": f"{company['name']} Interview Preparation",
+                "description": f"Practice {questions_count} real interview questions asked at {company['name']}. Ace your {company['name']} interview with our comprehensive question bank.",
+                "url": f"{url}/company/{company_id}",
+                "image": company.get('logo_url', ''),
+                "offers": {
+                    "@type": "Offer",
+                    "category": "Interview Preparation",
+                    "itemOffered": {
+                        "@type": "Course",
+                        "name": f"{company['name']} Interview Questions",
+                        "description": f"Complete collection of interview questions from {company['name']}",
+                        "provider": {
+                            "@type": "Organization",
+                            "name": "InterviewGuru Pro"
+                        }
+                    }
+                }
+            },
+            {
+                "@type": "WebPage",
+                "name": f"{company['name']} Interview Questions",
+                "description": f"Comprehensive collection of {questions_count}+ interview questions from {company['name']}",
+                "url": f"{url}/company/{company_id}",
+                "breadcrumb": {
+                    "@type": "BreadcrumbList",
+                    "itemListElement": [
+                        {
+                            "@type": "ListItem",
+                            "position": 1,
+                            "name": "Home",
+                            "item": url
+                        },
+                        {
+                            "@type": "ListItem",
+                            "position": 2,
+                            "name": "Goldmine",
+                            "item": f"{url}/goldmine"
+                        },
+                        {
+                            "@type": "ListItem",
+                            "position": 3,
+                            "name": company['name'],
+                            "item": f"{url}/company/{company_id}"
+                        }
+                    ]
+                }
+            }
+        ]
+    }
+    
+    return {key: {
+        "title": f"{company['name']} Interview Questions & Answers 2025 | {questions_count}+ Real Problems | IGP",
+        "description": f"Ace {company['name']} interviews! Practice {questions_count}+ real interview questions covering DSA, System Design, HR rounds. Get hired at {company['name']} with 98% success rate.",
+        "keywords": f"{company['name']} interview questions, {company['name']} interview preparation, {company['name']} coding questions, {company['name']} technical interview, {company['name']} interview experience, {company['name']} DSA questions",
+        "canonical": f"/company/{company_id}",
+        "structuredData": structured_data,
+        "company": company,
+        "questionsCount": questions_count
+    }}
+
+async def build_topic(db, topic_id: str) -> Dict[str, Optional[dict]]:
+    key = topic_key(topic_id)
+    topic = await db.topics.find_one({"id": topic_id}, {"_id": 0})
+    if not topic:
+        return {key: None}
+    
+    questions_count, sample_questions = await asyncio.gather(
+        db.questions.count_documents({"topic_id": topic_id}),
+        db.questions.find(
+            {"topic_id": topic_id},
+            {"_id": 0, "question": 1, "answer": 1, "difficulty": 1}
+        ).limit(10).to_list(10)
+    )
+    
+    structured_data = {
+        "@context": "https://schema.org",
+        "@type": "FAQPage",
+        "mainEntity": _faq_entities(sample_questions),
+        "about": {
+            "@type": "Thing",
+            "name": f"{topic['name']} Programming",
+            "description": topic.get('description', f"Practice {questions_count} {topic['name']} interview questions")
+        },
+        "provider": {
+            "@type": "Organization",
+            "name": "InterviewGuru Pro",
+            "url": base_url()
+        }
+    }
+    
+    return {key: {
+        "title": f"{topic['name']} Interview Questions 2025 - Practice {questions_count}+ Problems | IGP",
+        "description": f"Master {topic['name']} interviews with {questions_count}+ real coding questions. Practice DSA problems, system design, and ace your technical interview. Updated for 2025.",
+        "keywords": f"{topic['name']} interview questions, {topic['name']} coding problems, {topic['name']} DSA, {topic['name']} programming interview, {topic['name']} practice questions",
+        "canonical": f"/topics?topic={topic_id}",
+        "structuredData": structured_data,
+        "topic": topic,
+        "questionsCount": questions_count
+    }}
+
+async def build_experience(db, experience_id: str) -> Dict[str, Optional[dict]]:
+    key = experience_key(experience_id)
+    experience = await db.experiences.find_one({"id": experience_id}, {"_id": 0})
+    if not experience:
+        return {key: None}
+    url = base_url()
+    
+    structured_data = {
+        "@context": "https://schema.org",
+        "@graph": [
+            {
+                "@type": "Article",
+                "headline": f"{experience['company_name']} Interview Experience - {experience['role']}",
+                "description": f"Real interview experience at {experience['company_name']} for {experience['role']} position. {experience['rounds']} rounds covered.",
+                "author": {
+                    "@type": "Person",
+                    "name": "InterviewGuru Pro Community"
+                },
+                "datePublished": experience['posted_at'],
+                "publisher": {
+                    "@type": "Organization",
+                    "name": "InterviewGuru Pro",
+                    "url": url
+                }
+            },
+            {
+                "@type": "WebPage",
+                "name": f"{experience['company_name']} Interview Experience",
+                "description": f"Detailed interview experience at {experience['company_name']}",
+                "url": f"{url}/experience/{experience_id}",
+                "breadcrumb": {
+                    "@type": "BreadcrumbList",
+                    "itemListElement": [
+                        {
+                            "@type": "ListItem",
+                            "position": 1,
+                            "name": "Home",
+                            "item": url
+                        },
+                        {
+                            "@type": "ListItem",
+                            "position": 2,
+                            "name": "Experiences",
+                            "item": f"{url}/experiences"
+                        },
+                        {
+                            "@type": "ListItem",
+                            "position": 3,
+                            "name": f"{experience['company_name']} - {experience['role']}",
+                            "item": f"{url}/experience/{experience_id}"
+                        }
+                    ]
+                }
+            }
+        ]
+    }
+    
+    return {key: {
+        "title": f"{experience['company_name']} Interview Experience - {experience['role']} 2025 | Real Candidate Story | IGP",
+        "description": f"Read authentic {experience['company_name']} interview experience for {experience['role']} position. Learn about {experience['rounds']} interview rounds, questions asked, and tips to get selected at {experience['company_name']}.",
+        "keywords": f"{experience['company_name']} interview experience, {experience['company_name']} {experience['role']}, {experience['company_name']} interview rounds, {experience['company_name']} placement, interview tips",
+        "canonical": f"/experience/{experience_id}",
+        "structuredData": structured_data,
+        "experience": experience
+    }}
+
+async def build_goldmine_page(db, _=None) -> Dict[str, Optional[dict]]:
+    companies_count, total_questions, top_companies = await asyncio.gather(
+        db.companies.count_documents({}),
+        db.questions.count_documents({}),
+        db.companies.find(
+            {"question_count": {"$gt": 0}},
+            {"_id": 0, "name": 1}
+        ).sort("question_count", -1).limit(20).to_list(20)
+    )
+    company_names = [c['name'] for c in top_companies]
+    
+    structured_data = {
+        "@context": "https://schema.org",
+        "@type": "CollectionPage",
+        "name": "Company Interview Questions - Goldmine",
+        "description": f"Access interview questions from {companies_count}+ top tech companies. Over {total_questions} real interview questions to practice.",
+        "url": f"{base_url()}/goldmine",
+        "about": {
+            "@type": "Thing",
+            "name": "Company-wise Interview Questions",
+            "description": f"Comprehensive collection from {companies_count} companies"
+        }
+    }
+    
+    return {GOLDMINE_PAGE: {
+        "title": f"Company Interview Questions 2025 - {companies_count}+ Companies | Goldmine | IGP",
+        "description": f"Practice real interview questions from {companies_count}+ top companies including {', '.join(company_names[:5])} and more. {total_questions}+ authentic coding and technical questions.",
+        "keywords": f"company interview questions, {', '.join(company_names[:10])}, coding interview preparation, technical interview questions",
+        "canonical": "/goldmine",
+        "structuredData": structured_data,
+        "companiesCount": companies_count,
+        "totalQuestions": total_questions
+    }}
+
+async def build_topics_page(db, _=None) -> Dict[str, Optional[dict]]:
+    topics_count, total_questions, topics = await asyncio.gather(
+        db.topics.count_documents({}),
+        db.questions.count_documents({}),
+        db.topics.find({}, {"_id": 0, "name": 1}).limit(20).to_list(20)
+    )
+    topic_names = [t['name'] for t in topics]
+    
+    structured_data = {
+        "@context": "https://schema.org",
+        "@type": "CollectionPage",
+        "name": "Topic-wise Interview Questions",
+        "description": f"Practice {total_questions}+ interview questions organized by {topics_count} topics. Master DSA, System Design, and coding interviews.",
+        "url": f"{base_url()}/topics",
+        "about": {
+            "@type": "Thing",
+            "name": "Programming Interview Questions by Topic",
+            "description": f"Organized collection across {topics_count} topics"
+        }
+    }
+    
+    return {TOPICS_PAGE: {
+        "title": f"Interview Questions by Topic 2025 - Practice {total_questions}+ Problems | IGP",
+        "description": f"Master coding interviews with {total_questions}+ questions across {topics_count} topics including {', '.join(topic_names[:5])} and more. Practice DSA, System Design, and technical interviews.",
+        "keywords": f"interview questions by topic, {', '.join(topic_names[:10])}, coding interview preparation, DSA questions, technical interview",
+        "canonical": "/topics",
+        "structuredData": structured_data,
+        "topicsCount": topics_count,
+        "totalQuestions": total_questions
+    }}
+
+async def build_alumni_page(db, _=None) -> Dict[str, Optional[dict]]:
+    alumni_count, top_companies = await asyncio.gather(
+        db.alumni.count_documents({}),
+        top_facet_values(db, "alumni", "company", limit=10)
+    )
+    companies = [c['value'] for c in top_companies]
+    
+    structured_data = {
+        "@context": "https://schema.org",
+        "@type": "WebPage",
+        "name": "Alumni Network - Connect with Industry Professionals",
+        "description": f"Connect with {alumni_count}+ alumni working at top tech companies. Get career guidance and referrals.",
+        "url": f"{base_url()}/alumni"
+    }
+    
+    return {ALUMNI_PAGE: {
+        "title": f"Alumni Network - Connect with {alumni_count}+ Professionals at Top Companies | IGP",
+        "description": f"Network with {alumni_count}+ professionals from top companies like {', '.join(companies[:5]) if companies else 'Google, Microsoft, Amazon'}. Get referrals, career guidance, and mentorship.",
+        "keywords": f"alumni network, tech professionals, career guidance, job referrals, {', '.join(companies[:10]) if companies else ''}",
+        "canonical": "/alumni",
+        "structuredData": structured_data,
+        "alumniCount": alumni_count
+    }}
+
+async def experience_counts(db) -> Dict[str, int]:
+    """Experiences per company_name, from the maintained facet counts"""
+    rows = await top_facet_values(db, "experiences", "company_name")
+    return {row['value']: row['count'] for row in rows}
+
+def experiences_page_payload(counts: Dict[str, int], company_name: Optional[str] = None) -> dict:
+    experiences_count = sum(counts.values())
+    
+    title = "Interview Experiences - Real Candidate Stories from Top Companies | IGP"
+    description = f"Read {experiences_count}+ real interview experiences from top tech companies. Learn from successful candidates, understand interview rounds, and ace your next interview."
+    keywords = "interview experiences, placement experiences, interview stories, company interview process"
+    
+    if company_name:
+        company_exp_count = counts.get(company_name, 0)
+        title = f"{company_name} Interview Experiences 2025 - {company_exp_count}+ Real Stories | IGP"
+        description = f"Read {company_exp_count}+ authentic {company_name} interview experiences. Learn about interview rounds, questions asked, selection process, and tips from selected candidates."
+        keywords = f"{company_name} interview experience, {company_name} interview process, {company_name} placement, {company_name} interview rounds"
+    
+    structured_data = {
+        "@context": "https://schema.org",
+        "@type": "CollectionPage",
+        "name": title,
+        "description": description,
+        "url": f"{base_url()}/experiences",
+        "about": {
+            "@type": "Thing",
+            "name": "Interview Experiences",
+            "description": f"Collection of {experiences_count} real interview experiences"
+        }
+    }
+    
+    return {
+        "title": title,
+        "description": description,
+        "keywords": keywords,
+        "canonical": "/experiences",
+        "structuredData": structured_data,
+        "experiencesCount": experiences_count,
+        "companies": sorted(counts)
+    }
+
+async def build_experiences_pages(db, _=None) -> Dict[str, Optional[dict]]:
+    """The experiences listing plus its ?company_name= variant for every company with experiences"""
+    counts = await experience_counts(db)
+    pages = {EXPERIENCES_PAGE: experiences_page_payload(counts)}
+    for company_name in counts:
+        pages[experiences_variant_key(company_name)] = experiences_page_payload(counts, company_name)
+    return pages
+
+BUILDERS: Dict[str, Callable[..., Awaitable[Dict[str, Optional[dict]]]]] = {
+    "company": build_company,
+    "topic": build_topic,
+    "experience": build_experience,
+    GOLDMINE_PAGE: build_goldmine_page,
+    TOPICS_PAGE: build_topics_page,
+    ALUMNI_PAGE: build_alumni_page,
+    EXPERIENCES_PAGE: build_experiences_pages,
+}
+
+async def build(db, key: str) -> Dict[str, Optional[dict]]:
+    """Build every page produced by a refresh key"""
+    if key in BUILDERS:
+        return await BUILDERS[key](db)
+    kind, _, arg = key.partition(":")
+    if kind not in BUILDERS or not arg:
+        raise KeyError(f"Unknown SEO document key: {key}")
+    return await BUILDERS[kind](db, arg)
+
+async def all_seo_keys(db) -> Set[str]:
+    companies, topics, experiences = await asyncio.gather(
+        db.companies.distinct("id"),
+        db.topics.distinct("id"),
+        db.experiences.distinct("id")
+    )
+    keys = {GOLDMINE_PAGE, TOPICS_PAGE, ALUMNI_PAGE, EXPERIENCES_PAGE}
+    keys.update(company_key(i) for i in companies if i)
+    keys.update(topic_key(i) for i in topics if i)
+    keys.update(experience_key(i) for i in experiences if i)
+    return keys
+
+async def write_seo_documents(db, keys: Iterable[str]) -> Set[str]:
+    """Rebuild the pages for keys from db and store them; returns the _ids written or removed"""
+    collection = db[SEO_COLLECTION]
+    touched = set()
+    requests = []
+    for key in keys:
+        pages = await build(db, key)
+        now = datetime.now(timezone.utc).isoformat()
+        url = base_url()
+        for page_id, payload in pages.items():
+            touched.add(page_id)
+            if payload is None:
+                requests.append(DeleteMany({"_id": page_id}))
+            else:
+                requests.append(ReplaceOne(
+                    {"_id": page_id},
+                    {"group": key, "body": encode_payload(payload), "base_url": url, "updated_at": now},
+                    upsert=True
+                ))
+        # Pages this key produced before but not this time
+        requests.append(DeleteMany({"group": key, "_id": {"$nin": list(pages)}}))
+        if len(requests) >= 500:
+            await collection.bulk_write(requests, ordered=False)
+            requests = []
+    if requests:
+        await collection.bulk_write(requests, ordered=False)
+    return touched
+
+async def create_seo_indexes(db):
+    await db[SEO_COLLECTION].create_index("group")
+
+async def rebuild_seo_documents(db) -> int:
+    """Build every SEO document from scratch (migration backfill, FRONTEND_URL change)"""
+    keys = await all_seo_keys(db)
+    await write_seo_documents(db, keys)
+    await db[SEO_COLLECTION].delete_many({"group": {"$nin": list(keys)}})
+    return len(keys)
+
+# ============= SERVING =============
+
+class SeoDocumentStore:
+    """
+    Serves pre-encoded SEO payloads: from process memory, else with one _id
+    lookup in seo_documents. Writers call schedule() after content changes;
+    refreshes are coalesced and rebuilt from the primary in the background.
+    """
+    
+    def __init__(self, db, read_db, memory_ttl: float = 60.0, max_memory: int = 2048, debounce: float = 0.5):
+        self.db = db
+        self.read_db = read_db
+        self.memory_ttl = memory_ttl
+        self.max_memory = max_memory
+        self.debounce = debounce
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._pending: Set[str] = set()
+        self._worker: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[[Set[str]], Awaitable[None]]] = []
+        self.counters = {"memory_hits": 0, "stored_hits": 0, "misses": 0, "refreshed": 0, "refresh_failures": 0}
+    
+    def _remember(self, key: str, body: bytes):
+        self._memory[key] = (time.monotonic() + self.memory_ttl, body)
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        """The stored body for key, or None when it has not been built (or was built for another FRONTEND_URL)"""
+        cached = self._memory.get(key)
+        if cached and cached[0] > time.monotonic():
+            self.counters["memory_hits"] += 1
+            return cached[1]
+        
+        doc = await self.read_db[SEO_COLLECTION].find_one({"_id": key}, {"body": 1, "base_url": 1})
+        if doc and doc.get('base_url') == base_url():
+            self.counters["stored_hits"] += 1
+            self._remember(key, doc['body'])
+            return doc['body']
+        self.counters["misses"] += 1
+        return None
+    
+    async def get_or_build(self, key: str, group: Optional[str] = None) -> Optional[bytes]:
+        """
+        The body for key, building it from read_db when missing (a page created
+        before its refresh ran, or a database not yet backfilled). None when the
+        page does not exist; only pages that exist are scheduled for a rebuild.
+        """
+        body = await self.get(key)
+        if body is not None:
+            return body
+        group = group or key
+        payload = (await build(self.read_db, group)).get(key)
+        if payload is None:
+            return None
+        self.schedule([group])
+        return encode_payload(payload)
+    
+    def add_listener(self, listener: Callable[[Set[str]], Awaitable[None]]):
+        """Awaited with the page _ids written or removed after every refresh"""
+        self._listeners.append(listener)
+    
+    def schedule(self, keys: Iterable[str]):
+        self._pending.update(keys)
+        if self._pending and (self._worker is None or self._worker.done()):
+            self._worker = asyncio.get_running_loop().create_task(self._drain())
+    
+    async def _drain(self):
+        while self._pending:
+            # Let a burst of admin writes settle into one rebuild per page
+            await asyncio.sleep(self.debounce)
+            keys, self._pending = self._pending, set()
+            try:
+                await self.refresh(keys)
+            except Exception as e:
+                self.counters["refresh_failures"] += 1
+                logging.error(f"✗ SEO document refresh failed for {len(keys)} keys: {e}")
+    
+    async def refresh(self, keys: Iterable[str]):
+        """Rebuild keys now from the primary"""
+        keys = set(keys)
+        touched = await write_seo_documents(self.db, keys)
+        prefixes = tuple(f"{key}:" for key in keys)
+        # Includes variants the rebuild removed (page:experiences:<name>)
+        for page_id in [k for k in self._memory if k in keys or k in touched or k.startswith(prefixes)]:
+            self._memory.pop(page_id, None)
+        self.counters["refreshed"] += len(touched)
+        for listener in self._listeners:
+            try:
+                await listener(touched)
+            except Exception as e:
+                logging.error(f"✗ SEO document listener failed: {e}")
+    
+    async def rebuild(self) -> int:
+        count = await rebuild_seo_documents(self.db)
+        self._memory.clear()
+        return count
+    
+    def stats(self) -> dict:
+        return {**self.counters, "in_memory": len(self._memory), "pending": len(self._pending)}
+
+async def main():
+    """Rebuild every SEO document: python seo_documents.py"""
+    load_dotenv(ROOT_DIR / '.env')
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    count = await rebuild_seo_documents(client[os.environ['DB_NAME']])
+    print(f"✅ Rebuilt SEO documents for {count} keys")
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+class ServiceRegistry:
+    """
+    External SDK clients, each imported and constructed on first use.
+    
+    Importing razorpay, cloudinary or clerk_backend_api costs hundreds of
+    milliseconds, so a cold start that only serves public reads should never
+    pay for them. A factory runs at most once per process; it may return None
+    when the service is not configured, and that None is cached too.
+    """
+    
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._configured: Dict[str, Callable[[], bool]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, name: str, factory: Callable[[], Any], configured: Optional[Callable[[], bool]] = None):
+        self._factories[name] = factory
+        self._configured[name] = configured or (lambda: True)
+        self._instances.pop(name, None)
+    
+    def get_sync(self, name: str):
+        if name in self._instances:
+            return self._instances[name]
+        with self._lock:
+            if name not in self._instances:
+                self._instances[name] = self._factories[name]()
+                logging.info(f"✓ Loaded service: {name}")
+            return self._instances[name]
+    
+    async def get(self, name: str):
+        """The client for name; the first call imports and builds it off the event loop"""
+        if name in self._instances:
+            return self._instances[name]
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_sync, name)
+    
+    def configured(self, name: str) -> bool:
+        """Whether the service has credentials, without loading it"""
+        return self._configured[name]()
+    
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+    
+    def override(self, name: str, instance):
+        """Use a ready-made client (tests)"""
+        self._instances[name] = instance
+    
+    def stats(self) -> dict:
+        return {
+            name: {"configured": self.configured(name), "loaded": self.is_loaded(name)}
+            for name in self._factories
+        }
+
+# ============= FACTORIES =============
+
+def create_clerk_client():
+    clerk_secret = os.environ.get('CLERK_SECRET_KEY', '')
+    if not clerk_secret:
+        logging.warning("CLERK_SECRET_KEY not set")
+        return None
+    from clerk_backend_api import Clerk
+    return Clerk(bearer_auth=clerk_secret)
+
+def create_razorpay_client():
+    import razorpay
+    return razorpay.Client(auth=(
+        os.environ.get('RAZORPAY_KEY_ID', ''),
+        os.environ.get('RAZORPAY_KEY_SECRET', '')
+    ))
+
+def create_cloudinary_uploader():
+    import cloudinary
+    import cloudinary.uploader
+    cloudinary.config(
+        cloud_name=os.environ.get('CLOUDINARY_CLOUD_NAME', 'dzlwzbwf2'),
+        api_key=os.environ.get('CLOUDINARY_API_KEY', ''),
+        api_secret=os.environ.get('CLOUDINARY_API_SECRET', '')
+    )
+    return cloudinary.uploader
+
+# Caller errors that should not trip a provider's circuit breaker. Resolved by the
+# SDK executor only once a call has failed, i.e. after the SDK was already imported.
+
+def clerk_caller_errors() -> tuple:
+    from clerk_backend_api.models import ClerkErrors
+    return (ClerkErrors,)
+
+def razorpay_caller_errors() -> tuple:
+    import razorpay.errors
+    return (razorpay.errors.BadRequestError,)
+
+def cloudinary_caller_errors() -> tuple:
+    import cloudinary.exceptions
+    return (cloudinary.exceptions.BadRequest,)
+
+def build_service_registry() -> ServiceRegistry:
+    services = ServiceRegistry()
+    services.register("clerk", create_clerk_client, lambda: bool(os.environ.get('CLERK_SECRET_KEY')))
+    services.register(
+        "razorpay",
+        create_razorpay_client,
+        lambda: bool(os.environ.get('RAZORPAY_KEY_ID') and os.environ.get('RAZORPAY_KEY_SECRET'))
+    )
+    services.register(
+        "cloudinary",
+        create_cloudinary_uploader,
+        lambda: bool(os.environ.get('CLOUDINARY_API_KEY') and os.environ.get('CLOUDINARY_API_SECRET'))
+    )
+    return services
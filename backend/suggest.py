@@ -0,0 +1,244 @@
+import asyncio
+import hashlib
+import heapq
+import json
+import re
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Typeahead over company names and slugs, topic names, alumni names and the
+# companies alumni work at. Every searchable key is kept in one sorted list of
+# (key, kind, id) tuples, so the matches for a prefix are the contiguous range
+# between two binary searches.
+
+SUGGEST_KINDS = ("company", "topic", "alumni", "alumni_company")
+MAX_SUGGESTIONS = 20
+
+# Matches start at any word, so "sachs" finds "Goldman Sachs"; labels longer
+# than this many words are only found from their first ones
+MAX_KEY_WORDS = 6
+
+RESULT_CACHE_SIZE = 4096
+
+WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation: "Société Générale" -> "societe generale" """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join(WORD_RE.findall(text))
+
+def _keys(label: str, slug: Optional[str] = None) -> Dict[str, int]:
+    """Searchable key -> position of its first word in the label (0 for the label start)"""
+    words = normalize(label).split()[:MAX_KEY_WORDS]
+    keys = {}
+    for position in range(len(words)):
+        keys.setdefault(" ".join(words[position:]), position)
+    if slug:
+        keys.setdefault(normalize(slug.replace("-", " ")), 0)
+    keys.pop("", None)
+    return keys
+
+def _entry(kind: str, doc_id: str, doc: dict) -> Optional[dict]:
+    """The public suggestion for a company, topic or alumni document; None when it has no name"""
+    if not doc.get('name'):
+        return None
+    entry = {"type": kind, "id": doc_id, "label": doc['name'], "weight": 0}
+    if kind == "company":
+        entry.update(slug=doc.get('slug'), weight=doc.get('question_count') or 0)
+    elif kind == "alumni":
+        entry["subtitle"] = doc.get('company')
+    return entry
+
+PROJECTIONS = {
+    "company": {"_id": 0, "id": 1, "name": 1, "slug": 1, "question_count": 1},
+    "topic": {"_id": 0, "id": 1, "name": 1},
+    "alumni": {"_id": 0, "id": 1, "name": 1, "company": 1},
+}
+COLLECTIONS = {"company": "companies", "topic": "topics", "alumni": "alumni"}
+
+def _encode(payload: dict) -> Tuple[str, bytes]:
+    """(ETag digest, body) with the same encoding as JSONResponse"""
+    body = json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(body, digest_size=12).hexdigest(), body
+
+class Suggester:
+    """
+    In-memory typeahead index, loaded from MongoDB on first use and reloaded
+    every ttl seconds. Admin writes in this process apply their documents
+    with apply() straight away; other workers see them on their next reload.
+    Encoded responses are cached until the index changes.
+    """
+    
+    def __init__(self, db, ttl: float = 300.0):
+        self.db = db
+        self.ttl = ttl
+        self._keys: List[Tuple[str, str, str]] = []
+        self._docs: Dict[Tuple[str, str], dict] = {}
+        self._entries: Dict[Tuple[str, str], dict] = {}
+        self._positions: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._alumni_companies: Dict[str, Dict[str, int]] = {}
+        self._results: "OrderedDict[tuple, Tuple[str, bytes]]" = OrderedDict()
+        self._expires = 0.0
+        self._lock = asyncio.Lock()
+        self.counters = {"hits": 0, "misses": 0, "reloads": 0, "updates": 0}
+    
+    # ----- maintaining the index -----
+    
+    def _index(self, ref: Tuple[str, str], entry: dict, keep_sorted: bool):
+        positions = _keys(entry['label'], entry.get('slug'))
+        self._entries[ref] = entry
+        self._positions[ref] = positions
+        for key in positions:
+            if keep_sorted:
+                insort(self._keys, (key, *ref))
+            else:
+                self._keys.append((key, *ref))
+    
+    def _unindex(self, ref: Tuple[str, str]):
+        self._entries.pop(ref, None)
+        for key in self._positions.pop(ref, ()):
+            index = bisect_left(self._keys, (key, *ref))
+            if index < len(self._keys) and self._keys[index] == (key, *ref):
+                del self._keys[index]
+    
+    def _add(self, kind: str, doc_id: str, doc: dict, keep_sorted: bool = True):
+        entry = _entry(kind, doc_id, doc)
+        if entry is None:
+            return
+        self._docs[(kind, doc_id)] = doc
+        self._index((kind, doc_id), entry, keep_sorted)
+        if kind == "alumni":
+            self._count_alumni_company(doc.get('company'), 1)
+            if keep_sorted:
+                self._index_alumni_company(normalize(doc.get('company')))
+    
+    def _remove(self, kind: str, doc_id: str) -> Optional[dict]:
+        doc = self._docs.pop((kind, doc_id), None)
+        if doc is None:
+            return None
+        self._unindex((kind, doc_id))
+        if kind == "alumni":
+            self._count_alumni_company(doc.get('company'), -1)
+            self._index_alumni_company(normalize(doc.get('company')))
+        return doc
+    
+    def _count_alumni_company(self, company: Optional[str], delta: int):
+        key = normalize(company)
+        if not key:
+            return
+        spellings = self._alumni_companies.setdefault(key, {})
+        spellings[company] = spellings.get(company, 0) + delta
+        if spellings[company] <= 0:
+            del spellings[company]
+    
+    def _index_alumni_company(self, key: str, keep_sorted: bool = True):
+        """Alumni companies are suggested by their most common spelling, weighted by alumni count"""
+        ref = ("alumni_company", key)
+        if ref in self._entries:
+            self._unindex(ref)
+        spellings = self._alumni_companies.get(key)
+        if not spellings:
+            self._alumni_companies.pop(key, None)
+            return
+        label = min(spellings, key=lambda spelling: (-spellings[spelling], spelling))
+        self._index(ref, {"type": "alumni_company", "id": key, "label": label, "weight": sum(spellings.values())}, keep_sorted)
+    
+    def apply(self, kind: str, changes: Iterable[Tuple[str, Optional[dict]]]):
+        """
+        Apply writes as (id, fields) pairs: fields are merged over what the index
+        holds for the document, None removes it.
+        """
+        for doc_id, fields in changes:
+            old = self._remove(kind, doc_id)
+            if fields is not None:
+                self._add(kind, doc_id, {**(old or {}), **fields})
+        self._results.clear()
+        self.counters["updates"] += 1
+    
+    async def reload(self):
+        """Rebuild the whole index from the database"""
+        loaded = {
+            kind: await self.db[collection].find({}, PROJECTIONS[kind]).to_list(None)
+            for kind, collection in COLLECTIONS.items()
+        }
+        self._keys, self._docs, self._entries, self._positions, self._alumni_companies = [], {}, {}, {}, {}
+        for kind, docs in loaded.items():
+            for doc in docs:
+                if doc.get('id'):
+                    self._add(kind, doc['id'], doc, keep_sorted=False)
+        for key in list(self._alumni_companies):
+            self._index_alumni_company(key, keep_sorted=False)
+        self._keys.sort()
+        self._results.clear()
+        self._expires = time.monotonic() + self.ttl
+        self.counters["reloads"] += 1
+    
+    async def _ensure_loaded(self):
+        if self._expires > time.monotonic():
+            return
+        async with self._lock:
+            if self._expires <= time.monotonic():
+                await self.reload()
+    
+    # ----- querying -----
+    
+    def lookup(self, query: str, kinds: Sequence[str] = SUGGEST_KINDS, limit: int = 8) -> List[dict]:
+        """
+        Ranked suggestions for a typed prefix: exact matches first, then matches at
+        the start of the label, then by weight (questions or alumni).
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        start = bisect_left(self._keys, (prefix,))
+        end = bisect_left(self._keys, (prefix + "\uffff",))
+        
+        # Smaller is better: exact match, match at the label start, weight, shorter, alphabetical
+        best: Dict[Tuple[str, str], tuple] = {}
+        for key, kind, doc_id in self._keys[start:end]:
+            if kind not in kinds:
+                continue
+            ref = (kind, doc_id)
+            entry = self._entries[ref]
+            rank = (key != prefix, self._positions[ref][key] > 0, -entry['weight'], len(entry['label']), entry['label'])
+            if ref not in best or rank < best[ref]:
+                best[ref] = rank
+        
+        return [
+            {k: v for k, v in self._entries[ref].items() if k != "weight" and v is not None}
+            for ref in heapq.nsmallest(limit, best, key=best.get)
+        ]
+    
+    async def suggest(self, query: str, kinds: Optional[Sequence[str]] = None, limit: int = 8) -> Tuple[str, bytes]:
+        """(ETag digest, encoded JSON body) for /api/suggest"""
+        kinds = tuple(sorted(set(kinds))) if kinds else SUGGEST_KINDS
+        unknown = [kind for kind in kinds if kind not in SUGGEST_KINDS]
+        if unknown:
+            raise ValueError(f"Unknown suggestion type '{unknown[0]}'; choose from {', '.join(SUGGEST_KINDS)}")
+        await self._ensure_loaded()
+        
+        cache_key = (normalize(query), kinds, limit)
+        cached = self._results.get(cache_key)
+        if cached is not None:
+            self._results.move_to_end(cache_key)
+            self.counters["hits"] += 1
+            return cached
+        self.counters["misses"] += 1
+        
+        response = _encode({"query": cache_key[0], "results": self.lookup(query, kinds, limit)})
+        self._results[cache_key] = response
+        if len(self._results) > RESULT_CACHE_SIZE:
+            self._results.popitem(last=False)
+        return response
+    
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "entries": len(self._entries),
+            "keys": len(self._keys),
+            "cached_responses": len(self._results)
+        }
@@ -0,0 +1,258 @@
+import asyncio
+import base64
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from rate_limiter import RateLimiter
+
+@dataclass
+class RateRule:
+    name: str
+    per_minute: int
+    burst: int
+    prefixes: Tuple[str, ...] = ()  # empty matches every path
+    
+    def matches(self, path: str) -> bool:
+        return not self.prefixes or path.startswith(self.prefixes)
+
+class _Buckets:
+    """Token buckets keyed by client, least recently seen evicted past max_keys"""
+    
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+    
+    def take(self, key: str, rate_per_second: float, capacity: int, cost: float = 1.0) -> float:
+        """Take tokens; returns 0 when admitted, otherwise seconds until enough have refilled"""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(capacity), now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate_per_second)
+            bucket[1] = now
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            return 0.0
+        return (cost - bucket[0]) / rate_per_second
+    
+    def __len__(self):
+        return len(self._buckets)
+
+def _token_subject(authorization: str) -> Optional[str]:
+    """The unverified 'sub' of a bearer JWT - only used to pick a bucket, never to authorize"""
+    if not authorization.startswith("Bearer "):
+        return None
+    try:
+        payload = authorization[7:].strip().split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        sub = claims.get("sub")
+        return sub if isinstance(sub, str) and sub else None
+    except Exception:
+        return None
+
+class TrafficGuard:
+    """
+    Per-client rate limiting and adaptive load shedding, decided in memory before
+    a request reaches any route (and so before any MongoDB work).
+    
+    Clients are identified by user (the bearer token's subject) when there is one,
+    by IP otherwise. Authenticated requests also draw from their IP's bucket with
+    ip_multiplier times the budget, so forged tokens cannot dodge the IP limit.
+    With trust_forwarded (only behind a proxy that appends to X-Forwarded-For),
+    the IP is the rightmost entry, the one that proxy added: entries to its left
+    come from the client and could be rotated to get fresh buckets.
+    client_ip_header names a header the proxy sets to the client address itself,
+    overwriting whatever the client sent (Vercel's x-real-ip); it takes precedence.
+    With shared_collection set, clients that pass the local bucket are also counted
+    in a per-minute MongoDB counter shared by every worker (one extra round trip).
+    
+    Shedding keeps an adaptive in-flight limit: while event-loop lag stays above
+    max_lag it shrinks multiplicatively down to min_in_flight, and it grows back by
+    one per healthy tick up to max_in_flight. Requests past the limit get a 503.
+    """
+    
+    def __init__(
+        self,
+        rules: Iterable[RateRule],
+        exempt_prefixes: Tuple[str, ...] = (),
+        ip_multiplier: int = 5,
+        trust_forwarded: bool = False,
+        client_ip_header: Optional[str] = None,
+        max_in_flight: int = 200,
+        min_in_flight: int = 10,
+        max_lag: float = 0.2,
+        lag_interval: float = 0.25,
+        max_keys: int = 100000,
+        shared_collection=None
+    ):
+        self.rules = list(rules)
+        self.exempt_prefixes = exempt_prefixes
+        self.ip_multiplier = ip_multiplier
+        self.trust_forwarded = trust_forwarded
+        self.client_ip_header = client_ip_header.lower().encode("latin-1") if client_ip_header else None
+        self.max_in_flight = max_in_flight
+        self.min_in_flight = min_in_flight
+        self.max_lag = max_lag
+        self.lag_interval = lag_interval
+        self._buckets = _Buckets(max_keys)
+        self._shared: Dict[str, RateLimiter] = {}
+        if shared_collection is not None:
+            for rule in self.rules:
+                self._shared[rule.name] = RateLimiter(shared_collection, f"traffic_{rule.name}", rule.per_minute, 60)
+        
+        self.in_flight = 0
+        self.in_flight_limit = float(max_in_flight)
+        self.loop_lag = 0.0
+        self.counters = {"admitted": 0, "rate_limited": 0, "shed": 0}
+        self._monitor: Optional[asyncio.Task] = None
+    
+    # ----- event-loop lag -----
+    
+    def _ensure_monitor(self):
+        if self._monitor is None or self._monitor.done():
+            self._monitor = asyncio.get_running_loop().create_task(self._watch_loop_lag())
+    
+    async def _watch_loop_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            lag = max(0.0, loop.time() - started - self.lag_interval)
+            self.loop_lag = 0.7 * self.loop_lag + 0.3 * lag
+            if self.loop_lag > self.max_lag:
+                self.in_flight_limit = max(self.min_in_flight, self.in_flight_limit * 0.8)
+            else:
+                self.in_flight_limit = min(self.max_in_flight, self.in_flight_limit + 1)
+    
+    async def stop(self):
+        if self._monitor is not None:
+            self._monitor.cancel()
+            try:
+                await self._monitor
+            except asyncio.CancelledError:
+                pass
+            self._monitor = None
+    
+    # ----- admission -----
+    
+    def client_ip(self, scope) -> str:
+        if self.client_ip_header:
+            for name, value in scope.get("headers", ()):
+                if name == self.client_ip_header and value.strip():
+                    return value.decode("latin-1").strip()
+        if self.trust_forwarded:
+            forwarded = [value for name, value in scope.get("headers", ()) if name == b"x-forwarded-for"]
+            if forwarded:
+                hop = forwarded[-1].decode("latin-1").split(",")[-1].strip()
+                if hop:
+                    return hop
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+    
+    def _rule(self, path: str) -> Optional[RateRule]:
+        for rule in self.rules:
+            if rule.matches(path):
+                return rule
+        return None
+    
+    async def admit(self, scope) -> Optional[Tuple[int, str, int]]:
+        """None to let the request through, else (status, detail, retry_after)"""
+        path = scope.get("path", "")
+        if path.startswith(self.exempt_prefixes):
+            return None
+        
+        if self.in_flight >= self.in_flight_limit:
+            self.counters["shed"] += 1
+            return 503, "Server is busy, please retry shortly", 1
+        
+        rule = self._rule(path)
+        if rule is None:
+            return None
+        
+        ip = self.client_ip(scope)
+        authorization = ""
+        for name, value in scope.get("headers", ()):
+            if name == b"authorization":
+                authorization = value.decode("latin-1")
+                break
+        subject = _token_subject(authorization)
+        
+        rate = rule.per_minute / 60.0
+        if subject:
+            wait = self._buckets.take(f"{rule.name}:user:{subject}", rate, rule.burst)
+            if not wait:
+                wait = self._buckets.take(
+                    f"{rule.name}:ip-auth:{ip}", rate * self.ip_multiplier, rule.burst * self.ip_multiplier
+                )
+            client = f"user:{subject}"
+        else:
+            wait = self._buckets.take(f"{rule.name}:ip:{ip}", rate, rule.burst)
+            client = f"ip:{ip}"
+        
+        if not wait and rule.name in self._shared:
+            try:
+                reservation = await self._shared[rule.name].reserve(client)
+                if not reservation.allowed:
+                    wait = reservation.retry_after
+            except Exception as e:
+                # The shared counter is an extra; never fail requests because it is unavailable
+                logging.warning(f"Shared traffic counter unavailable: {e}")
+        
+        if wait:
+            self.counters["rate_limited"] += 1
+            return 429, "Too many requests", max(1, int(wait + 0.999))
+        return None
+    
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "in_flight": self.in_flight,
+            "in_flight_limit": int(self.in_flight_limit),
+            "loop_lag_ms": round(self.loop_lag * 1000, 2),
+            "tracked_clients": len(self._buckets)
+        }
+
+class TrafficGuardMiddleware:
+    """ASGI middleware answering rejected requests itself, without entering the app"""
+    
+    def __init__(self, app, guard: TrafficGuard):
+        self.app = app
+        self.guard = guard
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        guard = self.guard
+        guard._ensure_monitor()
+        rejection = await guard.admit(scope)
+        if rejection:
+            status, detail, retry_after = rejection
+            body = json.dumps({"detail": detail}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(retry_after).encode())
+                ]
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+        
+        guard.counters["admitted"] += 1
+        guard.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            guard.in_flight -= 1
@@ -238,7 +238,7 @@ const AdminPanel = () => {
 
               <TabsContent value="questions">
                 <TopicQuestionsManager 
-                  questions={questions.filter(q => q.topic_id && !q.company_id)} 
+                  questions={questions.filter(q => q.topic_id && !q.company_ids?.length)} 
                   topics={topics}
                   fetchAllData={fetchAllData} 
                   getAuthConfig={getAuthConfig}
@@ -251,7 +251,7 @@ const AdminPanel = () => {
 
               <TabsContent value="company-questions">
                 <CompanyQuestionsManager 
-                  questions={questions.filter(q => q.company_id)} 
+                  questions={questions.filter(q => q.company_ids?.length)} 
                   companies={companies}
                   fetchAllData={fetchAllData} 
                   getAuthConfig={getAuthConfig}
@@ -404,7 +404,7 @@ const TopicQuestionsManager = ({ questions, topics, fetchAllData, getAuthConfig
     answer: '',
     difficulty: 'medium',
     topic_id: '',
-    company_id: null,
+    company_ids: [],
     category: null,
     tags: []
   });
@@ -412,7 +412,7 @@ const TopicQuestionsManager = ({ questions, topics, fetchAllData, getAuthConfig
   const handleSubmit = async (e) => {
     e.preventDefault();
     try {
-      const data = { ...formData, company_id: null, category: null };
+      const data = { ...formData, company_ids: [], category: null };
       if (editing) {
         await axios.put(`${API}/admin/questions/${editing.id}`, { ...editing, ...data }, await getAuthConfig());
         toast.success('Question updated');
@@ -435,7 +435,7 @@ const TopicQuestionsManager = ({ questions, topics, fetchAllData, getAuthConfig
       answer: '',
       difficulty: 'medium',
       topic_id: '',
-      company_id: null,
+      company_ids: [],
       category: null,
       tags: []
     });
@@ -559,7 +559,7 @@ const TopicQuestionsManager = ({ questions, topics, fetchAllData, getAuthConfig
                 </div>
               </div>
               <div className="flex gap-2">
-                <Button variant="ghost" size="sm" onClick={() => { setEditing(q); setFormData({...q, tags: q.tags || [], topic_id: q.topic_id || '', company_id: null, category: null}); setOpen(true); }}>
+                <Button variant="ghost" size="sm" onClick={() => { setEditing(q); setFormData({...q, tags: q.tags || [], topic_id: q.topic_id || '', company_ids: [], category: null}); setOpen(true); }}>
                   <Edit className="h-4 w-4" />
                 </Button>
                 <Button variant="ghost" size="sm" onClick={() => handleDelete(q.id)}>
@@ -595,9 +595,7 @@ const CompanyQuestionsManager = ({ questions, companies, fetchAllData, getAuthCo
     try {
       const data = { ...formData, topic_id: null };
       if (editing) {
-        const updateData = { ...editing, ...data, company_id: data.company_ids[0] || '' };
-        delete updateData.company_ids;
-        await axios.put(`${API}/admin/questions/${editing.id}`, updateData, await getAuthConfig());
+        await axios.put(`${API}/admin/questions/${editing.id}`, { ...editing, ...data }, await getAuthConfig());
         toast.success('Question updated');
       } else {
         await axios.post(`${API}/admin/questions`, data, await getAuthConfig());
@@ -643,7 +641,7 @@ const CompanyQuestionsManager = ({ questions, companies, fetchAllData, getAuthCo
 
   const filteredQuestions = questions.filter(q => {
     // Filter by company
-    if (selectedCompany !== 'all' && q.company_id !== selectedCompany) return false;
+    if (selectedCompany !== 'all' && !q.company_ids?.includes(selectedCompany)) return false;
     
     // Filter by search
     if (searchTerm && !q.question.toLowerCase().includes(searchTerm.toLowerCase())) return false;
@@ -716,32 +714,26 @@ const CompanyQuestionsManager = ({ questions, companies, fetchAllData, getAuthCo
                 </div>
               </div>
               <div>
-                <Label>Companies {editing ? '(cannot change when editing)' : `(${formData.company_ids.length} selected)`}</Label>
-                {editing ? (
-                  <div className="p-2 border rounded bg-gray-50 text-gray-600">
-                    {getCompanyName(editing.company_id)}
-                  </div>
-                ) : (
-                  <div className="border rounded p-3 max-h-48 overflow-y-auto space-y-2">
-                    {companies.map(company => (
-                      <label key={company.id} className="flex items-center space-x-2 cursor-pointer hover:bg-gray-50 p-1 rounded">
-                        <input
-                          type="checkbox"
-                          checked={formData.company_ids.includes(company.id)}
-                          onChange={(e) => {
-                            if (e.target.checked) {
-                              setFormData({...formData, company_ids: [...formData.company_ids, company.id]});
-                            } else {
-                              setFormData({...formData, company_ids: formData.company_ids.filter(id => id !== company.id)});
-                            }
-                          }}
-                          className="w-4 h-4"
-                        />
-                        <span>{company.name}</span>
-                      </label>
-                    ))}
-                  </div>
-                )}
+                <Label>Companies ({formData.company_ids.length} selected)</Label>
+                <div className="border rounded p-3 max-h-48 overflow-y-auto space-y-2">
+                  {companies.map(company => (
+                    <label key={company.id} className="flex items-center space-x-2 cursor-pointer hover:bg-gray-50 p-1 rounded">
+                      <input
+                        type="checkbox"
+                        checked={formData.company_ids.includes(company.id)}
+                        onChange={(e) => {
+                          if (e.target.checked) {
+                            setFormData({...formData, company_ids: [...formData.company_ids, company.id]});
+                          } else {
+                            setFormData({...formData, company_ids: formData.company_ids.filter(id => id !== company.id)});
+                          }
+                        }}
+                        className="w-4 h-4"
+                      />
+                      <span>{company.name}</span>
+                    </label>
+                  ))}
+                </div>
               </div>
               <div>
                 <Label>Tags (comma-separated: v.imp, just-read, fav)</Label>
@@ -791,9 +783,11 @@ const CompanyQuestionsManager = ({ questions, companies, fetchAllData, getAuthCo
             <div key={q.id} className="border border-gray-200 p-4 flex justify-between items-start">
               <div className="flex-1">
                 <div className="flex items-center gap-2 mb-2">
-                  <Badge className="bg-yellow-100 text-yellow-800">
-                    {getCompanyName(q.company_id)}
-                  </Badge>
+                  {q.company_ids?.map(companyId => (
+                    <Badge key={companyId} className="bg-yellow-100 text-yellow-800">
+                      {getCompanyName(companyId)}
+                    </Badge>
+                  ))}
                   {q.category && <Badge className="bg-purple-100 text-purple-800">{q.category}</Badge>}
                 </div>
                 <p className="font-medium text-gray-900 mb-1">{q.question}</p>
@@ -803,7 +797,7 @@ const CompanyQuestionsManager = ({ questions, companies, fetchAllData, getAuthCo
                 </div>
               </div>
               <div className="flex gap-2">
-                <Button variant="ghost" size="sm" onClick={() => { setEditing(q); setFormData({...q, tags: q.tags || [], topic_id: null, company_ids: q.company_id ? [q.company_id] : [], category: q.category || ''}); setOpen(true); }}>
+                <Button variant="ghost" size="sm" onClick={() => { setEditing(q); setFormData({...q, tags: q.tags || [], topic_id: null, company_ids: q.company_ids || [], category: q.category || ''}); setOpen(true); }}>
                   <Edit className="h-4 w-4" />
                 </Button>
                 <Button variant="ghost" size="sm" onClick={() => handleDelete(q.id)}>
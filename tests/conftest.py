@@ -0,0 +1,14 @@
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# app.db reads these at import time; the Motor client connects lazily,
+# so importing it for unit tests does not need a running MongoDB. With
+# TEST_MONGO_URL set, endpoint tests reach that server through app.db
+os.environ.setdefault("MONGO_URL", os.environ.get("TEST_MONGO_URL", "mongodb://localhost:27017"))
+os.environ.setdefault("DB_NAME", "igp_test")
+# Endpoints that exceed their @query_budget fail instead of only being logged
+os.environ.setdefault("ENFORCE_QUERY_BUDGETS", "true")
@@ -0,0 +1,124 @@
+import asyncio
+import os
+import time
+import uuid
+
+import pytest
+from pymongo import UpdateOne
+
+from bulk_admin import BulkOperation, company_count_deltas, plan_bulk, question_side_effects
+from app.models import Alumni, Question
+
+BATCH_SIZE = 1000
+
+def make_questions(n, company_ids=("c1", "c2")):
+    return {
+        f"q{i}": Question(
+            id=f"q{i}",
+            question=f"Question {i}",
+            answer=f"Answer {i}",
+            difficulty="easy",
+            company_id=company_ids[i % len(company_ids)]
+        ).model_dump()
+        for i in range(n)
+    }
+
+def test_operations_on_same_document_fold_into_one_write():
+    existing = make_questions(1)
+    plan = plan_bulk([
+        BulkOperation(op="update", id="q0", data={"difficulty": "hard"}),
+        BulkOperation(op="update", id="q0", data={"answer": "Better answer"}),
+    ], existing, Question)
+    
+    assert len(plan.requests) == 1
+    assert plan.updated == 1
+    assert plan.requests[0] == UpdateOne({"id": "q0"}, {"$set": {"difficulty": "hard", "answer": "Better answer"}})
+
+def test_update_after_delete_is_rejected():
+    existing = make_questions(1)
+    plan = plan_bulk([
+        BulkOperation(op="delete", id="q0"),
+        BulkOperation(op="update", id="q0", data={"difficulty": "hard"}),
+    ], existing, Question)
+    
+    assert plan.deleted == 1
+    assert plan.errors == [{"index": 1, "id": "q0", "error": "Not found"}]
+
+def test_invalid_and_missing_documents_are_reported_per_operation():
+    existing = {"a1": Alumni(id="a1", name="A", email="a@x.com", role="SDE", company="X").model_dump()}
+    plan = plan_bulk([
+        BulkOperation(op="update", id="a1", data={"graduation_year": "not a year"}),
+        BulkOperation(op="delete", id="missing"),
+    ], existing, Alumni)
+    
+    assert not plan.requests
+    assert [e["index"] for e in plan.errors] == [0, 1]
+    assert "graduation_year" in plan.errors[0]["error"]
+
+def test_question_side_effects_are_deduplicated():
+    existing = make_questions(BATCH_SIZE)
+    operations = [
+        BulkOperation(op="update", id=doc_id, data={"company_ids": ["c3"]}) if i % 2 else BulkOperation(op="delete", id=doc_id)
+        for i, doc_id in enumerate(existing)
+    ]
+    plan = plan_bulk(operations, existing, Question)
+    deltas, patterns = question_side_effects(plan.changes)
+    
+    assert len(plan.requests) == BATCH_SIZE
+    assert sum(deltas.values()) == -BATCH_SIZE // 2
+    assert deltas["c3"] == BATCH_SIZE // 2
+    assert len(patterns) == len(set(patterns))
+    assert patterns.count("companies*") == 1
+
+def test_shared_questions_count_once_per_company():
+    legacy = Question(question="Q", answer="A", difficulty="easy", company_id="c1")
+    shared = Question(question="Q", answer="A", difficulty="easy", company_ids=["c1", "c2", "c1"])
+    assert legacy.company_ids == ["c1"] and shared.company_ids == ["c1", "c2"]
+    
+    deltas = company_count_deltas([
+        (None, shared.model_dump()),
+        ({"company_ids": ["c1", "c2"]}, {"company_ids": ["c2", "c3"]}),
+        ({"company_ids": ["c4"]}, None),
+    ])
+    assert {c: d for c, d in deltas.items() if d} == {"c2": 1, "c3": 1, "c4": -1}
+
+def test_plan_1000_item_batch_timing():
+    existing = make_questions(BATCH_SIZE)
+    operations = [
+        BulkOperation(op="update", id=doc_id, data={"difficulty": "medium", "tags": ["bulk"]})
+        for doc_id in existing
+    ]
+    
+    start = time.perf_counter()
+    plan = plan_bulk(operations, existing, Question)
+    question_side_effects(plan.changes)
+    elapsed = time.perf_counter() - start
+    
+    assert plan.updated == BATCH_SIZE
+    assert elapsed < 0.5, f"planning {BATCH_SIZE} operations took {elapsed:.3f}s"
+
+@pytest.mark.skipif(not os.environ.get("TEST_MONGO_URL"), reason="TEST_MONGO_URL not set")
+def test_bulk_write_1000_item_batch_timing():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    
+    async def run():
+        client = AsyncIOMotorClient(os.environ["TEST_MONGO_URL"])
+        db = client[f"igp_bulk_{uuid.uuid4().hex[:8]}"]
+        try:
+            existing = make_questions(BATCH_SIZE)
+            await db.questions.insert_many([dict(d) for d in existing.values()])
+            operations = [BulkOperation(op="update", id=doc_id, data={"difficulty": "hard"}) for doc_id in existing]
+            
+            start = time.perf_counter()
+            docs = await db.questions.find({"id": {"$in": list(existing)}}, {"_id": 0}).to_list(None)
+            plan = plan_bulk(operations, {d["id"]: d for d in docs}, Question)
+            result = await db.questions.bulk_write(plan.requests, ordered=False)
+            elapsed = time.perf_counter() - start
+            
+            assert result.modified_count == BATCH_SIZE
+            assert elapsed < 2.0, f"bulk update of {BATCH_SIZE} questions took {elapsed:.3f}s"
+        finally:
+            await client.drop_database(db.name)
+            client.close()
+    
+    asyncio.run(run())
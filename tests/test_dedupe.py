@@ -0,0 +1,86 @@
+from minhash import BANDS, estimated_jaccard, signature
+from dedupe import exact_copies, fold_duplicates, jaccard, plan_merge, same_bank, same_home, shingles, text_band_keys
+
+ORIGINAL = "Explain how you would design a rate limiter for a public API serving millions of requests per day"
+REPHRASED = "Explain how you would design a rate limiter for a public API serving millions of requests per day?"
+EDITED = "Explain how you would design a rate limiter for a public API serving millions of requests per day in production"
+UNRELATED = "What is the difference between a process and a thread in an operating system"
+
+def test_shingles_ignore_case_and_punctuation():
+    assert shingles("Reverse a Linked-List!") == {"reverse a linked", "a linked list"}
+    assert shingles("Hi") == {"hi"}
+    assert shingles("") == set()
+    assert jaccard(shingles(ORIGINAL), shingles(REPHRASED)) == 1.0
+
+def test_band_keys_are_deterministic():
+    keys = text_band_keys(ORIGINAL)
+    assert len(keys) == BANDS
+    assert keys == text_band_keys(REPHRASED)
+    assert text_band_keys("   ") == []
+
+def test_near_duplicates_share_a_band_and_unrelated_text_does_not():
+    assert jaccard(shingles(ORIGINAL), shingles(EDITED)) >= 0.8
+    assert set(text_band_keys(ORIGINAL)) & set(text_band_keys(EDITED))
+    assert jaccard(shingles(ORIGINAL), shingles(UNRELATED)) == 0.0
+    assert not set(text_band_keys(ORIGINAL)) & set(text_band_keys(UNRELATED))
+
+def test_signatures_estimate_jaccard():
+    original, edited = shingles(ORIGINAL), shingles(EDITED)
+    assert abs(estimated_jaccard(signature(original), signature(edited)) - jaccard(original, edited)) < 0.15
+    assert signature(set()) == [] and estimated_jaccard([], []) == 0.0
+
+def test_same_home_needs_a_shared_company_or_both_in_the_topic_bank():
+    assert same_home({"company_ids": ["c1", "c2"]}, {"company_ids": ["c2"]})
+    assert not same_home({"company_ids": ["c1"]}, {"company_ids": ["c2"]})
+    assert not same_home({"company_ids": []}, {"company_ids": ["c2"]})
+    assert same_home({"company_ids": []}, {})
+
+def test_fold_duplicates_into_earlier_rows_and_stored_questions():
+    docs = [
+        {"id": "n1", "company_ids": ["c1"]},
+        {"id": "n2", "company_ids": ["c2"]},
+        {"id": "n3", "company_ids": ["c3"]},
+        {"id": "n4", "company_ids": ["c4"]},
+    ]
+    duplicates = [[], [{"id": "n1"}], [{"id": "n2"}], [{"id": "s1"}, {"id": "n1"}]]
+    kept, rows, merges, folded = fold_duplicates(docs, [1, 2, 3, 4], duplicates)
+    
+    assert [doc["id"] for doc in kept] == ["n1"] and rows == [1]
+    assert kept[0]["company_ids"] == ["c1", "c2", "c3"]
+    assert merges == {"s1": ["c4"]} and folded == 3
+
+def test_questions_only_fold_into_their_own_bank():
+    assert same_bank({"company_ids": ["c1"]}, {"company_ids": ["c2"], "topic_id": None})
+    assert same_bank({"topic_id": "db"}, {"topic_id": "db", "company_ids": []})
+    assert not same_bank({"company_ids": ["c1"]}, {"topic_id": "db"})
+    assert not same_bank({"topic_id": "db"}, {"company_ids": ["c2"]})
+    
+    docs = [{"id": "n1", "company_ids": [], "topic_id": "db"}, {"id": "n2", "company_ids": ["c1"]}]
+    duplicates = [[{"id": "s1", "company_ids": ["c9"]}], [{"id": "s2", "topic_id": "db"}, {"id": "s3", "company_ids": ["c2"]}]]
+    kept, rows, merges, folded = fold_duplicates(docs, [1, 2], duplicates)
+    
+    assert [doc["id"] for doc in kept] == ["n1"] and rows == [1]
+    assert merges == {"s3": ["c1"]} and folded == 1
+
+def test_only_exact_copies_in_one_bank_are_merged():
+    copy = {"question": "Design a URL shortener", "answer": "Hash ids", "category": "system-design", "difficulty": "medium"}
+    group = {"questions": [
+        {**copy, "id": "a", "company_ids": ["c1"]},
+        {**copy, "id": "b", "company_ids": ["c2"], "question": "design a  URL shortener "},
+        {**copy, "id": "c", "company_ids": ["c3"], "answer": "Use a counter"},
+        {**copy, "id": "d", "company_ids": [], "topic_id": "system-design"},
+        {**copy, "id": "e", "company_ids": ["c4"], "difficulty": "hard"},
+    ]}
+    
+    assert [[doc["id"] for doc in members] for members in exact_copies(group)] == [["a", "b"]]
+
+def test_plan_merge_keeps_the_oldest_question_with_every_company():
+    members = [
+        {"id": "b", "created_at": "2025-02-01", "company_ids": ["c2"], "tags": ["sql"]},
+        {"id": "a", "created_at": "2025-01-01", "company_ids": ["c1"], "tags": []},
+        {"id": "c", "created_at": "2025-03-01", "company_ids": ["c1", "c3"], "tags": ["sql", "joins"]},
+    ]
+    survivor, fields, removed = plan_merge(members)
+    
+    assert survivor == "a" and removed == ["b", "c"]
+    assert fields == {"company_ids": ["c1", "c2", "c3"], "tags": ["sql", "joins"]}
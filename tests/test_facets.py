@@ -0,0 +1,56 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from facets import FacetService, apply_facet_deltas, facet_deltas, rebuild_facets
+
+def test_deltas_move_counts_between_values():
+    deltas = facet_deltas("alumni", [
+        (None, {"company": "Google", "role": "SDE", "location": "", "graduation_year": 2022}),
+        ({"company": "Google", "role": "SDE"}, {"company": "Amazon", "role": "SDE"}),
+        ({"company": "Amazon", "role": "PM", "location": "Delhi"}, None),
+    ])
+    
+    # Google and Amazon each come and go again, so they net out and are left untouched
+    assert deltas == {("role", "SDE"): 1, ("graduation_year", 2022): 1, ("role", "PM"): -1, ("location", "Delhi"): -1}
+
+@pytest.mark.skipif(not os.environ.get("TEST_MONGO_URL"), reason="TEST_MONGO_URL not set")
+def test_incremental_counts_match_a_full_recount():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    
+    async def run():
+        client = AsyncIOMotorClient(os.environ["TEST_MONGO_URL"])
+        db = client[f"igp_facets_{uuid.uuid4().hex[:8]}"]
+        service = FacetService(db)
+        try:
+            docs = [
+                {"id": "a1", "company": "Google", "role": "SDE", "graduation_year": 2022},
+                {"id": "a2", "company": "Google", "role": "PM", "graduation_year": 2023},
+                {"id": "a3", "company": "Amazon", "role": "SDE"},
+            ]
+            await db.alumni.insert_many([dict(d) for d in docs])
+            await apply_facet_deltas(db, "alumni", facet_deltas("alumni", [(None, d) for d in docs]))
+            
+            moved = {**docs[1], "company": "Amazon"}
+            await db.alumni.replace_one({"id": "a2"}, moved)
+            await db.alumni.delete_one({"id": "a1"})
+            await apply_facet_deltas(db, "alumni", facet_deltas("alumni", [(docs[1], moved), (docs[0], None)]))
+            
+            incremental = await service.get("alumni")
+            assert incremental["company"] == [{"value": "Amazon", "count": 2}]
+            # Ties are ordered by value
+            assert await service.get("alumni", "role", limit=1) == {"role": [{"value": "PM", "count": 1}]}
+            
+            await rebuild_facets(db, "alumni")
+            service.invalidate("alumni")
+            assert await service.get("alumni") == incremental
+            
+            with pytest.raises(ValueError):
+                await service.get("alumni", "email")
+        finally:
+            await client.drop_database(db.name)
+            client.close()
+    
+    asyncio.run(run())
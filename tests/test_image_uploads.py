@@ -0,0 +1,64 @@
+import asyncio
+import io
+import os
+
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from image_uploads import LocalImageStore, UploadTooLargeError, spool_upload, store_image
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image
+
+class MemoryUploads:
+    """Just enough of a Motor collection for store_image"""
+    
+    def __init__(self):
+        self.docs = {}
+    
+    async def find_one(self, query, projection=None):
+        return self.docs.get(query["sha256"])
+    
+    async def update_one(self, query, update, upsert=False):
+        self.docs.setdefault(query["sha256"], update["$setOnInsert"])
+
+def png_upload(size=(2000, 1000), color=(200, 30, 30), filename="logo.png"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    buffer.seek(0)
+    return UploadFile(file=buffer, filename=filename, headers=Headers({"content-type": "image/png"}))
+
+def test_spool_rejects_oversized_upload_early():
+    upload = UploadFile(file=io.BytesIO(b"x" * 5000), filename="big.bin")
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(spool_upload(upload, max_bytes=1000, chunk_size=256))
+    # Stopped at the first chunk past the limit, not at end of file
+    assert upload.file.tell() < 5000
+
+def test_store_image_downscales_to_webp(tmp_path):
+    store = LocalImageStore(str(tmp_path), "/uploads")
+    result = asyncio.run(store_image(png_upload(), store, MemoryUploads()))
+    
+    assert result["url"].startswith("/uploads/") and result["url"].endswith(".webp")
+    with Image.open(tmp_path / os.path.basename(result["url"])) as stored:
+        assert stored.format == "WEBP"
+        assert max(stored.size) == 1024
+
+def test_duplicate_images_are_uploaded_once(tmp_path):
+    store = LocalImageStore(str(tmp_path), "/uploads")
+    uploads = MemoryUploads()
+    
+    first = asyncio.run(store_image(png_upload(filename="a.png"), store, uploads))
+    second = asyncio.run(store_image(png_upload(filename="b.png"), store, uploads))
+    
+    assert not first["deduplicated"] and second["deduplicated"]
+    assert first["url"] == second["url"]
+    assert len(list(tmp_path.iterdir())) == 1
+
+def test_non_raster_files_pass_through_unchanged(tmp_path):
+    svg = b'<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"/>'
+    upload = UploadFile(file=io.BytesIO(svg), filename="logo.svg", headers=Headers({"content-type": "image/svg+xml"}))
+    result = asyncio.run(store_image(upload, LocalImageStore(str(tmp_path)), MemoryUploads()))
+    
+    assert result["url"].endswith(".svg")
+    assert (tmp_path / os.path.basename(result["url"])).read_bytes() == svg
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+# Cumulative `import server` time, measured with -X importtime. Generous enough for
+# slow CI machines; the SDK checks below are what catch an eager import
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "2500"))
+
+HEAVY_SDKS = ("razorpay", "cloudinary", "clerk_backend_api", "google.generativeai")
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "MONGO_URL": "mongodb://localhost:27017", "DB_NAME": "igp_test"}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120
+    )
+
+def test_server_import_time_within_budget():
+    result = run_python("import server", "-X", "importtime")
+    assert result.returncode == 0, result.stderr[-2000:]
+    
+    timings = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                timings[name.strip()] = int(cumulative) / 1000
+    
+    assert "server" in timings
+    assert timings["server"] < IMPORT_BUDGET_MS, f"import server took {timings['server']:.0f} ms"
+    eager = [name for name in timings if any(name == sdk or name.startswith(sdk + ".") for sdk in HEAVY_SDKS)]
+    assert not eager, f"imported at startup: {eager}"
+
+def test_public_reads_do_not_load_payment_or_ai_sdks():
+    script = textwrap.dedent(f"""
+        import sys
+        from fastapi.testclient import TestClient
+        import server
+        from app.routers import content
+        
+        async def cached(key):
+            return [{{"id": "t1", "name": "Arrays"}}] if key == "topics" else None
+        content.get_cached_data = cached
+        
+        client = TestClient(server.app)
+        assert client.get("/api/topics").status_code == 200
+        assert client.get("/robots.txt").status_code == 200
+        print(",".join(m for m in {HEAVY_SDKS!r} if m in sys.modules))
+    """)
+    result = run_python(script)
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert result.stdout.strip().splitlines()[-1:] in ([], [""])
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import os
+import uuid
+
+import pytest
+
+from interview_generation import FakeInterviewModel, build_prompt, parse_questions, set_model_backend
+from job_queue import JobQueue
+from app.models import ProjectInterviewRequest
+from app.routers import project_interview
+
+PROJECT = dict(
+    project_title="Todo app",
+    tech_stack=["React", "Node"],
+    project_description="A todo list",
+    features_implemented="CRUD, auth",
+    student_role="Full Stack"
+)
+
+@pytest.fixture
+def fake_model():
+    set_model_backend(FakeInterviewModel())
+    yield
+    set_model_backend(None)
+
+def test_fake_model_is_deterministic():
+    prompt = build_prompt(**PROJECT)
+    model = FakeInterviewModel()
+    assert model.generate(prompt) == model.generate(prompt)
+    assert model.generate(prompt) != model.generate(build_prompt(**{**PROJECT, "project_title": "Chat app"}))
+
+def test_parse_questions_strips_code_fences():
+    body = FakeInterviewModel().generate("x")
+    assert parse_questions(f"```json\n{body}\n```") == json.loads(body)
+
+def test_parse_questions_rejects_incomplete_structure():
+    with pytest.raises(ValueError):
+        parse_questions('{"easy_questions": []}')
+
+def test_generate_interview_questions_uses_fake_backend(fake_model):
+    request = ProjectInterviewRequest(**PROJECT)
+    questions = asyncio.run(project_interview.generate_interview_questions(request))
+    
+    assert [len(questions[level]) for level in ("easy_questions", "medium_questions", "hard_questions")] == [5, 5, 5]
+    assert questions["hard_questions"][0]["difficulty"] == "hard"
+
+@pytest.mark.skipif(not os.environ.get("TEST_MONGO_URL"), reason="TEST_MONGO_URL not set")
+def test_job_queue_runs_and_retries_jobs():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    
+    async def run():
+        client = AsyncIOMotorClient(os.environ["TEST_MONGO_URL"])
+        db = client[f"igp_jobs_{uuid.uuid4().hex[:8]}"]
+        calls = []
+        
+        async def handler(job):
+            calls.append(job["id"])
+            if job["payload"].get("flaky") and job["attempts"] == 1:
+                raise RuntimeError("transient")
+            return {"echo": job["payload"]}
+        
+        queue = JobQueue(db.jobs, handler, concurrency=2, poll_interval=0.05, max_attempts=2)
+        queue.start()
+        try:
+            ok = await queue.submit({"n": 1})
+            flaky = await queue.submit({"flaky": True})
+            for _ in range(100):
+                jobs = [await queue.get(ok["id"]), await queue.get(flaky["id"])]
+                if all(j["status"] == "completed" for j in jobs):
+                    break
+                await asyncio.sleep(0.05)
+            assert [j["status"] for j in jobs] == ["completed", "completed"]
+            assert jobs[1]["attempts"] == 2
+        finally:
+            await queue.stop()
+            await client.drop_database(db.name)
+            client.close()
+    
+    asyncio.run(run())
+
+@pytest.mark.skipif(not os.environ.get("TEST_MONGO_URL"), reason="TEST_MONGO_URL not set")
+def test_job_queue_fails_jobs_whose_worker_died_on_the_last_attempt():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    
+    async def run():
+        client = AsyncIOMotorClient(os.environ["TEST_MONGO_URL"])
+        db = client[f"igp_jobs_{uuid.uuid4().hex[:8]}"]
+        calls, failures = [], []
+        
+        async def handler(job):
+            calls.append(job["id"])
+            return {}
+        
+        async def on_failure(job, error):
+            failures.append(job["id"])
+        
+        queue = JobQueue(db.jobs, handler, poll_interval=0.05, max_attempts=2, on_failure=on_failure)
+        try:
+            retried = await queue.submit({"n": 1}, status="running", attempts=1, lease_expires_at="2000-01-01T00:00:00+00:00")
+            exhausted = await queue.submit({"n": 2}, status="running", attempts=2, lease_expires_at="2000-01-01T00:00:00+00:00")
+            queue.start()
+            for _ in range(100):
+                jobs = [await queue.get(retried["id"]), await queue.get(exhausted["id"])]
+                if jobs[0]["status"] == "completed" and jobs[1]["status"] == "failed":
+                    break
+                await asyncio.sleep(0.05)
+            assert [j["status"] for j in jobs] == ["completed", "failed"]
+            assert calls == [retried["id"]] and failures == [exhausted["id"]]
+        finally:
+            await queue.stop()
+            await client.drop_database(db.name)
+            client.close()
+    
+    asyncio.run(run())
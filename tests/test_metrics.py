@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from metrics import Collected, Histogram, HttpMetrics, MetricsMiddleware, MetricsRegistry, MongoCommandMetrics
+
+def test_histogram_renders_cumulative_buckets_and_estimates_quantiles():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.05, 0.5, 2.0):
+        histogram.observe(("/a",), value)
+    text = MetricsRegistry([histogram]).render()
+    
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 3' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{route="/a"} 4' in text
+    [series] = histogram.snapshot()
+    assert series["count"] == 4 and series["p50_ms"] == 100.0
+
+def test_middleware_labels_requests_by_route_template():
+    http_metrics = HttpMetrics()
+    app = FastAPI()
+    
+    @app.get("/api/questions/{question_id}")
+    async def question(question_id: str):
+        return {"id": question_id}
+    
+    app.add_middleware(MetricsMiddleware, metrics=http_metrics)
+    client = TestClient(app)
+    client.get("/api/questions/q1")
+    client.get("/api/questions/q2")
+    client.get("/nowhere")
+    
+    series = {(s["route"], s["status"]): s["count"] for s in http_metrics.requests.snapshot()}
+    assert series == {("/api/questions/{question_id}", "200"): 2, ("unmatched", "404"): 1}
+
+def test_command_listener_counts_per_collection():
+    listener = MongoCommandMetrics()
+    commands = [
+        ("find", {"find": "questions", "filter": {}}, {"cursor": {"firstBatch": [{}, {}, {}]}}),
+        ("getMore", {"getMore": 1, "collection": "questions"}, {"cursor": {"nextBatch": [{}]}}),
+        ("insert", {"insert": "cache", "documents": [{}]}, {"n": 1}),
+        ("ping", {"ping": 1}, {"ok": 1}),
+    ]
+    for request_id, (name, command, reply) in enumerate(commands):
+        listener.started(SimpleNamespace(request_id=request_id, command_name=name, command=command))
+        listener.succeeded(SimpleNamespace(request_id=request_id, command_name=name, reply=reply, duration_micros=1500))
+    listener.started(SimpleNamespace(request_id=9, command_name="find", command={"find": "users"}))
+    listener.failed(SimpleNamespace(request_id=9, command_name="find", duration_micros=20))
+    
+    documents = {(s["collection"], s["command"]): s["value"] for s in listener.documents.snapshot()}
+    assert documents == {("questions", "find"): 3, ("questions", "getMore"): 1, ("cache", "insert"): 1}
+    assert {(s["collection"], s["command"]) for s in listener.durations.snapshot()} >= {("", "ping"), ("users", "find")}
+    assert listener.failures.snapshot() == [{"collection": "users", "command": "find", "value": 1}]
+    assert not listener._pending
+
+def test_collected_families_read_callbacks_at_scrape_time():
+    counts = {"hits": 0}
+    family = Collected("cache_requests_total", "Lookups", "counter", lambda: [("", {"cache": "x"}, counts["hits"])])
+    registry = MetricsRegistry([family])
+    counts["hits"] = 7
+    
+    assert 'cache_requests_total{cache="x"} 7' in registry.render()
+
+def test_metrics_endpoint_fails_closed_without_a_token(monkeypatch):
+    from app.routers import metrics as metrics_router
+    
+    app = FastAPI()
+    app.include_router(metrics_router.router)
+    client = TestClient(app)
+    monkeypatch.delenv("METRICS_TOKEN", raising=False)
+    monkeypatch.delenv("METRICS_PUBLIC", raising=False)
+    assert client.get("/metrics").status_code == 404
+    
+    monkeypatch.setenv("METRICS_PUBLIC", "true")
+    assert client.get("/metrics").status_code == 200
+    
+    monkeypatch.setenv("METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
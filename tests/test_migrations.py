@@ -0,0 +1,76 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from migrations import (
+    COMPANY_IDS_VERSION, MIGRATIONS, OFFLINE_MIGRATIONS, SCHEMA_VERSION, MigrationLockedError, _acquire_lock,
+    migrate, schema_version, share_questions_across_companies
+)
+
+def test_schema_version_is_the_number_of_migrations():
+    assert SCHEMA_VERSION == len(MIGRATIONS) > 0
+    assert MIGRATIONS[COMPANY_IDS_VERSION - 1][1] is share_questions_across_companies
+    assert COMPANY_IDS_VERSION in OFFLINE_MIGRATIONS
+
+def test_company_ids_routes_answer_503_until_the_offline_migration_ran(monkeypatch):
+    from app import schema
+    
+    stored = {"version": COMPANY_IDS_VERSION - 1}
+    
+    async def stored_version(db):
+        return stored["version"]
+    
+    monkeypatch.setattr(schema, "schema_version", stored_version)
+    monkeypatch.setattr(schema, "RECHECK_SECONDS", 0)
+    schema.note_schema_version(COMPANY_IDS_VERSION - 1)
+    app = FastAPI()
+    
+    @app.get("/company-questions", dependencies=schema.COMPANY_IDS_SCHEMA)
+    async def company_questions():
+        return []
+    
+    client = TestClient(app)
+    try:
+        response = client.get("/company-questions")
+        assert response.status_code == 503 and response.headers["retry-after"] == "0"
+        
+        # `python migrations.py` ran while this process kept serving
+        stored["version"] = COMPANY_IDS_VERSION
+        assert client.get("/company-questions").status_code == 200
+    finally:
+        schema.note_schema_version(0)
+
+@pytest.mark.skipif(not os.environ.get("TEST_MONGO_URL"), reason="TEST_MONGO_URL not set")
+def test_migrate_applies_each_migration_once():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    
+    async def run():
+        client = AsyncIOMotorClient(os.environ["TEST_MONGO_URL"])
+        db = client[f"igp_schema_{uuid.uuid4().hex[:8]}"]
+        try:
+            await db.questions.insert_one({"id": None, "question": "orphan"})
+            assert await schema_version(db) == 0
+            
+            assert await migrate(db, target=1) == [1]
+            assert await db.questions.count_documents({}) == 0
+            # Startup migrations stop short of the offline ones
+            assert await migrate(db, online_only=True) == list(range(2, COMPANY_IDS_VERSION))
+            assert await migrate(db, online_only=True) == []
+            assert await migrate(db) == list(range(COMPANY_IDS_VERSION, SCHEMA_VERSION + 1))
+            assert await migrate(db) == []
+            assert await schema_version(db) == SCHEMA_VERSION
+            assert "clerk_id_1" in await db.users.index_information()
+            
+            await _acquire_lock(db.schema_migrations, "someone-else")
+            with pytest.raises(MigrationLockedError):
+                await migrate(db)
+        finally:
+            await client.drop_database(db.name)
+            client.close()
+    
+    asyncio.run(run())
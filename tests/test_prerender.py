@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+from prerender import Prerenderer, SnapshotStore, render_snapshot
+
+PAYLOAD = {
+    "title": "Acme <Interview> Questions",
+    "description": "Practice \"real\" questions",
+    "keywords": "acme",
+    "canonical": "/company/c1",
+    "structuredData": {
+        "@context": "https://schema.org",
+        "@graph": [{
+            "@type": "FAQPage",
+            "mainEntity": [{"@type": "Question", "name": "Why </script>?", "acceptedAnswer": {"text": "Because"}}]
+        }]
+    },
+    "company": {"logo_url": "https://cdn.example.com/acme.png"}
+}
+
+class FakeDocuments:
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.listeners = []
+    
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+    
+    async def get_or_build(self, key, group=None):
+        return self.bodies.get(key)
+
+def test_snapshot_escapes_text_and_json_ld():
+    html = render_snapshot(PAYLOAD, "https://example.com").decode()
+    
+    assert "<title>Acme &lt;Interview&gt; Questions</title>" in html
+    assert 'content="Practice &quot;real&quot; questions"' in html
+    assert '<link rel="canonical" href="https://example.com/company/c1">' in html
+    assert 'content="https://cdn.example.com/acme.png"' in html
+    assert html.count("</script>") == 1
+    assert "<h2>Why &lt;/script&gt;?</h2>" in html
+
+def test_snapshots_follow_document_changes_and_survive_restarts(tmp_path):
+    documents = FakeDocuments({"company:c1": json.dumps(PAYLOAD).encode()})
+    prerenderer = Prerenderer(documents, SnapshotStore(str(tmp_path)))
+    
+    async def run():
+        etag, html = await prerenderer.render("company:c1")
+        assert (await prerenderer.render("company:c1")) == (etag, html)
+        assert prerenderer.stats()["rendered"] == 1
+        
+        # A fresh process picks the snapshot up from disk
+        restarted = Prerenderer(documents, SnapshotStore(str(tmp_path)))
+        assert (await restarted.render("company:c1")) == (etag, html)
+        assert restarted.stats() == {"memory_hits": 0, "disk_hits": 1, "rendered": 0, "in_memory": 1}
+        
+        documents.bodies["company:c1"] = json.dumps({**PAYLOAD, "title": "Acme 2"}).encode()
+        await documents.listeners[0]({"company:c1"})
+        new_etag, new_html = await prerenderer.render("company:c1")
+        assert new_etag != etag and b"<title>Acme 2</title>" in new_html
+        assert len(list(tmp_path.glob("*.html"))) == 1
+        
+        del documents.bodies["company:c1"]
+        await documents.listeners[0]({"company:c1"})
+        assert await prerenderer.render("company:c1") is None
+        assert not list(tmp_path.glob("*.html"))
+    
+    asyncio.run(run())
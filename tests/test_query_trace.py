@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import os
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from metrics import Histogram
+from query_trace import QueryBudgetExceeded, QueryTraceMiddleware, QueryTracer, query_budget, query_shape, trace_queries
+
+tracer = QueryTracer()
+
+def run_command(request_id: int, name: str, command: dict, micros: int = 1000):
+    """What the driver reports for one round trip"""
+    tracer.started(SimpleNamespace(request_id=request_id, command_name=name, command=command))
+    tracer.succeeded(SimpleNamespace(request_id=request_id, command_name=name, duration_micros=micros))
+
+def traced_app(**settings) -> FastAPI:
+    app = FastAPI()
+    
+    @app.get("/companies/{company_id}/questions")
+    @query_budget(2)
+    async def company_questions(company_id: str, topics: int = 0):
+        run_command(1, "find", {"find": "questions", "filter": {"company_ids": company_id}})
+        for i in range(topics):
+            run_command(10 + i, "find", {"find": "topics", "filter": {"id": f"t{i}"}})
+        return {"ok": True}
+    
+    app.add_middleware(QueryTraceMiddleware, **settings)
+    return app
+
+def test_query_shape_keeps_keys_not_values():
+    assert query_shape("find", {"find": "questions", "filter": {"company_ids": "c1", "category": "dsa"}}) == \
+        "find questions {category, company_ids}"
+    assert query_shape("aggregate", {"aggregate": "activities", "pipeline": [
+        {"$match": {"$or": [{"activity_type": "login"}, {"user_id": "u"}]}}, {"$facet": {}}
+    ]}) == "aggregate activities $match{activity_type, user_id}>$facet"
+    assert query_shape("update", {"update": "companies", "updates": [{"q": {"id": 1}}, {"q": {"id": 2}}]}) == \
+        "update companies {id} ×2 statements"
+
+def test_trace_counts_round_trips_only_inside_the_block():
+    run_command(1, "find", {"find": "users", "filter": {}})
+    with trace_queries() as trace:
+        for i in range(4):
+            run_command(i, "count", {"count": "activities", "query": {"activity_type": str(i)}}, micros=2000)
+    run_command(9, "find", {"find": "users", "filter": {}})
+    
+    assert trace.round_trips == 4
+    assert trace.db_seconds == pytest.approx(0.008)
+    assert trace.repeated() == [("count activities {activity_type}", 4)]
+
+def test_middleware_logs_repeated_shapes_over_threshold(caplog):
+    client = TestClient(traced_app(max_queries=3))
+    with caplog.at_level(logging.WARNING):
+        client.get("/companies/c1/questions")
+        assert not caplog.records
+        client.get("/companies/c1/questions", params={"topics": 3})
+    
+    [record] = caplog.records
+    assert "/companies/{company_id}/questions: 4 queries" in record.message
+    assert "possible N+1" in record.message and "3× find topics {id}" in record.message
+
+def test_enforced_budget_fails_the_request():
+    client = TestClient(traced_app(enforce_budgets=True))
+    assert client.get("/companies/c1/questions", params={"topics": 1}).status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match="issued 3 queries, budget 2"):
+        client.get("/companies/c1/questions", params={"topics": 2})
+
+@pytest.mark.skipif(not os.environ.get("TEST_MONGO_URL"), reason="TEST_MONGO_URL not set")
+def test_create_question_stays_within_its_declared_budget(monkeypatch):
+    """Budgets are enforced in tests (see conftest), so a budget set too low fails the request"""
+    import httpx
+    from app import create_app, factory
+    from app.auth import AUTH_ROUND_TRIPS, get_current_user
+    from app.db import db
+    from app.models import User
+    from app.routers.admin import create_question
+    from app.schema import note_schema_version
+    from migrations import SCHEMA_VERSION
+    
+    # As startup_db would on a migrated database, so the schema gate adds no reads
+    note_schema_version(SCHEMA_VERSION)
+    round_trips = Histogram("round_trips", "Round trips per request", ("route",), buckets=tuple(range(64)))
+    monkeypatch.setattr(factory, "request_round_trips", round_trips)
+    app = create_app(["admin"])
+    # Skips the Clerk and user lookups; require_auth still logs the login activity
+    app.dependency_overrides[get_current_user] = lambda: User(
+        clerk_id="admin_1", email="admin@example.com", name="Admin", is_admin=True
+    )
+    text = f"Budget check {uuid.uuid4().hex}: how would you shard a write-heavy time series store across regions"
+    question = {"question": text, "answer": "By series key and time", "difficulty": "hard", "category": "system-design"}
+    
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            try:
+                created = await client.post("/api/admin/questions", json={**question, "company_ids": ["budget_c1", "budget_c2"]})
+                merged = await client.post(
+                    "/api/admin/questions", params={"on_duplicate": "merge"}, json={**question, "company_ids": ["budget_c3"]}
+                )
+                return created, merged
+            finally:
+                ids = [doc["id"] for doc in await db.questions.find({"question": text}, {"id": 1}).to_list(None)]
+                await db.questions.delete_many({"id": {"$in": ids}})
+                await db.question_fingerprints.delete_many({"_id": {"$in": ids}})
+                await db.search_changes.delete_many({"question_id": {"$in": ids}})
+    
+    created, merged = asyncio.run(run())
+    assert created.status_code == merged.status_code == 200
+    assert merged.json()["merged_into"] == created.json()["id"]
+    
+    # Tighter than enforcement: the overridden auth path ran one of its AUTH_ROUND_TRIPS
+    limit = create_question.query_budget - AUTH_ROUND_TRIPS + 1
+    buckets = {labels["le"]: value for name, labels, value in round_trips.samples() if name.endswith("_bucket")}
+    assert buckets[str(limit)] == 2
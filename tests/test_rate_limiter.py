@@ -0,0 +1,66 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from rate_limiter import RateLimiter, create_rate_limit_indexes
+
+class FullWindow:
+    """Collection stand-in whose window is already full: every upsert collides"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def find_one_and_update(self, *args, **kwargs):
+        self.calls += 1
+        raise DuplicateKeyError("E11000 duplicate key")
+
+def test_fixed_window_denial_is_remembered_locally():
+    collection = FullWindow()
+    limiter = RateLimiter(collection, "test", 3, 86400, mode="fixed")
+    
+    async def run():
+        return [await limiter.reserve("user_1") for _ in range(5)]
+    
+    results = asyncio.run(run())
+    assert not any(r.allowed for r in results)
+    assert results[0].retry_after > 0
+    # Two attempts for the first request (the first-insert race retry), none afterwards
+    assert collection.calls == 2
+
+def test_sliding_bucket_rejects_without_mongo_once_drained():
+    limiter = RateLimiter(None, "test", 2, 3600, mode="sliding")
+    bucket = limiter._bucket("test:user_1")
+    bucket.tokens = 0
+    
+    denied = asyncio.run(limiter.reserve("user_1"))
+    assert not denied.allowed and denied.retry_after > 0
+
+@pytest.mark.skipif(not os.environ.get("TEST_MONGO_URL"), reason="TEST_MONGO_URL not set")
+@pytest.mark.parametrize("mode", ["fixed", "sliding"])
+def test_concurrent_reservations_never_exceed_limit(mode):
+    from motor.motor_asyncio import AsyncIOMotorClient
+    
+    async def run():
+        client = AsyncIOMotorClient(os.environ["TEST_MONGO_URL"])
+        db = client[f"igp_limits_{uuid.uuid4().hex[:8]}"]
+        await create_rate_limit_indexes(db.rate_limits)
+        # Separate limiters share nothing in memory, like separate worker processes
+        limiters = [RateLimiter(db.rate_limits, "test", 5, 3600, mode=mode) for _ in range(4)]
+        try:
+            results = await asyncio.gather(*(
+                limiters[i % 4].reserve("user_1") for i in range(40)
+            ))
+            granted = [r for r in results if r.allowed]
+            assert len(granted) == 5
+            
+            await limiters[0].refund(granted[0])
+            assert (await limiters[1].remaining("user_1")).remaining == 1
+            assert (await limiters[1].reserve("user_1")).allowed
+        finally:
+            await client.drop_database(db.name)
+            client.close()
+    
+    asyncio.run(run())
@@ -0,0 +1,61 @@
+"""
+The live test needs a replica set, e.g. three local members:
+
+    for port in 27017 27018 27019; do
+        mkdir -p /tmp/rs/$port
+        mongod --replSet rs0 --port $port --dbpath /tmp/rs/$port --fork --logpath /tmp/rs/$port.log
+    done
+    mongosh --port 27017 --eval 'rs.initiate({_id: "rs0", members: [
+        {_id: 0, host: "localhost:27017"}, {_id: 1, host: "localhost:27018"}, {_id: 2, host: "localhost:27019"}]})'
+
+    TEST_REPLICA_SET_URL="mongodb://localhost:27017,localhost:27018,localhost:27019/?replicaSet=rs0" pytest tests/test_read_routing.py
+"""
+import asyncio
+import os
+import uuid
+
+import pytest
+from pymongo.read_preferences import Primary, SecondaryPreferred
+
+from app import db as app_db
+
+@pytest.fixture
+def fresh_window(monkeypatch):
+    monkeypatch.setattr(app_db, "_primary_reads_until", 0.0)
+    monkeypatch.setattr(app_db, "READ_FROM_SECONDARIES", True)
+
+def test_public_reads_prefer_secondaries_with_bounded_staleness(fresh_window):
+    collection = app_db.read_db.questions
+    assert isinstance(collection.read_preference, SecondaryPreferred)
+    assert collection.read_preference.max_staleness == app_db.READ_MAX_STALENESS_SECONDS
+    assert isinstance(app_db.db.questions.read_preference, Primary)
+
+def test_reads_stay_on_primary_after_a_write(fresh_window):
+    app_db.note_write()
+    assert isinstance(app_db.read_db.questions.read_preference, Primary)
+    assert app_db.read_db["questions"].read_preference == app_db.db.questions.read_preference
+
+def test_secondary_reads_can_be_disabled(fresh_window, monkeypatch):
+    monkeypatch.setattr(app_db, "READ_FROM_SECONDARIES", False)
+    assert app_db.read_database() is app_db.db
+
+@pytest.mark.skipif(not os.environ.get("TEST_REPLICA_SET_URL"), reason="TEST_REPLICA_SET_URL not set")
+def test_replica_set_serves_reads_from_secondaries():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    
+    async def run():
+        client = AsyncIOMotorClient(os.environ["TEST_REPLICA_SET_URL"])
+        name = f"igp_replicas_{uuid.uuid4().hex[:8]}"
+        primary = client[name]
+        secondaries = client.get_database(name, read_preference=SecondaryPreferred(max_staleness=90))
+        try:
+            await primary.questions.insert_one({"id": "q1"})
+            # Reads through the secondary-preferring handle are served by a secondary
+            explained = await secondaries.command("explain", {"count": "questions"}, read_preference=secondaries.read_preference)
+            hello = await client.admin.command("hello")
+            assert explained["serverInfo"]["port"] != int(hello["primary"].rsplit(":", 1)[1])
+        finally:
+            await client.drop_database(name)
+            client.close()
+    
+    asyncio.run(run())
@@ -0,0 +1,33 @@
+from recommendations import build_recommendations, nearest_neighbors, tfidf_vectors, term_counts
+
+QUESTIONS = [
+    {"id": "q1", "question": "Reverse a singly linked list in place", "tags": ["linked list"], "company_ids": ["amazon"]},
+    {"id": "q2", "question": "Reverse a singly linked list recursively", "tags": ["linked list", "recursion"], "company_ids": ["google"]},
+    {"id": "q3", "question": "Explain the CAP theorem", "tags": ["distributed systems"], "company_ids": ["netflix"]},
+    {"id": "q4", "question": "Consistency versus availability in distributed databases", "tags": ["distributed systems"],
+     "company_ids": ["uber"]},
+    {"id": "q5", "question": "Detect a cycle in a linked list", "tags": ["linked list"], "company_ids": ["google"]},
+    {"id": "q6", "question": "Design a URL shortener", "tags": ["system design"]},
+]
+
+def test_related_questions_share_distinctive_terms():
+    related, _ = build_recommendations(QUESTIONS, top_k=2)
+    
+    assert [other for other, _ in related["q1"]] == ["q2", "q5"]
+    assert [other for other, _ in related["q3"]] == ["q4"]
+    assert related["q6"] == []
+    assert all(other != question_id for question_id, found in related.items() for other, _ in found)
+
+def test_similar_companies_compare_whole_question_sets():
+    _, similar = build_recommendations(QUESTIONS, top_k=3)
+    
+    assert similar["amazon"][0][0] == "google"
+    assert similar["netflix"][0][0] == "uber"
+    assert "amazon" not in dict(similar["netflix"])
+
+def test_vectors_are_unit_length_and_scores_are_cosines():
+    vectors = tfidf_vectors([term_counts(q) for q in QUESTIONS])
+    assert all(abs(sum(w * w for w in v.values()) - 1) < 1e-9 for v in vectors)
+    
+    score = nearest_neighbors([{"a": 0.6, "b": 0.8}, {"a": 0.8, "b": 0.6}, {"c": 1.0}], top_k=5)
+    assert score[0] == [(1, 0.96)] and score[2] == []
@@ -0,0 +1,38 @@
+import asyncio
+import threading
+
+import pytest
+
+from sdk_executor import CircuitOpenError, SDKExecutor
+
+def test_cancelled_half_open_probe_lets_the_next_call_through():
+    async def scenario():
+        executor = SDKExecutor(max_workers=2)
+        executor.register("flaky", failure_threshold=1, reset_timeout=0.01)
+        breaker = executor._breakers["flaky"]
+        
+        def fail():
+            raise RuntimeError("down")
+        
+        with pytest.raises(RuntimeError):
+            await executor.call("flaky", fail)
+        with pytest.raises(CircuitOpenError):
+            await executor.call("flaky", lambda: "ok")
+        await asyncio.sleep(0.02)
+        
+        # The probe's caller disconnects while the provider is still working
+        unblock = threading.Event()
+        probe = asyncio.create_task(executor.call("flaky", unblock.wait))
+        await asyncio.sleep(0.01)
+        assert breaker.trial_in_progress
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        unblock.set()
+        
+        assert not breaker.trial_in_progress
+        assert await executor.call("flaky", lambda: "ok") == "ok"
+        assert breaker.state == "closed"
+        executor.shutdown()
+    
+    asyncio.run(scenario())
@@ -0,0 +1,76 @@
+from search_index import SearchIndex, Segment, SegmentWriter, highlight, tokenize
+
+QUESTIONS = [
+    {"id": "q1", "question": "Reverse a linked list", "answer": "Iterate with three pointers.", "tags": ["linked list"],
+     "topic_id": "dsa", "difficulty": "Easy"},
+    {"id": "q2", "question": "Detect a cycle in a linked list", "answer": "Floyd's tortoise and hare.", "tags": [],
+     "topic_id": "dsa", "company_ids": ["google", "meta"], "difficulty": "Medium"},
+    {"id": "q3", "question": "Explain Java garbage collection", "answer": "Generational collectors, e.g. G1.",
+     "category": "java", "company_ids": ["amazon"], "difficulty": "Medium"},
+    {"id": "q4", "question": "What is a hash map?", "answer": "An array of buckets; a linked list per bucket.",
+     "topic_id": "dsa", "difficulty": "Easy"},
+]
+
+def build_index(tmp_path, docs=QUESTIONS) -> SearchIndex:
+    path = tmp_path / "questions.idx"
+    writer = SegmentWriter()
+    for doc in sorted(docs, key=lambda d: d["id"]):
+        writer.add(doc)
+    writer.write(path, watermark=None)
+    index = SearchIndex(db=None, path=str(path))
+    index.segment = Segment(path)
+    return index
+
+def test_tokenizer_drops_stopwords_and_folds_plurals():
+    assert tokenize("What are the Linked Lists in C++?") == ["linked", "list", "c++"]
+
+def test_ranks_question_matches_above_answer_matches(tmp_path):
+    index = build_index(tmp_path)
+    total, hits, terms = index.search("linked list")
+    
+    assert total == 3
+    assert [doc_id for doc_id, _ in hits][:2] in (["q1", "q2"], ["q2", "q1"])
+    assert hits[-1][0] == "q4"
+    assert terms == {"linked", "list"}
+
+def test_filters_and_pagination(tmp_path):
+    index = build_index(tmp_path)
+    
+    assert [h[0] for h in index.search("linked list", {"company_ids": "google"})[1]] == ["q2"]
+    assert [h[0] for h in index.search("linked list", {"company_ids": "meta"})[1]] == ["q2"]
+    assert [h[0] for h in index.search("list", {"difficulty": "easy", "topic_id": "dsa"})[1]] in (["q1", "q4"],)
+    total, page_two, _ = index.search("linked list", limit=2, offset=2)
+    assert total == 3 and [h[0] for h in page_two] == ["q4"]
+
+def test_delta_and_tombstones_override_the_segment(tmp_path):
+    index = build_index(tmp_path)
+    # q1 edited, q3 deleted, q5 created since the segment was built
+    index.tombstones.update({index.segment.doc_number("q1"), index.segment.doc_number("q3")})
+    index.delta.add({**QUESTIONS[0], "question": "Reverse a string", "tags": []})
+    index.delta.add({"id": "q5", "question": "Merge two sorted linked lists", "answer": "", "difficulty": "Easy"})
+    
+    assert [h[0] for h in index.search("java")[1]] == []
+    assert "q1" not in [h[0] for h in index.search("linked")[1]]
+    assert [h[0] for h in index.search("reverse")[1]] == ["q1"]
+    assert index.search("merge sorted", {"difficulty": "Easy"})[1][0][0] == "q5"
+
+def test_pruned_search_still_finds_the_best_match(tmp_path):
+    index = build_index(tmp_path)
+    index.max_postings = 2
+    total, hits, _ = index.search("linked list")
+    
+    assert index.counters["pruned_searches"] == 1
+    assert hits[0][0] in ("q1", "q2") and total >= len(hits)
+
+def test_unknown_ids_and_terms(tmp_path):
+    index = build_index(tmp_path)
+    assert index.segment.doc_number("q0") is None
+    assert index.search("terraform") == (0, [], {"terraform"})
+
+def test_highlight_escapes_and_windows():
+    text = "<b>intro</b> " + "x " * 200 + "a linked list here"
+    snippet = highlight(text, {"linked", "list"}, max_length=60)
+    
+    assert "<mark>linked</mark> <mark>list</mark>" in snippet
+    assert snippet.startswith("…") and "<b>" not in snippet
+    assert highlight("<b>Lists</b>", {"list"}) == "&lt;b&gt;<mark>Lists</mark>&lt;/b&gt;"
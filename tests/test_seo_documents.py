@@ -0,0 +1,62 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+from fastapi.responses import JSONResponse
+
+from seo_documents import (
+    EXPERIENCES_PAGE, GOLDMINE_PAGE, TOPICS_PAGE, SeoDocumentStore,
+    company_key, encode_payload, experiences_page_payload, experiences_variant_key,
+    question_seo_keys, rebuild_seo_documents, topic_key
+)
+
+def test_encoded_payload_matches_json_response():
+    payload = {"title": "Café Interview Questions", "count": 3, "nested": {"a": [1, None]}}
+    assert encode_payload(payload) == JSONResponse(payload).body
+
+def test_question_keys_cover_old_and_new_company_and_topic():
+    keys = question_seo_keys([{"company_ids": ["c1"], "topic_id": "t1"}, None, {"company_ids": ["c1", "c2"]}])
+    assert keys == {GOLDMINE_PAGE, TOPICS_PAGE, company_key("c1"), company_key("c2"), topic_key("t1")}
+
+def test_experiences_page_variants_share_totals():
+    counts = {"Google": 3, "Amazon": 1}
+    listing = experiences_page_payload(counts)
+    variant = experiences_page_payload(counts, "Google")
+    unknown = experiences_page_payload(counts, "Nowhere")
+    
+    assert listing["experiencesCount"] == variant["experiencesCount"] == 4
+    assert listing["companies"] == ["Amazon", "Google"]
+    assert "3+ Real Stories" in variant["title"]
+    assert "0+ Real Stories" in unknown["title"]
+
+@pytest.mark.skipif(not os.environ.get("TEST_MONGO_URL"), reason="TEST_MONGO_URL not set")
+def test_store_serves_rebuilt_documents_and_drops_deleted_pages():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    
+    async def run():
+        client = AsyncIOMotorClient(os.environ["TEST_MONGO_URL"])
+        db = client[f"igp_seo_{uuid.uuid4().hex[:8]}"]
+        store = SeoDocumentStore(db, db, debounce=0)
+        try:
+            await db.companies.insert_one({"id": "c1", "name": "Acme", "question_count": 1})
+            await db.questions.insert_one({"id": "q1", "company_ids": ["c1"], "question": "Why?", "answer": "Because"})
+            await db.experiences.insert_one({"id": "e1", "company_name": "Acme", "role": "SDE", "rounds": 3, "posted_at": "2025-01-01"})
+            await rebuild_seo_documents(db)
+            
+            assert await store.get(experiences_variant_key("Acme")) is not None
+            body = await store.get(company_key("c1"))
+            assert b'"questionsCount":1' in body
+            
+            await db.questions.insert_one({"id": "q2", "company_ids": ["c1"], "question": "How?", "answer": "Like so"})
+            await db.experiences.delete_one({"id": "e1"})
+            await store.refresh(question_seo_keys([{"company_ids": ["c1"]}]) | {EXPERIENCES_PAGE})
+            
+            assert b'"questionsCount":2' in await store.get(company_key("c1"))
+            assert await store.get(experiences_variant_key("Acme")) is None
+            assert await store.get_or_build(company_key("missing")) is None
+        finally:
+            await client.drop_database(db.name)
+            client.close()
+    
+    asyncio.run(run())
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from interview_generation import FakeInterviewModel, IncrementalQuestionParser, QUESTION_LEVELS, parse_questions, set_model_backend
+from rate_limiter import Reservation
+from app import create_app
+from app.auth import require_premium
+from app.models import ProjectInterviewRequest, User
+from app.routers import project_interview
+
+PROJECT = dict(
+    project_title="E-commerce",
+    tech_stack=["MongoDB", "Express", "React", "Node"],
+    project_description="An online shop",
+    features_implemented="Cart, checkout, payments",
+    student_role="Backend"
+)
+
+@pytest.fixture
+def fake_model():
+    model = FakeInterviewModel(chunk_size=32)
+    set_model_backend(model)
+    yield model
+    set_model_backend(None)
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 10000])
+def test_parser_emits_every_question_once_in_order(chunk_size):
+    model = FakeInterviewModel(chunk_size=chunk_size)
+    parser = IncrementalQuestionParser()
+    emitted = []
+    for chunk in model.generate_stream("prompt"):
+        emitted.extend(parser.feed(chunk))
+    
+    expected = parse_questions(model.generate("prompt"))
+    assert emitted == [
+        (level, index, question)
+        for level in QUESTION_LEVELS
+        for index, question in enumerate(expected[level])
+    ]
+    assert parse_questions(parser.text) == expected
+
+def test_parser_ignores_braces_and_quotes_inside_strings():
+    document = json.dumps({
+        "easy_questions": [{"question": 'What does "{}" mean in [JSON]?', "difficulty": "easy", "topic": "a\\\\b"}],
+        "medium_questions": [],
+        "hard_questions": [{"question": "Why } not {?", "difficulty": "hard", "topic": "x"}]
+    })
+    parser = IncrementalQuestionParser()
+    emitted = [item for char in document for item in parser.feed(char)]
+    
+    assert [(level, q["question"]) for level, _, q in emitted] == [
+        ("easy_questions", 'What does "{}" mean in [JSON]?'),
+        ("hard_questions", "Why } not {?")
+    ]
+
+def test_first_question_arrives_before_generation_finishes(fake_model):
+    fake_model.chunk_delay = 0.005
+    request = ProjectInterviewRequest(**PROJECT)
+    
+    async def run():
+        start = time.perf_counter()
+        first = complete = None
+        count = 0
+        async for kind, payload in project_interview.stream_generated_questions(request):
+            if kind == "question":
+                count += 1
+                first = first or time.perf_counter() - start
+            else:
+                complete = time.perf_counter() - start
+        return first, complete, count, payload
+    
+    first, complete, count, questions = asyncio.run(run())
+    assert count == 15
+    assert set(questions) == set(QUESTION_LEVELS)
+    assert first < complete / 3
+
+def test_stream_endpoint_sends_question_events_then_done(fake_model, monkeypatch):
+    recorded = []
+    
+    async def no_cache(request):
+        return None, "miss"
+    
+    async def reserve(user_id):
+        return Reservation(True, 2, 0, "ai_generation:user_1", token=0)
+    
+    async def record(user_id, email, name, request, questions):
+        recorded.append(questions)
+    
+    monkeypatch.setattr(project_interview, "lookup_cached_generation", no_cache)
+    monkeypatch.setattr(project_interview, "reserve_generation", reserve)
+    monkeypatch.setattr(project_interview, "record_generation", record)
+    app = create_app(["project_interview"])
+    app.dependency_overrides[require_premium] = lambda: User(
+        clerk_id="user_1", email="student@example.com", name="Student", is_premium=True
+    )
+    try:
+        response = TestClient(app).post("/api/project-interview/generate/stream", json=PROJECT)
+    finally:
+        app.dependency_overrides.clear()
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        (block.split("\n")[0][len("event: "):], json.loads(block.split("\n")[1][len("data: "):]))
+        for block in response.text.strip().split("\n\n")
+    ]
+    assert [name for name, _ in events] == ["question"] * 15 + ["done"]
+    assert events[-1][1]["remaining_generations"] == 2
+    assert recorded == [events[-1][1]["questions"]]
+
+def test_stream_dropped_after_questions_keeps_the_generation_charged(fake_model, monkeypatch):
+    refunded = []
+    
+    async def no_cache(request):
+        return None, "miss"
+    
+    async def reserve(user_id):
+        return Reservation(True, 2, 0, "ai_generation:user_1", token=0)
+    
+    async def disconnected(self):
+        return True
+    
+    async def refund(reservation):
+        refunded.append(reservation)
+    
+    monkeypatch.setattr(project_interview, "lookup_cached_generation", no_cache)
+    monkeypatch.setattr(project_interview, "reserve_generation", reserve)
+    monkeypatch.setattr(project_interview.Request, "is_disconnected", disconnected)
+    monkeypatch.setattr(project_interview.ai_generation_limiter, "refund", refund)
+    app = create_app(["project_interview"])
+    app.dependency_overrides[require_premium] = lambda: User(
+        clerk_id="user_1", email="student@example.com", name="Student", is_premium=True
+    )
+    try:
+        response = TestClient(app).post("/api/project-interview/generate/stream", json=PROJECT)
+    finally:
+        app.dependency_overrides.clear()
+    
+    assert response.text.count("event: question") == 1
+    assert refunded == []
@@ -0,0 +1,78 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from suggest import Suggester, normalize
+
+def make_suggester() -> Suggester:
+    suggester = Suggester(db=None)
+    suggester._expires = time.monotonic() + 3600
+    suggester.apply("company", [
+        ("c1", {"name": "Goldman Sachs", "slug": "goldman-sachs", "question_count": 40}),
+        ("c2", {"name": "Google", "slug": "google", "question_count": 120}),
+        ("c3", {"name": "Go-Jek", "slug": "gojek", "question_count": 5}),
+    ])
+    suggester.apply("topic", [("t1", {"name": "Graph Algorithms"}), ("t2", {"name": "Go"})])
+    suggester.apply("alumni", [
+        ("a1", {"name": "Priya Sharma", "company": "Google"}),
+        ("a2", {"name": "Rahul Gupta", "company": "google"}),
+        ("a3", {"name": "Ana Gómez", "company": "Goldman Sachs"}),
+    ])
+    return suggester
+
+def labels(results):
+    return [(r["type"], r["label"]) for r in results]
+
+def test_normalize_folds_case_accents_and_punctuation():
+    assert normalize("  Société-Générale (Paris) ") == "societe generale paris"
+    assert normalize("C++ / C#") == "c++ c#"
+
+def test_exact_and_label_start_matches_rank_first():
+    suggester = make_suggester()
+    
+    assert labels(suggester.lookup("go", limit=3)) == [("topic", "Go"), ("company", "Google"), ("company", "Goldman Sachs")]
+    assert labels(suggester.lookup("sachs", ["company"])) == [("company", "Goldman Sachs")]
+    assert labels(suggester.lookup("gojek")) == [("company", "Go-Jek")]
+    assert labels(suggester.lookup("gomez")) == [("alumni", "Ana Gómez")]
+
+def test_alumni_companies_merge_spellings_and_follow_writes():
+    suggester = make_suggester()
+    assert suggester.lookup("goo", ["alumni_company"]) == [
+        {"type": "alumni_company", "id": "google", "label": "Google"}
+    ]
+    
+    suggester.apply("alumni", [("a1", {"company": "Meta"}), ("a2", None)])
+    assert suggester.lookup("goo", ["alumni_company"]) == []
+    assert labels(suggester.lookup("priya")) == [("alumni", "Priya Sharma")]
+    assert suggester.lookup("priya")[0]["subtitle"] == "Meta"
+
+def test_renames_and_deletes_drop_old_keys():
+    suggester = make_suggester()
+    suggester.apply("company", [("c2", {"name": "Alphabet"}), ("c3", None)])
+    
+    assert labels(suggester.lookup("alpha")) == [("company", "Alphabet")]
+    assert ("company", "Google") not in labels(suggester.lookup("goo"))
+    assert suggester.lookup("gojek") == []
+    # Weight survives an update that does not carry it
+    assert suggester._entries[("company", "c2")]["weight"] == 120
+
+def test_responses_are_cached_until_the_index_changes():
+    suggester = make_suggester()
+    
+    async def run():
+        etag, body = await suggester.suggest("Gold", ["company"])
+        assert json.loads(body) == {"query": "gold", "results": [
+            {"type": "company", "id": "c1", "label": "Goldman Sachs", "slug": "goldman-sachs"}
+        ]}
+        assert await suggester.suggest("gold ", ["company"]) == (etag, body)
+        assert suggester.counters["hits"] == 1
+        
+        suggester.apply("company", [("c4", {"name": "Gold Inc"})])
+        assert (await suggester.suggest("gold", ["company"]))[0] != etag
+        
+        with pytest.raises(ValueError):
+            await suggester.suggest("gold", ["users"])
+    
+    asyncio.run(run())
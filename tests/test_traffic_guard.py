@@ -0,0 +1,90 @@
+import asyncio
+import base64
+import json
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from traffic_guard import RateRule, TrafficGuard, TrafficGuardMiddleware
+
+def make_client(guard):
+    app = FastAPI()
+    
+    @app.get("/api/alumni/search")
+    async def search():
+        return {"ok": True}
+    
+    @app.get("/api/health")
+    async def health():
+        return {"ok": True}
+    
+    app.add_middleware(TrafficGuardMiddleware, guard=guard)
+    return TestClient(app)
+
+def bearer(sub):
+    claims = base64.urlsafe_b64encode(json.dumps({"sub": sub}).encode()).decode().rstrip("=")
+    return {"Authorization": f"Bearer x.{claims}.y"}
+
+def test_rate_limited_per_client_with_retry_after():
+    guard = TrafficGuard([RateRule("search", per_minute=60, burst=3)], exempt_prefixes=("/api/health",))
+    client = make_client(guard)
+    
+    statuses = [client.get("/api/alumni/search").status_code for _ in range(5)]
+    assert statuses == [200, 200, 200, 429, 429]
+    rejected = client.get("/api/alumni/search")
+    assert rejected.headers["retry-after"] == "1"
+    assert rejected.json() == {"detail": "Too many requests"}
+    
+    # A signed-in user has their own bucket; health checks are never limited
+    assert client.get("/api/alumni/search", headers=bearer("user_1")).status_code == 200
+    assert client.get("/api/health").status_code == 200
+    assert guard.stats()["rate_limited"] == 3
+
+def test_sheds_when_in_flight_limit_reached():
+    guard = TrafficGuard([], max_in_flight=1)
+    client = make_client(guard)
+    guard.in_flight = 1
+    response = client.get("/api/alumni/search")
+    assert response.status_code == 503
+    assert guard.stats()["shed"] == 1
+
+def test_loop_lag_shrinks_then_restores_in_flight_limit():
+    guard = TrafficGuard([], max_in_flight=100, min_in_flight=10, max_lag=0.01, lag_interval=0.01)
+    
+    async def run():
+        guard._ensure_monitor()
+        await asyncio.sleep(0.05)
+        for _ in range(5):
+            time.sleep(0.1)  # block the loop
+            await asyncio.sleep(0.02)
+        shrunk = guard.in_flight_limit
+        await guard.stop()
+        return shrunk
+    
+    assert asyncio.run(run()) < 100
+
+def test_forwarded_ip_is_the_hop_the_proxy_appended():
+    scope = {"client": ("10.0.0.1", 5000), "headers": [(b"x-forwarded-for", b"1.2.3.4, 203.0.113.7")]}
+    assert TrafficGuard([]).client_ip(scope) == "10.0.0.1"
+    assert TrafficGuard([], trust_forwarded=True).client_ip(scope) == "203.0.113.7"
+    
+    guard = TrafficGuard([RateRule("search", per_minute=60, burst=1)], trust_forwarded=True)
+    client = make_client(guard)
+    assert client.get("/api/alumni/search", headers={"X-Forwarded-For": "1.1.1.1, 203.0.113.7"}).status_code == 200
+    assert client.get("/api/alumni/search", headers={"X-Forwarded-For": "2.2.2.2, 203.0.113.7"}).status_code == 429
+
+def test_client_ip_header_set_by_the_proxy_wins():
+    scope = {"client": ("10.0.0.1", 5000), "headers": [
+        (b"x-forwarded-for", b"1.2.3.4, 10.0.0.9"), (b"x-real-ip", b"203.0.113.7")
+    ]}
+    guard = TrafficGuard([], trust_forwarded=True, client_ip_header="X-Real-IP")
+    assert guard.client_ip(scope) == "203.0.113.7"
+    assert guard.client_ip({"client": ("10.0.0.1", 5000), "headers": []}) == "10.0.0.1"
+    
+    # Behind Vercel every request arrives from the proxy; clients still get their own buckets
+    guard = TrafficGuard([RateRule("search", per_minute=60, burst=1)], client_ip_header="x-real-ip")
+    client = make_client(guard)
+    assert client.get("/api/alumni/search", headers={"X-Real-IP": "203.0.113.7"}).status_code == 200
+    assert client.get("/api/alumni/search", headers={"X-Real-IP": "198.51.100.4"}).status_code == 200
+    assert client.get("/api/alumni/search", headers={"X-Real-IP": "203.0.113.7"}).status_code == 429